@@ -16,8 +16,13 @@ The purpose of this python3 script is to implement the Annotator dataclass.
 """
 
 
+import math
+import multiprocessing as mp
+from collections import defaultdict
 from dataclasses import dataclass
+from typing import ClassVar, List
 from .logging import get_logger
+from .variant import Variant
 from .variants_list import VariantsList
 
 
@@ -26,7 +31,61 @@ logger = get_logger(__name__)
 
 @dataclass
 class Annotator:
+    # Annotator used by the current worker process (see annotate_by_chromosome)
+    worker_annotator: ClassVar['Annotator'] = None
 
     def annotate(self, variants_list: VariantsList, num_processes: int) -> VariantsList:
         raise Exception("Subclass must implement 'annotate' method")
 
+    def annotate_variant(self, variant: Variant) -> Variant:
+        raise Exception("Subclass must implement 'annotate_variant' method")
+
+    def annotate_by_chromosome(self, variants_list: VariantsList, num_processes: int) -> VariantsList:
+        """
+        Annotate a VariantsList object using annotate_variant. Variants are
+        grouped by chromosome (of the first VariantCall) and sorted by position,
+        and each group is split into contiguous chunks of about
+        len(group) / num_processes variants. Each chunk is annotated, in position
+        order, by one worker process. The annotator itself is sent to each worker
+        process once, when the worker starts, rather than with every task.
+
+        Parameters:
+            variants_list   :   VariantsList.
+            num_processes   :   Number of processes.
+
+        Returns:
+            VariantsList
+        """
+        indices_by_chromosome = defaultdict(list)
+        for i, variant in enumerate(variants_list.variants):
+            indices_by_chromosome[variant.chromosome_1].append(i)
+        indices_groups = []
+        for indices in indices_by_chromosome.values():
+            indices = sorted(indices, key=lambda i: variants_list.variants[i].variant_calls[0].position_1)
+            # Contiguous chunks so that no chromosome is limited to one process
+            chunk_size = math.ceil(len(indices) / num_processes)
+            for start in range(0, len(indices), chunk_size):
+                indices_groups.append(indices[start:start + chunk_size])
+        # Largest chunks first so that no large chunk is left for last
+        indices_groups.sort(key=len, reverse=True)
+        variants_groups = [[variants_list.variants[i] for i in indices] for indices in indices_groups]
+        with mp.Pool(processes=num_processes,
+                     initializer=Annotator.init_worker,
+                     initargs=(self,)) as pool:
+            annotated_variants_groups = pool.map(Annotator.annotate_variants_worker, variants_groups, chunksize=1)
+        variants = [None] * len(variants_list.variants)
+        for indices, annotated_variants in zip(indices_groups, annotated_variants_groups):
+            for i, variant in zip(indices, annotated_variants):
+                variants[i] = variant
+        variants_list_annotated = VariantsList()
+        for variant in variants:
+            variants_list_annotated.add_variant(variant=variant)
+        return variants_list_annotated
+
+    @staticmethod
+    def init_worker(annotator: 'Annotator'):
+        Annotator.worker_annotator = annotator
+
+    @staticmethod
+    def annotate_variants_worker(variants: List[Variant]) -> List[Variant]:
+        return [Annotator.worker_annotator.annotate_variant(variant) for variant in variants]
@@ -20,12 +20,7 @@ and run 'annotate' command.
 import argparse
 from ..constants import *
 from ..default import *
-from ..ensembl import Ensembl
-from ..gencode import Gencode
-from ..refseq import RefSeq
-from ..main import annotate
-from ..utilities import str2bool
-from ..variants_list import VariantsList
+from ..utilities import ensure_gz_suffix, str2bool, write_tsv_file
 
 
 def add_cli_annotate_arg_parser(
@@ -257,22 +252,22 @@ def add_cli_annotate_arg_parser(
         dest="annovar_protocol",
         type=str,
         required=False,
-        default=','.join(list(ANNOVAR_PROTOCOL_OPERATION.keys())),
+        default=ANNOVAR_PROTOCOL,
         help="ANNOVAR protocol (e.g. 'refGene,exac03'). "
              "This parameter must be supplied if "
              "--annotator is '%s' (default: '%s')."
-             % (Annotators.ANNOVAR, ','.join(list(ANNOVAR_PROTOCOL_OPERATION.keys())))
+             % (Annotators.ANNOVAR, ANNOVAR_PROTOCOL)
     )
     parser_optional.add_argument(
         "--annovar-operation",
         dest="annovar_operation",
         type=str,
         required=False,
-        default=','.join(list(ANNOVAR_PROTOCOL_OPERATION.values())),
+        default=ANNOVAR_OPERATION,
         help="ANNOVAR protocol (e.g. 'g,f'). "
              "This parameter must be supplied if "
              "--annotator is '%s' (default: '%s')."
-             % (Annotators.ANNOVAR, ','.join(list(ANNOVAR_PROTOCOL_OPERATION.values())))
+             % (Annotators.ANNOVAR, ANNOVAR_OPERATION)
     )
     parser_optional.add_argument(
         "--gzip",
@@ -283,6 +278,19 @@ def add_cli_annotate_arg_parser(
         help="If 'yes', gzip the output TSV file (default: %s)."
              % GZIP
     )
+    parser_optional.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        required=False,
+        default=None,
+        help="If specified, input TSV files are cached (pickled) in this directory so "
+             "that later runs on unchanged files skip parsing. The least recently used "
+             "cache files are evicted once the directory holds more than %i bytes, and "
+             "the directory can be deleted at any time. Only use a directory that is "
+             "writable by trusted users (default: $VSTOL_CACHE_DIR if set, otherwise "
+             "no caching)." % CACHE_MAX_SIZE
+    )
 
     parser.set_defaults(which='annotate')
     return sub_parsers
@@ -316,9 +324,16 @@ def run_cli_annotate_from_parsed_args(args: argparse.Namespace):
                     annovar_protocol
                     annovar_operation
                     gzip
+                    cache_dir
     """
+    from ..ensembl import Ensembl
+    from ..gencode import Gencode
+    from ..refseq import RefSeq
+    from ..main import annotate
+    from ..variants_list import VariantsList
+
     # Step 1. Load variants
-    variants_list = VariantsList.read_tsv_file(tsv_file=args.tsv_file)
+    variants_list = VariantsList.read_tsv_file_cached(tsv_file=args.tsv_file, cache_dir=args.cache_dir)
 
     # Step 2. Load annotation data
     if args.annotator == Annotators.ENSEMBL:
@@ -353,11 +368,11 @@ def run_cli_annotate_from_parsed_args(args: argparse.Namespace):
     )
 
     # Step 4. Write to a TSV file
-    df_variants = variants_list.to_dataframe()
-    df_variants.sort_values(['variant_id'], inplace=True)
-    if args.gzip:
-        if args.output_tsv_file.endswith(".gz") == False:
-            args.output_tsv_file = args.output_tsv_file + '.gz'
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False, compression='gzip')
-    else:
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False)
+    df_variants = variants_list.to_dataframe(sort=True)
+    args.output_tsv_file = ensure_gz_suffix(file_path=args.output_tsv_file, gzip=args.gzip)
+    write_tsv_file(
+        df=df_variants,
+        tsv_file=args.output_tsv_file,
+        gzip=args.gzip,
+        num_threads=args.num_threads
+    )
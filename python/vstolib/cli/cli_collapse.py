@@ -21,9 +21,7 @@ import argparse
 from ..constants import *
 from ..default import *
 from ..logging import get_logger
-from ..main import collapse
-from ..utilities import str2bool
-from ..variants_list import VariantsList
+from ..utilities import ensure_gz_suffix, str2bool, write_tsv_file
 
 
 logger = get_logger(__name__)
@@ -105,17 +103,18 @@ def run_cli_collapse_from_parsed_args(args: argparse.Namespace):
                     output_tsv_file
                     strategy
     """
-    variants_list = VariantsList.read_tsv_file(tsv_file=args.tsv_file)
-    variants_list = collapse(
-        variants_list=variants_list,
+    from ..main import collapse_dataframe
+    from ..variants_list import VariantsList
+
+    df_variants = collapse_dataframe(
+        df=VariantsList.read_tsv_file_as_dataframe(tsv_file=args.tsv_file),
         sample_id=args.sample_id,
         strategy=args.strategy
     )
-    df_variants = variants_list.to_dataframe()
-    df_variants.sort_values(['variant_id'], inplace=True)
-    if args.gzip:
-        if args.output_tsv_file.endswith(".gz") == False:
-            args.output_tsv_file = args.output_tsv_file + '.gz'
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False, compression='gzip')
-    else:
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False)
+    args.output_tsv_file = ensure_gz_suffix(file_path=args.output_tsv_file, gzip=args.gzip)
+    write_tsv_file(
+        df=df_variants,
+        tsv_file=args.output_tsv_file,
+        gzip=args.gzip,
+        num_threads=NUM_THREADS
+    )
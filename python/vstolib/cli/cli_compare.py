@@ -18,13 +18,22 @@ and run 'compare' command.
 
 
 import argparse
-import multiprocessing as mp
-from ..constants import *
-from ..default import *
+from functools import partial
+from ..constants import OutputFormats
+from ..default import (
+    CACHE_MAX_SIZE,
+    CHUNK_SIZE,
+    GZIP,
+    MATCH_ALL_BREAKPOINTS,
+    MATCH_VARIANT_TYPES,
+    MAX_NEIGHBOR_DISTANCE,
+    MIN_DEL_SIZE_OVERLAP,
+    MIN_INS_SIZE_OVERLAP,
+    NUM_THREADS,
+    OUTPUT_FORMAT
+)
 from ..logging import get_logger
-from ..main import merge
-from ..utilities import str2bool
-from ..variants_list import VariantsList
+from ..utilities import check_output_format, ensure_gz_suffix, parallel_map, str2bool, write_tsv_file
 
 
 logger = get_logger(__name__)
@@ -44,7 +53,8 @@ def add_cli_compare_arg_parser(
     parser_required.add_argument(
         "--tsv-file", '-i',
         dest="tsv_file",
-        action='append',
+        action='extend',
+        nargs='+',
         required=True,
         help="Variants list TSV file. "
              "This TSV file must follow VSTOL's TSV format for this command to work properly."
@@ -128,6 +138,31 @@ def add_cli_compare_arg_parser(
         help="If 'yes', gzip the output TSV file (default: %s)."
              % GZIP
     )
+    parser_optional.add_argument(
+        "--output-format",
+        dest="output_format",
+        type=str,
+        required=False,
+        default=OUTPUT_FORMAT,
+        choices=OutputFormats.ALL,
+        help="Output file format. 'parquet' writes a columnar Parquet file "
+             "(requires pyarrow; --gzip is ignored) that vstol commands "
+             "also accept as input. Allowed options: %s. Default: %s"
+             % (', '.join(OutputFormats.ALL), OUTPUT_FORMAT)
+    )
+    parser_optional.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        required=False,
+        default=None,
+        help="If specified, input TSV files are cached (pickled) in this directory so "
+             "that later runs on unchanged files skip parsing. The least recently used "
+             "cache files are evicted once the directory holds more than %i bytes, and "
+             "the directory can be deleted at any time. Only use a directory that is "
+             "writable by trusted users (default: $VSTOL_CACHE_DIR if set, otherwise "
+             "no caching)." % CACHE_MAX_SIZE
+    )
 
     parser.set_defaults(which='compare')
     return sub_parsers
@@ -148,18 +183,26 @@ def run_cli_compare_from_parsed_args(args: argparse.Namespace):
                     min_ins_size_overlap
                     min_del_size_overlap
                     gzip
+                    output_format
+                    cache_dir
     """
-    assert(len(args.tsv_file), 2)
+    from ..main import merge
+    from ..variants_list import VariantsList
+
+    if len(args.tsv_file) < 2:
+        raise Exception("The parameter --tsv-file must be "
+                        "specified at least twice for 'compare' (%i given)." % len(args.tsv_file))
+
+    check_output_format(output_format=args.output_format)
 
     # Step 1. Load variants lists
     logger.info("Started reading all TSV files")
-    pool = mp.Pool(processes=args.num_threads)
-    async_results = []
-    for tsv_file in args.tsv_file:
-        async_results.append(pool.apply_async(VariantsList.read_tsv_file, args=(tsv_file,False,True)))
-    pool.close()
-    pool.join()
-    variants_lists = [async_result.get() for async_result in async_results]
+    variants_lists = parallel_map(
+        partial(VariantsList.read_tsv_file_cached, low_memory=False, memory_map=True, chunksize=CHUNK_SIZE,
+                cache_dir=args.cache_dir),
+        args.tsv_file,
+        num_processes=args.num_threads
+    )
     logger.info("Finished reading all TSV files")
 
     # Step 2. Merge variants lists
@@ -178,12 +221,15 @@ def run_cli_compare_from_parsed_args(args: argparse.Namespace):
                 (len(variants_list.variant_ids), len(variants_list.variant_call_ids)))
 
     # Step 3. Write to a TSV file
-    df_variants = variants_list.to_dataframe()
-    df_variants.sort_values(['variant_id'], inplace=True)
-    if args.gzip:
-        if args.output_tsv_file.endswith(".gz") == False:
-            args.output_tsv_file = args.output_tsv_file + '.gz'
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False, compression='gzip')
-    else:
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False)
+    df_variants = variants_list.to_dataframe(sort=True)
+    if args.output_format == OutputFormats.PARQUET:
+        df_variants.to_parquet(args.output_tsv_file, index=False, compression='zstd')
+        return
+    args.output_tsv_file = ensure_gz_suffix(file_path=args.output_tsv_file, gzip=args.gzip)
+    write_tsv_file(
+        df=df_variants,
+        tsv_file=args.output_tsv_file,
+        gzip=args.gzip,
+        num_threads=args.num_threads
+    )
 
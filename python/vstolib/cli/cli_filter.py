@@ -18,21 +18,30 @@ and run 'filter' command.
 
 
 import argparse
+import numpy as np
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 from ..constants import VariantFilterSampleTypes, VariantCallTags
-from ..default import *
-from ..genomic_ranges_list import GenomicRangesList
+from ..default import CACHE_MAX_SIZE, GZIP, HOMOPOLYMER_LENGTH, NUM_THREADS
 from ..logging import get_logger
-from ..main import filter, filter_excluded_regions, filter_homopolymeric_variants
-from ..utilities import str2bool
-from ..variant import Variant
-from ..variant_filter import VariantFilter
-from ..variants_list import VariantsList
+from ..utilities import ensure_gz_suffix, sort_by_variant_id, str2bool, write_tsv_file
 
 
 logger = get_logger(__name__)
 
 
+def parse_variant_filter_condition(condition: str) -> List[str]:
+    """
+    Split a variant filter condition into its 5 fields
+    (sample type, quantifier, attribute, operator, value).
+    """
+    fields = condition.split(' ', 4)
+    if len(fields) != 5:
+        raise argparse.ArgumentTypeError('Variant filter condition must have 5 fields: %s' % condition)
+    return fields
+
+
 def add_cli_filter_arg_parser(
         sub_parsers: argparse._SubParsersAction
 ) -> argparse._SubParsersAction:
@@ -55,11 +64,12 @@ def add_cli_filter_arg_parser(
         "--case-sample-id", '-c',
         dest="case_sample_id",
         type=str,
-        action='append',
+        action='extend',
+        nargs='+',
         required=True,
-        help="Case sample ID. Specify this parameter multiple times if there are "
-             "multiple case sample IDs in the supplied TSV file. "
-             "(e.g. --case-sample-id case_01 --case-sample-id case_02)."
+        help="Case sample ID(s). Specify multiple IDs (or this parameter multiple times) "
+             "if there are multiple case sample IDs in the supplied TSV file "
+             "(e.g. --case-sample-id case_01 case_02)."
     )
     parser_required.add_argument(
         "--output-passed-tsv-file", '-o',
@@ -82,16 +92,17 @@ def add_cli_filter_arg_parser(
         '--control-sample-id',
         dest='control_sample_id',
         type=str,
-        action='append',
+        action='extend',
+        nargs='+',
         required=False,
-        help="Control sample ID. Specify this parameter multiple times if there are "
-             "multiple control sample IDs in the supplied TSV file. "
-             "(e.g. --control-sample-id control_01 --control-sample-id control_02)."
+        help="Control sample ID(s). Specify multiple IDs (or this parameter multiple times) "
+             "if there are multiple control sample IDs in the supplied TSV file "
+             "(e.g. --control-sample-id control_01 control_02)."
     )
     parser_optional.add_argument(
         '--filter',
         dest='filter',
-        type=str,
+        type=parse_variant_filter_condition,
         action='append',
         required=False,
         help='Variant filter conditions: '
@@ -144,6 +155,19 @@ def add_cli_filter_arg_parser(
         help="If 'yes', gzip the output TSV file (default: %s)."
              % GZIP
     )
+    parser_optional.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        required=False,
+        default=None,
+        help="If specified, input TSV files are cached (pickled) in this directory so "
+             "that later runs on unchanged files skip parsing. The least recently used "
+             "cache files are evicted once the directory holds more than %i bytes, and "
+             "the directory can be deleted at any time. Only use a directory that is "
+             "writable by trusted users (default: $VSTOL_CACHE_DIR if set, otherwise "
+             "no caching)." % CACHE_MAX_SIZE
+    )
 
     parser.set_defaults(which='filter')
     return sub_parsers
@@ -168,16 +192,31 @@ def run_cli_filter_from_parsed_args(args: argparse.Namespace):
                     homopolymer_length
                     num_threads
                     gzip
+                    cache_dir
     """
-    # Step 1. Load variants list
+    from ..genomic_ranges_list import GenomicRangesList
+    from ..main import filter, filter_excluded_regions, filter_homopolymeric_variants
+    from ..variant_filter import VariantFilter
+    from ..variants_list import VariantsList
+
+    # Step 1. Load variants list (and the excluded regions list concurrently)
     logger.info('Loading target variants list')
-    variants_list = VariantsList.read_tsv_file(tsv_file=args.tsv_file)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        if args.excluded_regions_tsv_file is not None:
+            excluded_regions_future = executor.submit(GenomicRangesList.read_tsv_file,
+                                                      tsv_file=args.excluded_regions_tsv_file)
+        else:
+            excluded_regions_future = None
+        variants_list = VariantsList.read_tsv_file_cached(tsv_file=args.tsv_file, cache_dir=args.cache_dir)
+        if excluded_regions_future is not None:
+            excluded_regions_list = excluded_regions_future.result()
+        else:
+            excluded_regions_list = None
 
     # Step 2. Load variant filters
     variant_filters = []
     if args.filter is not None:
         for curr_filter in args.filter:
-            curr_filter = curr_filter.split(' ')
             if curr_filter[0] == VariantFilterSampleTypes.CASE:
                 sample_ids = args.case_sample_id
             elif curr_filter[0] == VariantFilterSampleTypes.CONTROL:
@@ -194,34 +233,13 @@ def run_cli_filter_from_parsed_args(args: argparse.Namespace):
             variant_filters.append(variant_filter)
     logger.info('Loaded %i variant filters.' % len(variant_filters))
 
-    # Step 3. Load excluded regions list
-    if args.excluded_regions_tsv_file is not None:
-        excluded_regions_list = GenomicRangesList.read_tsv_file(tsv_file=args.excluded_regions_tsv_file)
-        logger.info('Loaded %i excluded regions.' % excluded_regions_list.num_genomic_regions)
-    else:
-        excluded_regions_list = None
-
-    # Step 4. Apply variant filters
-    if args.filter is not None:
-        _, variants_list_filters_rejected = filter(
-            variants_list=variants_list,
-            variant_filters=variant_filters,
-            num_threads=args.num_threads
-        )
-    else:
-        variants_list_filters_rejected = VariantsList()
-
-    # Step 5. Filter out variant calls in excluded regions
+    # Step 3. Report the excluded regions list
     if excluded_regions_list is not None:
-        _, variants_list_excluded_regions_rejected = filter_excluded_regions(
-            variants_list=variants_list,
-            excluded_regions_list=excluded_regions_list,
-            num_threads=args.num_threads
-        )
-    else:
-        variants_list_excluded_regions_rejected = VariantsList()
+        logger.info('Loaded %i excluded regions.' % excluded_regions_list.num_genomic_regions)
 
-    # Step 6. Filter out homopolymeric variant calls
+    # Step 4. Filter out homopolymeric variant calls
+    # (runs on the main thread before the threaded stages below since it
+    # forks worker processes, which must not happen while other threads run)
     if args.reference_genome_fasta_file is not None:
         _, variants_list_homopolymer_rejected = filter_homopolymeric_variants(
             variants_list=variants_list,
@@ -232,75 +250,96 @@ def run_cli_filter_from_parsed_args(args: argparse.Namespace):
     else:
         variants_list_homopolymer_rejected = VariantsList()
 
+    # Steps 5-6 are independent of each other so they are run concurrently
+    # (the Rust filter and overlap release the GIL) and share the threads
+    num_stages = sum([args.filter is not None,
+                      excluded_regions_list is not None])
+    num_threads = max(1, args.num_threads // max(1, num_stages))
+    with ThreadPoolExecutor(max_workers=max(1, num_stages)) as executor:
+        # Step 5. Apply variant filters
+        if args.filter is not None:
+            filters_future = executor.submit(
+                filter,
+                variants_list=variants_list,
+                variant_filters=variant_filters,
+                num_threads=num_threads
+            )
+        else:
+            filters_future = None
+
+        # Step 6. Filter out variant calls in excluded regions
+        if excluded_regions_list is not None:
+            excluded_regions_future = executor.submit(
+                filter_excluded_regions,
+                variants_list=variants_list,
+                excluded_regions_list=excluded_regions_list,
+                num_threads=num_threads
+            )
+        else:
+            excluded_regions_future = None
+
+        if filters_future is not None:
+            _, variants_list_filters_rejected = filters_future.result()
+        else:
+            variants_list_filters_rejected = VariantsList()
+        if excluded_regions_future is not None:
+            _, variants_list_excluded_regions_rejected = excluded_regions_future.result()
+        else:
+            variants_list_excluded_regions_rejected = VariantsList()
+
     # Step 7. Consolidate the tags for rejected variant calls
-    rejected_variant_call_ids_dict = defaultdict(list)
-    for variant in variants_list_filters_rejected.variants:
-        for variant_call in variant.variant_calls:
-            rejected_variant_call_ids_dict[variant_call.id].append(VariantCallTags.FAILED_FILTER)
-    for variant in variants_list_excluded_regions_rejected.variants:
-        for variant_call in variant.variant_calls:
-            rejected_variant_call_ids_dict[variant_call.id].append(VariantCallTags.NEARBY_EXCLUDED_REGION)
-    for variant in variants_list_homopolymer_rejected.variants:
-        for variant_call in variant.variant_calls:
-            rejected_variant_call_ids_dict[variant_call.id].append(VariantCallTags.HOMOPOLYMER_REGION)
+    # key   = variant call ID
+    # value = bit flags of the stages that rejected the variant call
+    rejected_tags = [VariantCallTags.FAILED_FILTER,
+                     VariantCallTags.NEARBY_EXCLUDED_REGION,
+                     VariantCallTags.HOMOPOLYMER_REGION]
+    rejected_variant_call_ids_dict = defaultdict(int)
+    rejected_variant_ids = set()
+    for bit, variants_list_rejected_ in enumerate([variants_list_filters_rejected,
+                                                   variants_list_excluded_regions_rejected,
+                                                   variants_list_homopolymer_rejected]):
+        for variant in variants_list_rejected_.variants:
+            rejected_variant_ids.add(variant.id)
+            for variant_call in variant.variant_calls:
+                rejected_variant_call_ids_dict[variant_call.id] |= 1 << bit
+    # Tags for every combination of bit flags
+    rejected_tags_dict = {
+        flags: tuple(tag for bit, tag in enumerate(rejected_tags) if flags & (1 << bit))
+        for flags in range(1, 1 << len(rejected_tags))
+    }
 
-    # Step 8. Consolidate the passed and rejected variants lists
-    variants_list_passed = VariantsList()
-    variants_list_rejected = VariantsList()
+    # Step 8. Tag the variant calls as passed or rejected
+    # (in the order in which VariantsList.to_dataframe lists them)
+    passed = []
     for variant in variants_list.variants:
-        variant_calls_passed = []
-        variant_calls_rejected = []
+        # Variants without any rejected variant call pass as they are
+        if variant.id not in rejected_variant_ids:
+            for variant_call in variant.variant_calls:
+                variant_call.tags.add(VariantCallTags.PASSED)
+            passed.extend([True] * len(variant.variant_calls))
+            continue
         for variant_call in variant.variant_calls:
-            if variant_call.id in rejected_variant_call_ids_dict.keys():
-                for tag in rejected_variant_call_ids_dict[variant_call.id]:
-                    variant_call.tags.add(tag)
-                variant_calls_rejected.append(variant_call)
-            else:
+            flags = rejected_variant_call_ids_dict.get(variant_call.id, 0)
+            if flags == 0:
                 variant_call.tags.add(VariantCallTags.PASSED)
-                variant_calls_passed.append(variant_call)
-        variant_passed = Variant(id=variant.id)
-        variant_rejected = Variant(id=variant.id)
-        for variant_call in variant_calls_passed:
-            variant_passed.add_variant_call(variant_call=variant_call)
-        for variant_call in variant_calls_rejected:
-            variant_rejected.add_variant_call(variant_call=variant_call)
-        if variant_passed.num_variant_calls > 0:
-            variants_list_passed.add_variant(variant=variant_passed)
-        if variant_rejected.num_variant_calls > 0:
-            variants_list_rejected.add_variant(variant=variant_rejected)
+            else:
+                variant_call.tags.update(rejected_tags_dict[flags])
+            passed.append(flags == 0)
+    passed = np.asarray(passed, dtype=bool)
 
     # Step 9. Write to TSV files
+    # The variants list is converted to a DataFrame once and split into
+    # the passed and rejected rows
     logger.info('Started writing passed and rejected variants lists')
-    df_variants_passed = variants_list_passed.to_dataframe()
-    df_variants_passed.sort_values(['variant_id'], inplace=True)
-    df_variants_rejected = variants_list_rejected.to_dataframe()
-    df_variants_rejected.sort_values(['variant_id'], inplace=True)
-    if args.gzip:
-        if args.output_passed_tsv_file.endswith(".gz") == False:
-            args.output_passed_tsv_file = args.output_passed_tsv_file + '.gz'
-        if args.output_rejected_tsv_file.endswith(".gz") == False:
-            args.output_rejected_tsv_file = args.output_rejected_tsv_file + '.gz'
-        df_variants_passed.to_csv(
-            args.output_passed_tsv_file,
-            sep='\t',
-            index=False,
-            compression='gzip'
-        )
-        df_variants_rejected.to_csv(
-            args.output_rejected_tsv_file,
-            sep='\t',
-            index=False,
-            compression='gzip'
-        )
-    else:
-        df_variants_passed.to_csv(
-            args.output_passed_tsv_file,
-            sep='\t',
-            index=False
-        )
-        df_variants_rejected.to_csv(
-            args.output_rejected_tsv_file,
-            sep='\t',
-            index=False
+    args.output_passed_tsv_file = ensure_gz_suffix(file_path=args.output_passed_tsv_file, gzip=args.gzip)
+    args.output_rejected_tsv_file = ensure_gz_suffix(file_path=args.output_rejected_tsv_file, gzip=args.gzip)
+    df_variants = variants_list.to_dataframe()
+    for mask, output_tsv_file in [(passed, args.output_passed_tsv_file),
+                                  (~passed, args.output_rejected_tsv_file)]:
+        write_tsv_file(
+            df=sort_by_variant_id(df=df_variants[mask]),
+            tsv_file=output_tsv_file,
+            gzip=args.gzip,
+            num_threads=args.num_threads
         )
     logger.info('Finished writing passed and rejected variants lists')
@@ -19,13 +19,10 @@ and run 'intersect' command.
 
 import argparse
 import multiprocessing as mp
-import logging
 from ..constants import *
 from ..default import *
 from ..logging import get_logger
-from ..main import intersect
-from ..utilities import str2bool
-from ..variants_list import VariantsList
+from ..utilities import ensure_gz_suffix, str2bool, write_tsv_file
 
 
 logger = get_logger(__name__)
@@ -53,7 +50,8 @@ def add_cli_intersect_arg_parser(
     parser_required.add_argument(
         "--tsv-file", '-i',
         dest="tsv_file",
-        action='append',
+        action='extend',
+        nargs='+',
         required=True,
         help="Variants list TSV file. "
              "This TSV file must follow VSTOL's TSV format for this command to "
@@ -159,6 +157,9 @@ def run_cli_intersect_from_parsed_args(args: argparse.Namespace):
                     min_del_size_overlap
                     gzip
     """
+    from ..main import intersect
+    from ..variants_list import VariantsList
+
     # Step 1. Load variants lists
     logger.info("Started reading all TSV files")
     pool = mp.Pool(processes=args.num_threads)
@@ -186,12 +187,12 @@ def run_cli_intersect_from_parsed_args(args: argparse.Namespace):
                 (len(variants_list.variant_ids), len(variants_list.variant_call_ids)))
 
     # Step 3. Write to a TSV file
-    df_variants = variants_list.to_dataframe()
-    df_variants.sort_values(['variant_id'], inplace=True)
-    if args.gzip:
-        if args.output_tsv_file.endswith(".gz") == False:
-            args.output_tsv_file = args.output_tsv_file + '.gz'
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False, compression='gzip')
-    else:
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False)
+    df_variants = variants_list.to_dataframe(sort=True)
+    args.output_tsv_file = ensure_gz_suffix(file_path=args.output_tsv_file, gzip=args.gzip)
+    write_tsv_file(
+        df=df_variants,
+        tsv_file=args.output_tsv_file,
+        gzip=args.gzip,
+        num_threads=args.num_threads
+    )
 
@@ -17,26 +17,34 @@ The purpose of this python3 script is to implement the primary VSTOL command.
 
 
 import argparse
+import importlib
+import sys
 import vstolib
 from typing import Tuple
-from .cli_annotate import *
-from .cli_collapse import *
-from .cli_compare import *
-from .cli_filter import *
-from .cli_intersect import *
-from .cli_merge import *
-from .cli_overlap import *
-from .cli_score import *
-from .cli_subtract import *
-from .cli_tsv2vcf import *
-from .cli_vcf2tsv import *
-from .cli_visualize import *
 from ..logging import get_logger
 
 
 logger = get_logger(__name__)
 
 
+# key   = command
+# value = (module, function that adds the parser, function that runs the command)
+COMMANDS = {
+    'annotate': ('cli_annotate', 'add_cli_annotate_arg_parser', 'run_cli_annotate_from_parsed_args'),
+    'collapse': ('cli_collapse', 'add_cli_collapse_arg_parser', 'run_cli_collapse_from_parsed_args'),
+    'compare': ('cli_compare', 'add_cli_compare_arg_parser', 'run_cli_compare_from_parsed_args'),
+    'filter': ('cli_filter', 'add_cli_filter_arg_parser', 'run_cli_filter_from_parsed_args'),
+    'intersect': ('cli_intersect', 'add_cli_intersect_arg_parser', 'run_cli_intersect_from_parsed_args'),
+    'merge': ('cli_merge', 'add_cli_merge_arg_parser', 'run_cli_merge_from_parsed_args'),
+    'overlap': ('cli_overlap', 'add_cli_overlap_arg_parser', 'run_cli_overlap_from_parsed_args'),
+    'score': ('cli_score', 'add_cli_score_arg_parser', 'run_cli_score_from_parsed_args'),
+    'subtract': ('cli_subtract', 'add_cli_subtract_arg_parser', 'run_cli_subtract_from_parsed_args'),
+    'tsv2vcf': ('cli_tsv2vcf', 'add_cli_tsv2vcf_arg_parser', 'run_cli_tsv2vcf_from_parsed_args'),
+    'vcf2tsv': ('cli_vcf2tsv', 'add_cli_vcf2tsv_arg_parser', 'run_cli_vcf2tsv_from_parsed_args'),
+    'visualize': ('cli_visualize', 'add_cli_visuzlize_arg_parser', 'run_cli_visualize_from_parsed_args')
+}
+
+
 def init_arg_parser() -> Tuple[argparse.ArgumentParser, argparse._SubParsersAction]:
     """
     Initialize the input argument parser.
@@ -58,43 +66,24 @@ def init_arg_parser() -> Tuple[argparse.ArgumentParser, argparse._SubParsersActi
 
 def run():
     # Step 1. Initialize argument parser
+    # Only the module of the given command is imported (all commands are
+    # added if no command is given, e.g. 'vstol --help'). Command modules
+    # import vstolib.main, the Rust extension, pysam and the annotators
+    # in their run functions, so parsing arguments does not load them.
     arg_parser, sub_parsers = init_arg_parser()
-    sub_parsers = add_cli_annotate_arg_parser(sub_parsers=sub_parsers)     # annotate
-    sub_parsers = add_cli_collapse_arg_parser(sub_parsers=sub_parsers)     # collapse
-    sub_parsers = add_cli_compare_arg_parser(sub_parsers=sub_parsers)      # compare
-    sub_parsers = add_cli_filter_arg_parser(sub_parsers=sub_parsers)       # filter
-    sub_parsers = add_cli_intersect_arg_parser(sub_parsers=sub_parsers)    # intersect
-    sub_parsers = add_cli_merge_arg_parser(sub_parsers=sub_parsers)        # merge
-    sub_parsers = add_cli_overlap_arg_parser(sub_parsers=sub_parsers)      # overlap
-    sub_parsers = add_cli_score_arg_parser(sub_parsers=sub_parsers)        # score
-    sub_parsers = add_cli_subtract_arg_parser(sub_parsers=sub_parsers)     # subtract
-    sub_parsers = add_cli_tsv2vcf_arg_parser(sub_parsers=sub_parsers)      # tsv2vcf
-    sub_parsers = add_cli_vcf2tsv_arg_parser(sub_parsers=sub_parsers)      # vcf2tsv
-    sub_parsers = add_cli_visuzlize_arg_parser(sub_parsers=sub_parsers)    # visualize
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        commands = [sys.argv[1]]
+    else:
+        commands = list(COMMANDS.keys())
+    for command in commands:
+        module_name, add_arg_parser_function_name, _ = COMMANDS[command]
+        module = importlib.import_module('.' + module_name, package=__package__)
+        sub_parsers = getattr(module, add_arg_parser_function_name)(sub_parsers=sub_parsers)
     args = arg_parser.parse_args()
 
     # Step 2. Execute function based on CLI arguments
-    if args.which == 'annotate':
-        run_cli_annotate_from_parsed_args(args=args)
-    elif args.which == 'collapse':
-        run_cli_collapse_from_parsed_args(args=args)
-    elif args.which == 'filter':
-        run_cli_filter_from_parsed_args(args=args)
-    elif args.which == 'intersect':
-        run_cli_intersect_from_parsed_args(args=args)
-    elif args.which == 'merge':
-        run_cli_merge_from_parsed_args(args=args)
-    elif args.which == 'overlap':
-        run_cli_overlap_from_parsed_args(args=args)
-    elif args.which == 'score':
-        run_cli_score_from_parsed_args(args=args)
-    elif args.which == 'subtract':
-        run_cli_subtract_from_parsed_args(args=args)
-    elif args.which == 'tsv2vcf':
-        run_cli_tsv2vcf_from_parsed_args(args=args)
-    elif args.which == 'vcf2tsv':
-        run_cli_vcf2tsv_from_parsed_args(args=args)
-    elif args.which == 'visualize':
-        run_cli_visualize_from_parsed_args(args=args)
-    else:
+    if args.which not in COMMANDS:
         raise Exception("Invalid command: %s" % args.which)
+    module_name, _, run_function_name = COMMANDS[args.which]
+    module = importlib.import_module('.' + module_name, package=__package__)
+    getattr(module, run_function_name)(args=args)
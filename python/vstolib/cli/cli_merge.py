@@ -18,16 +18,11 @@ and run 'merge' command.
 
 
 import argparse
-import numpy as np
-import pandas as pd
-import multiprocessing as mp
-import logging
+from functools import partial
 from ..constants import *
 from ..default import *
 from ..logging import get_logger
-from ..main import merge
-from ..utilities import str2bool
-from ..variants_list import VariantsList
+from ..utilities import ensure_gz_suffix, parallel_imap, prefetch_files, read_tsv_dataframe, str2bool, write_tsv_file
 
 
 logger = get_logger(__name__)
@@ -55,7 +50,8 @@ def add_cli_merge_arg_parser(
     parser_required.add_argument(
         "--tsv-file", '-i',
         dest="tsv_file",
-        action='append',
+        action='extend',
+        nargs='+',
         required=True,
         help="Variants list TSV file. "
              "This TSV file must follow VSTOL's TSV format for this command to work properly."
@@ -139,6 +135,19 @@ def add_cli_merge_arg_parser(
         help="If 'yes', gzip the output TSV file (default: %s)."
              % GZIP
     )
+    parser_optional.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        required=False,
+        default=None,
+        help="If specified, input TSV files are cached (pickled) in this directory so "
+             "that later runs on unchanged files skip parsing. The least recently used "
+             "cache files are evicted once the directory holds more than %i bytes, and "
+             "the directory can be deleted at any time. Only use a directory that is "
+             "writable by trusted users (default: $VSTOL_CACHE_DIR if set, otherwise "
+             "no caching)." % CACHE_MAX_SIZE
+    )
 
     parser.set_defaults(which='merge')
     return sub_parsers
@@ -159,16 +168,29 @@ def run_cli_merge_from_parsed_args(args: argparse.Namespace):
                     min_ins_size_overlap
                     min_del_size_overlap
                     gzip
+                    cache_dir
     """
+    from ..main import merge
+    from ..variants_list import TSV_DTYPES, VariantsList
+
     # Step 1. Load variants lists
     logger.info("Started reading all TSV files")
-    pool = mp.Pool(processes=args.num_threads)
-    async_results = []
-    for tsv_file in args.tsv_file:
-        async_results.append(pool.apply_async(VariantsList.read_tsv_file, args=(tsv_file,False,True)))
-    pool.close()
-    pool.join()
-    variants_lists = [async_result.get() for async_result in async_results]
+    # TSV files parsed in an earlier run are loaded from their cache files
+    variants_lists = [VariantsList.load_cache_file(tsv_file=tsv_file, cache_dir=args.cache_dir) for tsv_file in args.tsv_file]
+    uncached_indices = [i for i, variants_list in enumerate(variants_lists) if variants_list is None]
+    uncached_tsv_files = [args.tsv_file[i] for i in uncached_indices]
+    prefetch_files(file_paths=uncached_tsv_files)
+    # Workers only parse the other TSV files; a DataFrame is several times smaller
+    # to pickle back to this process than the equivalent VariantsList. Each
+    # DataFrame is converted (and released) while the next files are parsed.
+    dfs = parallel_imap(
+        partial(read_tsv_dataframe, dtype=TSV_DTYPES, low_memory=False, memory_map=True),
+        uncached_tsv_files,
+        num_processes=args.num_threads
+    )
+    for df, i in zip(dfs, uncached_indices):
+        variants_lists[i] = VariantsList.load_dataframe(df=df)
+        variants_lists[i].write_cache_file(tsv_file=args.tsv_file[i], cache_dir=args.cache_dir)
     logger.info("Finished reading all TSV files")
 
     # Step 2. Merge variants lists
@@ -187,12 +209,12 @@ def run_cli_merge_from_parsed_args(args: argparse.Namespace):
                 (len(variants_list.variant_ids), len(variants_list.variant_call_ids)))
 
     # Step 3. Write to a TSV file
-    df_variants = variants_list.to_dataframe()
-    df_variants.sort_values(['variant_id'], inplace=True)
-    if args.gzip:
-        if args.output_tsv_file.endswith(".gz") == False:
-            args.output_tsv_file = args.output_tsv_file + '.gz'
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False, compression='gzip')
-    else:
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False)
+    df_variants = variants_list.to_dataframe(sort=True)
+    args.output_tsv_file = ensure_gz_suffix(file_path=args.output_tsv_file, gzip=args.gzip)
+    write_tsv_file(
+        df=df_variants,
+        tsv_file=args.output_tsv_file,
+        gzip=args.gzip,
+        num_threads=args.num_threads
+    )
 
@@ -18,17 +18,10 @@ and run 'overlap' command.
 
 
 import argparse
-import numpy as np
-import pandas as pd
-import multiprocessing as mp
-import logging
 from ..constants import *
 from ..default import *
-from ..genomic_ranges_list import GenomicRangesList
 from ..logging import get_logger
-from ..main import overlap
-from ..utilities import str2bool
-from ..variants_list import VariantsList
+from ..utilities import ensure_gz_suffix, str2bool, write_tsv_file
 
 
 logger = get_logger(__name__)
@@ -110,6 +103,10 @@ def run_cli_overlap_from_parsed_args(args: argparse.Namespace):
                     num_threads
                     gzip
     """
+    from ..genomic_ranges_list import GenomicRangesList
+    from ..main import overlap
+    from ..variants_list import VariantsList
+
     # Step 1. Load variants list
     logger.info("Loading variants list")
     variants_list = VariantsList.read_tsv_file(tsv_file=args.tsv_file)
@@ -132,11 +129,11 @@ def run_cli_overlap_from_parsed_args(args: argparse.Namespace):
                 (len(variants_list.variant_ids), len(variants_list.variant_call_ids)))
 
     # Step 3. Write to a TSV file
-    df_variants = variants_list.to_dataframe()
-    df_variants.sort_values(['variant_id'], inplace=True)
-    if args.gzip:
-        if args.output_tsv_file.endswith(".gz") == False:
-            args.output_tsv_file = args.output_tsv_file + '.gz'
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False, compression='gzip')
-    else:
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False)
+    df_variants = variants_list.to_dataframe(sort=True)
+    args.output_tsv_file = ensure_gz_suffix(file_path=args.output_tsv_file, gzip=args.gzip)
+    write_tsv_file(
+        df=df_variants,
+        tsv_file=args.output_tsv_file,
+        gzip=args.gzip,
+        num_threads=args.num_threads
+    )
@@ -18,16 +18,10 @@ and run 'score' command.
 
 
 import argparse
-import numpy as np
-import pandas as pd
-import multiprocessing as mp
-import logging
 from ..constants import *
 from ..default import *
 from ..logging import get_logger
-from ..main import score
-from ..utilities import str2bool
-from ..variants_list import VariantsList
+from ..utilities import check_output_format, ensure_gz_suffix, sort_by_variant_id, str2bool, write_tsv_file
 
 
 logger = get_logger(__name__)
@@ -99,6 +93,18 @@ def add_cli_score_arg_parser(
         required=False,
         help="Number of threads (default: %i)." % NUM_THREADS
     )
+    parser_optional.add_argument(
+        "--output-format",
+        dest="output_format",
+        type=str,
+        required=False,
+        default=OUTPUT_FORMAT,
+        choices=OutputFormats.ALL,
+        help="Output file format. 'parquet' writes a columnar Parquet file "
+             "(requires pyarrow; --gzip is ignored) that vstol commands "
+             "also accept as input. Allowed options: %s. Default: %s"
+             % (', '.join(OutputFormats.ALL), OUTPUT_FORMAT)
+    )
 
     parser.set_defaults(which='score')
     return sub_parsers
@@ -116,14 +122,20 @@ def run_cli_score_from_parsed_args(args: argparse.Namespace):
                     window
                     gzip
                     num_threads
+                    output_format
     """
-    # Step 1. Load variants
-    variants_list = VariantsList.read_tsv_file(tsv_file=args.tsv_file)
+    from ..main import score_dataframe
+    from ..variants_list import VariantsList
+
+    check_output_format(output_format=args.output_format)
+
+    # Step 1. Load variants (as a DataFrame; scoring does not need a VariantsList)
+    df_variants = VariantsList.read_tsv_file_as_dataframe(tsv_file=args.tsv_file)
 
     # Step 2. Calculate average alignment score for each breakpoint
     logger.info("Started calculating average alignment score for each breakpoint.")
-    variants_list = score(
-        variants_list=variants_list,
+    df_variants = score_dataframe(
+        df=df_variants,
         bam_file=args.bam_file,
         window=args.window,
         num_threads=args.num_threads
@@ -131,11 +143,14 @@ def run_cli_score_from_parsed_args(args: argparse.Namespace):
     logger.info("Finished calculating average alignment score for each breakpoint.")
 
     # Step 3. Write to a TSV file
-    df_variants = variants_list.to_dataframe()
-    df_variants.sort_values(['variant_id'], inplace=True)
-    if args.gzip:
-        if args.output_tsv_file.endswith(".gz") == False:
-            args.output_tsv_file = args.output_tsv_file + '.gz'
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False, compression='gzip')
-    else:
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False)
+    df_variants = sort_by_variant_id(df=df_variants)
+    if args.output_format == OutputFormats.PARQUET:
+        df_variants.to_parquet(args.output_tsv_file, index=False, compression='zstd')
+        return
+    args.output_tsv_file = ensure_gz_suffix(file_path=args.output_tsv_file, gzip=args.gzip)
+    write_tsv_file(
+        df=df_variants,
+        tsv_file=args.output_tsv_file,
+        gzip=args.gzip,
+        num_threads=args.num_threads
+    )
@@ -18,16 +18,21 @@ and run 'subtract' command.
 
 
 import argparse
-import numpy as np
-import pandas as pd
-import multiprocessing as mp
-import logging
-from ..constants import *
-from ..default import *
+from functools import partial
+from ..constants import OutputFormats
+from ..default import (
+    CACHE_MAX_SIZE,
+    GZIP,
+    MATCH_ALL_BREAKPOINTS,
+    MATCH_VARIANT_TYPES,
+    MAX_NEIGHBOR_DISTANCE,
+    MIN_DEL_SIZE_OVERLAP,
+    MIN_INS_SIZE_OVERLAP,
+    NUM_THREADS,
+    OUTPUT_FORMAT
+)
 from ..logging import get_logger
-from ..main import subtract
-from ..utilities import str2bool
-from ..variants_list import VariantsList
+from ..utilities import check_output_format, ensure_gz_suffix, parallel_imap, read_tsv_dataframe, str2bool, write_tsv_file
 
 
 logger = get_logger(__name__)
@@ -63,7 +68,8 @@ def add_cli_subtract_arg_parser(
     parser_required.add_argument(
         "--query-tsv-file", '-q',
         dest="query_tsv_files",
-        action='append',
+        action='extend',
+        nargs='+',
         required=True,
         help="Query variants list TSV file. "
              "This TSV file must follow VSTOL's TSV format for this command to "
@@ -148,6 +154,31 @@ def add_cli_subtract_arg_parser(
         help="If 'yes', gzip the output TSV file (default: %s)."
              % GZIP
     )
+    parser_optional.add_argument(
+        "--output-format",
+        dest="output_format",
+        type=str,
+        required=False,
+        default=OUTPUT_FORMAT,
+        choices=OutputFormats.ALL,
+        help="Output file format. 'parquet' writes a columnar Parquet file "
+             "(requires pyarrow; --gzip is ignored) that vstol commands "
+             "also accept as input. Allowed options: %s. Default: %s"
+             % (', '.join(OutputFormats.ALL), OUTPUT_FORMAT)
+    )
+    parser_optional.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        required=False,
+        default=None,
+        help="If specified, input TSV files are cached (pickled) in this directory so "
+             "that later runs on unchanged files skip parsing. The least recently used "
+             "cache files are evicted once the directory holds more than %i bytes, and "
+             "the directory can be deleted at any time. Only use a directory that is "
+             "writable by trusted users (default: $VSTOL_CACHE_DIR if set, otherwise "
+             "no caching)." % CACHE_MAX_SIZE
+    )
 
     parser.set_defaults(which='subtract')
     return sub_parsers
@@ -169,36 +200,69 @@ def run_cli_subtract_from_parsed_args(args: argparse.Namespace):
                     min_ins_size_overlap
                     min_del_size_overlap
                     gzip
+                    output_format
+                    cache_dir
     """
-    # Step 1. Load the target variants list
-    logger.info("Started reading the target variants list TSV file")
-    target_variants_list = VariantsList.read_tsv_file(tsv_file=args.target_tsv_file)
-    logger.info("Finished reading the target variants list TSV file")
+    from ..main import subtract
+    from ..variants_list import TSV_DTYPES, VariantsList
 
-    # Step 2. Diff each query variants list one at a time
+    check_output_format(output_format=args.output_format)
+
+    # Step 1. Load the target and query variants lists
+    logger.info("Started reading the target and query variants list TSV files")
+    tsv_files = [args.target_tsv_file] + args.query_tsv_files
+    # TSV files parsed in an earlier run are loaded from their cache files
+    variants_lists = [VariantsList.load_cache_file(tsv_file=tsv_file, cache_dir=args.cache_dir) for tsv_file in tsv_files]
+    uncached_indices = [i for i, variants_list in enumerate(variants_lists) if variants_list is None]
+    if variants_lists[0] is not None and variants_lists[0].size == 0:
+        uncached_indices = []
+    # Workers only parse the other TSV files (a DataFrame is several times smaller
+    # to pickle back to this process than the equivalent VariantsList)
+    dfs = parallel_imap(
+        partial(read_tsv_dataframe, dtype=TSV_DTYPES, low_memory=False, memory_map=True),
+        [tsv_files[i] for i in uncached_indices],
+        num_processes=args.num_threads
+    )
+    for df, i in zip(dfs, uncached_indices):
+        variants_lists[i] = VariantsList.load_dataframe(df=df)
+        variants_lists[i].write_cache_file(tsv_file=tsv_files[i], cache_dir=args.cache_dir)
+        if i == 0 and variants_lists[0].size == 0:
+            break
+    dfs.close()
+    target_variants_list = variants_lists[0]
+    if target_variants_list.size == 0:
+        # Nothing can be subtracted from an empty target variants list,
+        # so the query variants lists are not (or no longer) read
+        logger.info("The target variants list is empty. Skipping the query variants lists")
+        query_variants_lists = []
+    else:
+        query_variants_lists = variants_lists[1:]
+    logger.info("Finished reading the target and query variants list TSV files")
+
+    # Step 2. Subtract all query variants lists
     logger.info("Started subtracting")
-    for tsv_file in args.query_tsv_files:
-        logger.info("Loading %s" % tsv_file)
-        query_variants_list = VariantsList.read_tsv_file(tsv_file=tsv_file)
-        target_variants_list = subtract(
-            target_variants_list=target_variants_list,
-            query_variants_lists=[query_variants_list],
-            num_threads=args.num_threads,
-            max_neighbor_distance=args.max_neighbor_distance,
-            match_all_breakpoints=args.match_all_breakpoints,
-            match_variant_types=args.match_variant_types,
-            min_ins_size_overlap=args.min_ins_size_overlap,
-            min_del_size_overlap=args.min_del_size_overlap
-        )
+    target_variants_list = subtract(
+        target_variants_list=target_variants_list,
+        query_variants_lists=query_variants_lists,
+        num_threads=args.num_threads,
+        max_neighbor_distance=args.max_neighbor_distance,
+        match_all_breakpoints=args.match_all_breakpoints,
+        match_variant_types=args.match_variant_types,
+        min_ins_size_overlap=args.min_ins_size_overlap,
+        min_del_size_overlap=args.min_del_size_overlap
+    )
     logger.info("Finished subtracting")
 
     # Step 3. Write to a TSV file
-    df_variants = target_variants_list.to_dataframe()
-    df_variants.sort_values(['variant_id'], inplace=True)
-    if args.gzip:
-        if args.output_tsv_file.endswith(".gz") == False:
-            args.output_tsv_file = args.output_tsv_file + '.gz'
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False, compression='gzip')
-    else:
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False)
+    df_variants = target_variants_list.to_dataframe(sort=True)
+    if args.output_format == OutputFormats.PARQUET:
+        df_variants.to_parquet(args.output_tsv_file, index=False, compression='zstd')
+        return
+    args.output_tsv_file = ensure_gz_suffix(file_path=args.output_tsv_file, gzip=args.gzip)
+    write_tsv_file(
+        df=df_variants,
+        tsv_file=args.output_tsv_file,
+        gzip=args.gzip,
+        num_threads=args.num_threads
+    )
 
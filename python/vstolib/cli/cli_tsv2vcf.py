@@ -21,10 +21,7 @@ import argparse
 from ..constants import *
 from ..default import *
 from ..logging import get_logger
-from ..main import collapse
 from ..utilities import str2bool
-from ..variants_list import VariantsList
-from ..vcf.common import write_vcf_file
 
 
 logger = get_logger(__name__)
@@ -103,14 +100,19 @@ def run_cli_tsv2vcf_from_parsed_args(args: argparse.Namespace):
                     strategy
                     gzip
     """
-    variants_list = VariantsList.read_tsv_file(tsv_file=args.tsv_file)
-    variants_list_collapsed = collapse(
-        variants_list=variants_list,
+    from ..main import collapse_dataframe
+    from ..variants_list import VariantsList
+    from ..vcf.common import write_vcf_file
+
+    # The TSV file is collapsed as a DataFrame so that only the collapsed
+    # variant calls (one per variant) are loaded as a VariantsList
+    df_collapsed = collapse_dataframe(
+        df=VariantsList.read_tsv_file_as_dataframe(tsv_file=args.tsv_file),
         sample_id=args.sample_id,
         strategy=args.strategy
     )
     write_vcf_file(
-        variants_list=variants_list_collapsed,
+        variants_list=VariantsList.load_dataframe(df=df_collapsed),
         output_vcf_file=args.output_vcf_file,
         gzip=args.gzip
     )
@@ -21,14 +21,22 @@ import argparse
 from ..constants import *
 from ..default import *
 from ..logging import get_logger
-from ..main import vcf2tsv
-from ..utilities import str2bool
-from ..vcf.common import read_vcf_file
+from ..utilities import check_output_format, ensure_gz_suffix, str2bool, write_tsv_file
 
 
 logger = get_logger(__name__)
 
 
+# Sample ID parameters that must be specified for each variant calling method
+REQUIRED_PARAMETERS = {
+    VariantCallingMethods.CLAIRS: ['case_id'],
+    VariantCallingMethods.SAVANA: ['case_id', 'control_id'],
+    VariantCallingMethods.SEVERUS: ['case_id'],
+    VariantCallingMethods.STRELKA2_SOMATIC: ['case_id', 'control_id'],
+    VariantCallingMethods.SVISIONPRO: ['case_id', 'control_id']
+}
+
+
 def add_cli_vcf2tsv_arg_parser(
         sub_parsers: argparse._SubParsersAction
 ) -> argparse._SubParsersAction:
@@ -105,6 +113,18 @@ def add_cli_vcf2tsv_arg_parser(
         help="If 'yes', gzip the output TSV file (default: %s)."
              % GZIP
     )
+    parser_optional.add_argument(
+        "--output-format",
+        dest="output_format",
+        type=str,
+        required=False,
+        default=OUTPUT_FORMAT,
+        choices=OutputFormats.ALL,
+        help="Output file format. 'parquet' writes a columnar Parquet file "
+             "(requires pyarrow; --gzip is ignored) that vstol commands "
+             "also accept as input. Allowed options: %s. Default: %s"
+             % (', '.join(OutputFormats.ALL), OUTPUT_FORMAT)
+    )
 
     parser.set_defaults(which='vcf2tsv')
     return sub_parsers
@@ -122,27 +142,18 @@ def run_cli_vcf2tsv_from_parsed_args(args: argparse.Namespace):
                     source_id
                     output_tsv_file
                     gzip
+                    output_format
     """
-    if args.variant_calling_method == VariantCallingMethods.CLAIRS:
-        if args.case_id is None:
-            raise Exception("The parameter --case-id must be "
-                            "specified when --variant-calling-method clairs")
-    if args.variant_calling_method == VariantCallingMethods.STRELKA2_SOMATIC:
-        if args.case_id is None or args.control_id is None:
-            raise Exception("The parameters --case-id and --control-id must be "
-                            "specified when --variant-calling-method strelka2-somatic")
-    if args.variant_calling_method == VariantCallingMethods.SAVANA:
-        if args.case_id is None or args.control_id is None:
-            raise Exception("The parameters --case-id and --control-id must be "
-                            "specified when --variant-calling-method savana")
-    if args.variant_calling_method == VariantCallingMethods.SEVERUS:
-        if args.case_id is None:
-            raise Exception("The parameter --case-id must be "
-                            "specified when --variant-calling-method severus")
-    if args.variant_calling_method == VariantCallingMethods.SVISIONPRO:
-        if args.case_id is None or args.control_id is None:
-            raise Exception("The parameters --case-id and --control-id must be "
-                            "specified when --variant-calling-method svisionpro")
+    from ..main import vcf2tsv
+    from ..vcf.common import read_vcf_file
+
+    required_parameters = REQUIRED_PARAMETERS.get(args.variant_calling_method, [])
+    if any(getattr(args, parameter) is None for parameter in required_parameters):
+        raise Exception("The parameter%s %s must be specified when --variant-calling-method %s"
+                        % ('s' if len(required_parameters) > 1 else '',
+                           ' and '.join('--' + parameter.replace('_', '-') for parameter in required_parameters),
+                           args.variant_calling_method))
+    check_output_format(output_format=args.output_format)
     df_vcf = read_vcf_file(vcf_file=args.vcf_file)
     variants_list = vcf2tsv(
         df_vcf=df_vcf,
@@ -155,9 +166,12 @@ def run_cli_vcf2tsv_from_parsed_args(args: argparse.Namespace):
 
     df_variants = variants_list.to_dataframe()
 
-    if args.gzip:
-        if args.output_tsv_file.endswith(".gz") == False:
-            args.output_tsv_file = args.output_tsv_file + '.gz'
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False, compression='gzip')
-    else:
-        df_variants.to_csv(args.output_tsv_file, sep='\t', index=False)
+    if args.output_format == OutputFormats.PARQUET:
+        df_variants.to_parquet(args.output_tsv_file, index=False, compression='zstd')
+        return
+    args.output_tsv_file = ensure_gz_suffix(file_path=args.output_tsv_file, gzip=args.gzip)
+    write_tsv_file(
+        df=df_variants,
+        tsv_file=args.output_tsv_file,
+        gzip=args.gzip
+    )
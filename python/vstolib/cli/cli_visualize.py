@@ -20,8 +20,6 @@ and run 'visualize' command.
 import argparse
 from ..constants import *
 from ..logging import get_logger
-from ..main import visualize
-from ..vcf.common import read_vcf_file
 
 
 logger = get_logger(__name__)
@@ -76,6 +74,8 @@ def run_cli_visualize_from_parsed_args(args: argparse.Namespace):
                     tsv_file
                     output_pdf_file
     """
+    from ..main import visualize
+
     visualize(
         rscript_path=args.rscript_path,
         tsv_file=args.tsv_file,
@@ -16,27 +16,33 @@ The purpose of this python3 script is to define constants.
 """
 
 
+from types import MappingProxyType
+
+
 class Annotators:
+    __slots__ = ()
     ENSEMBL = 'ensembl'
     GENCODE = 'gencode'
     REFSEQ = 'refseq'
     ANNOVAR = 'annovar'
-    ALL = [
+    ALL = (
         ENSEMBL,
         GENCODE,
         REFSEQ,
         ANNOVAR
-    ]
+    )
 
 
 class CollapseStrategies:
+    __slots__ = ()
     MAX_ALTERNATE_ALLELE_READ_COUNT = 'max_alternate_allele_read_count'
-    ALL = [
-        MAX_ALTERNATE_ALLELE_READ_COUNT
-    ]
+    ALL = (
+        MAX_ALTERNATE_ALLELE_READ_COUNT,
+    )
 
 
 class GenomicRegionTypes:
+    __slots__ = ()
     EXONIC = 'exonic'
     INTRONIC = 'intronic'
     FIVE_PRIME_UTR = '5prime_utr'
@@ -45,7 +51,7 @@ class GenomicRegionTypes:
     START_CODON = 'start_codon'
     STOP_CODON = 'stop_codon'
     INTERGENIC = 'intergenic'
-    ALL = [
+    ALL = (
         EXONIC,
         INTRONIC,
         FIVE_PRIME_UTR,
@@ -54,40 +60,54 @@ class GenomicRegionTypes:
         START_CODON,
         STOP_CODON,
         INTERGENIC
-    ]
+    )
 
 
 class NucleicAcidTypes:
+    __slots__ = ()
     DNA = 'dna'
     RNA = 'rna'
     DNA_RNA = 'dna_rna'
-    ALL = [
+    ALL = (
         DNA,
         RNA,
         DNA_RNA
-    ]
+    )
+
+
+class OutputFormats:
+    __slots__ = ()
+    TSV = 'tsv'
+    PARQUET = 'parquet'
+    ALL = (
+        TSV,
+        PARQUET
+    )
 
 
 class Strands:
+    __slots__ = ()
     POSITIVE = '+'
     NEGATIVE = '-'
     BOTH_STRANDS = '+-'
 
 
 class TranslocationOrientations:
+    __slots__ = ()
     ORIENTATION_1 = 't[p['  # piece extending to the right of p is joined after t
     ORIENTATION_2 = 't]p]'  # reverse complement piece extending left of p is joined after t
     ORIENTATION_3 = ']p]t'  # piece extending to the left of p is joined before t
     ORIENTATION_4 = '[p[t'  # reverse complement extending right of p is joined before t
-    ALL = [
+    ALL = (
         ORIENTATION_1,
         ORIENTATION_2,
         ORIENTATION_3,
         ORIENTATION_4
-    ]
+    )
 
 
 class VariantCallingMethods:
+    __slots__ = ()
     CLAIRS = 'clairs'
     CUTESV = 'cutesv'
     DBSNP = 'dbsnp'
@@ -103,7 +123,7 @@ class VariantCallingMethods:
     STRELKA2_SOMATIC = 'strelka2-somatic'
     SVIM = 'svim'
     SVISIONPRO = 'svisionpro'
-    ALL = [
+    ALL = (
         CLAIRS,
         CUTESV,
         DBSNP,
@@ -119,10 +139,11 @@ class VariantCallingMethods:
         STRELKA2_SOMATIC,
         SVIM,
         SVISIONPRO
-    ]
+    )
 
     class AttributeTypes:
-        CLAIRS = {
+        __slots__ = ()
+        CLAIRS = MappingProxyType({
             'ID': str,
             'H': bool,
             'FAU': int,
@@ -149,8 +170,8 @@ class VariantCallingMethods:
             'NCU': int,
             'NGU': int,
             'NTU': int
-        }
-        CUTESV = {
+        })
+        CUTESV = MappingProxyType({
             'ID': str,
             'SVTYPE': str,
             'SVLEN': int,
@@ -168,11 +189,11 @@ class VariantCallingMethods:
             'PL': str,
             'DR': int,
             'DV': int
-        }
-        DBSNP = {
+        })
+        DBSNP = MappingProxyType({
             'ID': str
-        }
-        DELLY2_SOMATIC = {
+        })
+        DELLY2_SOMATIC = MappingProxyType({
             'ID': str,
             'SVTYPE': str,
             'SVMETHOD': str,
@@ -208,8 +229,8 @@ class VariantCallingMethods:
             'RV': int,
             'PRECISE': bool,
             'SOMATIC': bool
-        }
-        DEEPVARIANT = {
+        })
+        DEEPVARIANT = MappingProxyType({
             'ID': str,
             'END': int,
             'GT': str,
@@ -220,8 +241,8 @@ class VariantCallingMethods:
             'VAF': float,
             'PL': str,
             'MED_DP': int
-        }
-        GATK4_MUTECT2 = {
+        })
+        GATK4_MUTECT2 = MappingProxyType({
             'ID': str,
             'AS_FilterStatus': str,
             'AS_SB_TABLE': str,
@@ -260,8 +281,8 @@ class VariantCallingMethods:
             'PL': int,
             'PS': int,
             'SB': str
-        }
-        GRIDSS = {
+        })
+        GRIDSS = MappingProxyType({
             'GT': str,
             'AF': float,
             'ANRP': int,
@@ -359,8 +380,8 @@ class VariantCallingMethods:
             'TAF': float,
             'LOCAL_LINKED_BY': str,
             'REMOTE_LINKED_BY': str
-        }
-        LUMPY_SOMATIC = {
+        })
+        LUMPY_SOMATIC = MappingProxyType({
             'ID': str,
             'SVTYPE': str,
             'STRANDS': str,
@@ -383,8 +404,8 @@ class VariantCallingMethods:
             'PRECISE': bool,
             'IMPRECISE': bool,
             'SECONDARY': bool
-        }
-        MANTA_SOMATIC = {
+        })
+        MANTA_SOMATIC = MappingProxyType({
             'ID': str,
             'SVTYPE': str,
             'SVLEN': int,
@@ -409,8 +430,8 @@ class VariantCallingMethods:
             'JUNCTION_SOMATICSCORE': int,
             'PR': str,
             'SR': str
-        }
-        PBSV = {
+        })
+        PBSV = MappingProxyType({
             'ID': str,
             'SVTYPE': str,
             'END': int,
@@ -425,8 +446,8 @@ class VariantCallingMethods:
             'AD': str,
             'SAC': str,
             'NotFullySpanned': bool
-        }
-        SAVANA = {
+        })
+        SAVANA = MappingProxyType({
             'ID': str,
             'SVTYPE': str,
             'MATEID': str,
@@ -451,8 +472,8 @@ class VariantCallingMethods:
             'GT': str,
             'PRECISE': bool,
             'CLASS': str
-        }
-        SEVERUS = {
+        })
+        SEVERUS = MappingProxyType({
             'ID': str,
             'SVTYPE': str,
             'SVLEN': int,
@@ -476,8 +497,8 @@ class VariantCallingMethods:
             'VAF': float,
             'hVAF': str,
             'PRECISE': bool
-        }
-        SNIFFLES2 = {
+        })
+        SNIFFLES2 = MappingProxyType({
             'ID': str,
             'SVLEN': int,
             'SVTYPE': str,
@@ -502,8 +523,8 @@ class VariantCallingMethods:
             'DR': int,
             'DV': int,
             'PRECISE': bool
-        }
-        STRELKA2_SOMATIC = {
+        })
+        STRELKA2_SOMATIC = MappingProxyType({
             'ID': str,
             'QSS': int,
             'TQSS': int,
@@ -563,8 +584,8 @@ class VariantCallingMethods:
             'PL': int,
             'PS': int,
             'SB': float
-        }
-        SVIM = {
+        })
+        SVIM = MappingProxyType({
             'ID': str,
             'SVTYPE': str,
             'END': int,
@@ -582,8 +603,8 @@ class VariantCallingMethods:
             'DP': int,
             'AD': str,
             'CN': int
-        }
-        SVISIONPRO = {
+        })
+        SVISIONPRO = MappingProxyType({
             'ID': str,
             'END': int,
             'IT': str,
@@ -598,10 +619,11 @@ class VariantCallingMethods:
             'DR': int,
             'DV': int,
             'PRECISE': bool
-        }
+        })
 
 
 class VariantCallTags:
+    __slots__ = ()
     PASSED = 'passed'
     FAILED_FILTER = 'failed_filter'
     HOMOPOLYMER_REGION = 'homopolymer_region'
@@ -610,6 +632,7 @@ class VariantCallTags:
 
 
 class VariantFilterOperators:
+    __slots__ = ()
     LESS_THAN = '<'
     LESS_THAN_OR_EQUAL_TO = '<='
     GREATER_THAN = '>'
@@ -620,6 +643,7 @@ class VariantFilterOperators:
 
 
 class VariantFilterQuantifiers:
+    __slots__ = ()
     ALL = 'all'
     ANY = 'any'
     MEDIAN = 'median'
@@ -629,11 +653,13 @@ class VariantFilterQuantifiers:
 
 
 class VariantFilterSampleTypes:
+    __slots__ = ()
     CASE = 'case'
     CONTROL = 'control'
 
 
 class VariantTypes:
+    __slots__ = ()
     SINGLE_NUCLEOTIDE_VARIANT = 'SNV'
     MULTI_NUCLEOTIDE_VARIANT = 'MNV'
     INSERTION = 'INS'
@@ -644,7 +670,7 @@ class VariantTypes:
     BREAKPOINT = 'BND'
     REFERENCE = 'REF'
 
-    ALL = [
+    ALL = (
         SINGLE_NUCLEOTIDE_VARIANT,
         MULTI_NUCLEOTIDE_VARIANT,
         INSERTION,
@@ -653,7 +679,13 @@ class VariantTypes:
         DUPLICATION,
         TRANSLOCATION,
         BREAKPOINT
-    ]
+    )
+
+    # Types whose second breakend is encoded in the ALT field
+    BREAKEND_TYPES = frozenset((
+        TRANSLOCATION,
+        BREAKPOINT
+    ))
 
     FULL_NAMES = {
         REFERENCE: 'Reference',
@@ -665,23 +697,24 @@ class VariantTypes:
         TRANSLOCATION: 'Translocation'
     }
 
-    QueryTypeDictionary = {
-        SINGLE_NUCLEOTIDE_VARIANT: [SINGLE_NUCLEOTIDE_VARIANT],
-        MULTI_NUCLEOTIDE_VARIANT: [MULTI_NUCLEOTIDE_VARIANT],
-        INSERTION: [DUPLICATION, INSERTION],
-        DELETION: [DELETION],
-        INVERSION: [BREAKPOINT, INVERSION, TRANSLOCATION],
-        DUPLICATION: [DUPLICATION, INSERTION],
-        TRANSLOCATION: [BREAKPOINT, INVERSION, TRANSLOCATION],
-        BREAKPOINT: [BREAKPOINT, INVERSION, TRANSLOCATION],
-    }
+    QueryTypeDictionary = MappingProxyType({
+        SINGLE_NUCLEOTIDE_VARIANT: frozenset((SINGLE_NUCLEOTIDE_VARIANT,)),
+        MULTI_NUCLEOTIDE_VARIANT: frozenset((MULTI_NUCLEOTIDE_VARIANT,)),
+        INSERTION: frozenset((DUPLICATION, INSERTION)),
+        DELETION: frozenset((DELETION,)),
+        INVERSION: frozenset((BREAKPOINT, INVERSION, TRANSLOCATION)),
+        DUPLICATION: frozenset((DUPLICATION, INSERTION)),
+        TRANSLOCATION: frozenset((BREAKPOINT, INVERSION, TRANSLOCATION)),
+        BREAKPOINT: frozenset((BREAKPOINT, INVERSION, TRANSLOCATION)),
+    })
 
     class DuplicationSubtypes:
+        __slots__ = ()
         TANDEM_DUPLICATION = 'DUP_TANDEM'
         SEGMENTAL_DUPLICATION = 'DUP_SEG'
         INTERSPERSED_DUPLICATION = 'DUP_INTERSPERSED'
-        ALL = [
+        ALL = (
             TANDEM_DUPLICATION,
             SEGMENTAL_DUPLICATION,
             INTERSPERSED_DUPLICATION
-        ]
+        )
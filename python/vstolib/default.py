@@ -16,17 +16,32 @@ The purpose of this python3 script is to define VSTOL default parameters.
 """
 
 
-ANNOVAR_PROTOCOL_OPERATION = {     # ANNOVAR protocol and corresponding operation
-    'refGene': 'g',
-    'exac03': 'f',
-    '1000g2015aug_eur': 'f',
-    '1000g2015aug_eas': 'f',
-    '1000g2015aug_sas': 'f',
-    'clinvar_20210501': 'f',
-    'cosmic96_coding': 'f',
-    'avsnp150': 'f',
-    'dbnsfp42c': 'f'
-}
+ANNOVAR_PROTOCOLS = (             # ANNOVAR protocols
+    'refGene',
+    'exac03',
+    '1000g2015aug_eur',
+    '1000g2015aug_eas',
+    '1000g2015aug_sas',
+    'clinvar_20210501',
+    'cosmic96_coding',
+    'avsnp150',
+    'dbnsfp42c'
+)
+ANNOVAR_OPERATIONS = (            # ANNOVAR operation of each protocol in ANNOVAR_PROTOCOLS
+    'g',
+    'f',
+    'f',
+    'f',
+    'f',
+    'f',
+    'f',
+    'f',
+    'f'
+)
+ANNOVAR_PROTOCOL = ','.join(ANNOVAR_PROTOCOLS)
+ANNOVAR_OPERATION = ','.join(ANNOVAR_OPERATIONS)
+CACHE_MAX_SIZE = 10 * 1024 ** 3  # bytes
+CHUNK_SIZE = 100000
 GZIP = 'no'
 HOMOPOLYMER_LENGTH = 10
 MATCH_ALL_BREAKPOINTS = 'yes'
@@ -35,6 +50,7 @@ MAX_NEIGHBOR_DISTANCE = 100
 MIN_DEL_SIZE_OVERLAP = 0.5
 MIN_INS_SIZE_OVERLAP = 0.5
 NUM_THREADS = 4
+OUTPUT_FORMAT = 'tsv'
 RANDOM_SEED = 1
 WINDOW = 10000
 
@@ -16,12 +16,15 @@ The purpose of this python3 script is to implement the Ensembl dataclass.
 """
 
 
+import numpy as np
 import pyensembl
-from dataclasses import dataclass
-from typing import List, Tuple
+from dataclasses import dataclass, field
+from pyensembl.locus import normalize_chromosome
+from typing import Dict, List, Tuple
 from .annotator import Annotator
 from .constants import *
 from .logging import get_logger
+from .variant import Variant
 from .variant_call_annotation import VariantCallAnnotation
 from .variant_call import VariantCall
 from .variants_list import VariantsList
@@ -36,6 +39,27 @@ class Ensembl(Annotator):
     species: str
     _ensembl = None
 
+    # Annotations of positions seen by this annotator. annotate() runs in worker
+    # processes (see Annotator.annotate_by_chromosome), each of which fills its
+    # own copy that is discarded with the worker at the end of the call.
+    # key   =   (chromosome, position)
+    # value =   list of VariantCallAnnotation objects
+    _annotations_cache: Dict[Tuple[str, int], List[VariantCallAnnotation]] = field(default_factory=dict, repr=False)
+
+    # Genes of each chromosome (indexed the first time the chromosome is annotated)
+    # key   =   chromosome
+    # value =   (gene start positions (sorted), gene end positions,
+    #            gene IDs, maximum gene length)
+    _genes_index: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, int]] = field(default_factory=dict, repr=False)
+
+    # key   =   gene ID
+    # value =   list of transcript IDs
+    _transcript_ids: Dict[str, List[str]] = field(default_factory=dict, repr=False)
+
+    # key   =   transcript ID
+    # value =   list of (exon start, exon end, exon ID)
+    _exons: Dict[str, List[Tuple[int, int, str]]] = field(default_factory=dict, repr=False)
+
     @property
     def ensembl(self) -> pyensembl.EnsemblRelease:
         if self._ensembl is None:
@@ -52,20 +76,86 @@ class Ensembl(Annotator):
 
         Parameters:
             variants_list   :   VariantsList.
+            num_processes   :   Number of processes.
 
         Returns:
             VariantsList
         """
-        for i in range(0, len(variants_list.variants)):
-            for j in range(0, len(variants_list.variants[i].variant_calls)):
-                position_1_annotations, position_2_annotations = self.annotate_variant_call_using_pyensembl(
-                    variants_list.variants[i].variant_calls[j]
+        return self.annotate_by_chromosome(variants_list=variants_list,
+                                           num_processes=num_processes)
+
+    def annotate_variant(self, variant: Variant) -> Variant:
+        for i in range(0, variant.num_variant_calls):
+            position_1_annotations, position_2_annotations = self.annotate_variant_call_using_pyensembl(
+                variant.variant_calls[i]
+            )
+            for annotation in position_1_annotations:
+                variant.variant_calls[i].position_1_annotations.append(annotation)
+            for annotation in position_2_annotations:
+                variant.variant_calls[i].position_2_annotations.append(annotation)
+        return variant
+
+    def __find_gene_ids(
+            self,
+            chromosome: str,
+            position: int
+    ) -> List[str]:
+        """
+        Find the IDs of genes that overlap a position. Genes of a chromosome
+        are read from the pyensembl database with one query and indexed the
+        first time the chromosome is seen (instead of querying the database
+        for every position).
+
+        Parameters:
+            chromosome              :   Chromosome (without 'chr').
+            position                :   Position.
+
+        Returns:
+            List of gene IDs (sorted, as returned by pyensembl.genes_at_locus).
+        """
+        contig = normalize_chromosome(chromosome)
+        if contig not in self._genes_index:
+            rows = self.ensembl.db.query(
+                select_column_names=['gene_id', 'start', 'end'],
+                filter_column='seqname',
+                filter_value=contig,
+                feature='gene',
+                distinct=True
+            )
+            gene_ids = np.array([row[0] for row in rows], dtype=object)
+            starts = np.array([row[1] for row in rows], dtype=np.int64)
+            ends = np.array([row[2] for row in rows], dtype=np.int64)
+            order = np.argsort(starts, kind='stable')
+            self._genes_index[contig] = (
+                starts[order],
+                ends[order],
+                gene_ids[order],
+                int((ends - starts).max()) if len(rows) > 0 else 0
+            )
+        starts, ends, gene_ids, max_gene_length = self._genes_index[contig]
+        # Only genes that start within max_gene_length upstream of the position can overlap it
+        lo = np.searchsorted(starts, position - max_gene_length, side='left')
+        hi = np.searchsorted(starts, position, side='right')
+        return sorted(set(gene_ids[lo:hi][ends[lo:hi] >= position].tolist()))
+
+    def __get_transcript_ids(self, gene_id: str) -> List[str]:
+        if gene_id not in self._transcript_ids:
+            self._transcript_ids[gene_id] = self.ensembl.transcript_ids_of_gene_id(gene_id)
+        return self._transcript_ids[gene_id]
+
+    def __get_exons(self, transcript_id: str) -> List[Tuple[int, int, str]]:
+        # One query per transcript (Transcript.exons queries the database
+        # on every access and then once more for each exon)
+        if transcript_id not in self._exons:
+            self._exons[transcript_id] = [
+                tuple(row) for row in self.ensembl.db.query(
+                    select_column_names=['start', 'end', 'exon_id'],
+                    filter_column='transcript_id',
+                    filter_value=transcript_id,
+                    feature='exon'
                 )
-                for annotation in position_1_annotations:
-                    variants_list.variants[i].variant_calls[j].position_1_annotations.append(annotation)
-                for annotation in position_2_annotations:
-                    variants_list.variants[i].variant_calls[j].position_2_annotations.append(annotation)
-        return variants_list
+            ]
+        return self._exons[transcript_id]
 
     def annotate_position_using_pyensembl(
             self,
@@ -85,7 +175,10 @@ class Ensembl(Annotator):
         """
         variant_call_annotations = []
         chromosome = chromosome.replace('chr', '')
-        genes = self.ensembl.genes_at_locus(contig=chromosome, position=position)
+        genes = [
+            self.ensembl.gene_by_id(gene_id)
+            for gene_id in self.__find_gene_ids(chromosome=chromosome, position=position)
+        ]
         if len(genes) == 0:
             variant_call_annotation = VariantCallAnnotation(
                 annotator=Annotators.ENSEMBL,
@@ -96,7 +189,7 @@ class Ensembl(Annotator):
             variant_call_annotations.append(variant_call_annotation)
         else:
             for gene in genes:
-                for transcript_id in self.ensembl.transcript_ids_of_gene_id(gene.gene_id):
+                for transcript_id in self.__get_transcript_ids(gene.gene_id):
                     transcript = self.ensembl.transcript_by_id(transcript_id)
                     if transcript.start > position or transcript.end < position:
                         continue
@@ -137,10 +230,10 @@ class Ensembl(Annotator):
                         )
                     else:
                         exon_id = ''
-                        for exon in transcript.exons:
-                            if exon.start <= position <= exon.end:
+                        for exon_start, exon_end, exon_id_ in self.__get_exons(transcript.transcript_id):
+                            if exon_start <= position <= exon_end:
                                 region = GenomicRegionTypes.EXONIC
-                                exon_id = exon.exon_id
+                                exon_id = exon_id_
                                 break
                         variant_call_annotation = VariantCallAnnotation(
                             annotator=Annotators.ENSEMBL,
@@ -179,12 +272,25 @@ class Ensembl(Annotator):
         Returns:
             Tuple[position_1_annotations,position_2_annotations]
         """
-        position_1_annotations = self.annotate_position_using_pyensembl(
+        position_1_annotations = self.__annotate_position_cached(
             chromosome=variant_call.chromosome_1,
             position=variant_call.position_1
         )
-        position_2_annotations = self.annotate_position_using_pyensembl(
+        position_2_annotations = self.__annotate_position_cached(
             chromosome=variant_call.chromosome_2,
             position=variant_call.position_2
         )
         return position_1_annotations, position_2_annotations
+
+    def __annotate_position_cached(
+            self,
+            chromosome: str,
+            position: int
+    ) -> List[VariantCallAnnotation]:
+        key = (chromosome, position)
+        if key not in self._annotations_cache:
+            self._annotations_cache[key] = self.annotate_position_using_pyensembl(
+                chromosome=chromosome,
+                position=position
+            )
+        return self._annotations_cache[key]
@@ -16,12 +16,11 @@ The purpose of this python3 script is to implement the Gencode dataclass.
 """
 
 
+import numpy as np
 import pandas as pd
-import multiprocessing as mp
 from collections import defaultdict
 from dataclasses import dataclass, field
-from functools import partial
-from typing import List, Tuple, Set
+from typing import Dict, List, Tuple, Set
 from .annotator import Annotator
 from .constants import *
 from .logging import get_logger
@@ -48,6 +47,11 @@ class Gencode(Annotator):
     df_stop_codons: pd.DataFrame = None
     df_utrs: pd.DataFrame = None
 
+    # Annotations of positions seen during the current annotate() call
+    # key   =   (chromosome, position)
+    # value =   list of VariantCallAnnotation objects
+    _annotations_cache: Dict[Tuple[str, int], List[VariantCallAnnotation]] = field(default_factory=dict, repr=False)
+
     def __post_init__(self):
         self.__read_gtf_file_genes()  # add genes
         self.__read_gtf_file_transcripts()  # add transcripts
@@ -55,6 +59,7 @@ class Gencode(Annotator):
         self.__read_gtf_file_start_codons()  # update start codon start and end positions
         self.__read_gtf_file_stop_codons()  # update stop codon start and end positions
         self.__read_gtf_file_utr()  # update UTR start and end positions
+        self.__build_indices()  # index genes, transcripts, exons and UTRs for annotate_position
 
     @staticmethod
     def get_stable_ensembl_id(id: str) -> Tuple[str,str]:
@@ -451,6 +456,67 @@ class Gencode(Annotator):
         self.df_utrs = pd.DataFrame(data)
         logger.info('Loaded %i UTRs in total.' % len(self.df_utrs))
 
+    def __build_indices(self):
+        """
+        Index self.df_genes by chromosome and group transcripts, exons and UTRs
+        by gene and transcript so that annotate_position does not scan the tables.
+        """
+        # key   =   chromosome
+        # value =   (gene start positions (sorted), gene end positions,
+        #            row indices of self.df_genes, maximum gene length)
+        self.__genes_index = {}
+        for chromosome, df in self.df_genes.groupby('chromosome', sort=False):
+            order = np.argsort(df['start'].values, kind='stable')
+            self.__genes_index[chromosome] = (
+                df['start'].values[order],
+                df['end'].values[order],
+                df.index.values[order],
+                int((df['end'] - df['start']).max())
+            )
+        self.__genes = self.df_genes.to_dict('records')
+
+        # key   =   gene ID
+        # value =   list of transcripts (rows of self.df_transcripts)
+        self.__transcripts = defaultdict(list)
+        for transcript in self.df_transcripts.to_dict('records'):
+            self.__transcripts[transcript['gene_id']].append(transcript)
+
+        # key   =   (gene ID, transcript ID)
+        # value =   list of exons (rows of self.df_exons)
+        self.__exons = defaultdict(list)
+        for exon in self.df_exons.to_dict('records'):
+            self.__exons[(exon['gene_id'], exon['transcript_id'])].append(exon)
+
+        # key   =   (gene ID, transcript ID)
+        # value =   list of UTRs (rows of self.df_utrs)
+        self.__utrs = defaultdict(list)
+        for utr in self.df_utrs.to_dict('records'):
+            self.__utrs[(utr['gene_id'], utr['transcript_id'])].append(utr)
+
+    def __find_genes(
+            self,
+            chromosome: str,
+            position: int
+    ) -> List[dict]:
+        """
+        Find genes that overlap a position.
+
+        Parameters:
+            chromosome              :   Chromosome.
+            position                :   Position.
+
+        Returns:
+            List of genes (rows of self.df_genes) in the order of self.df_genes.
+        """
+        if chromosome not in self.__genes_index:
+            return []
+        starts, ends, indices, max_gene_length = self.__genes_index[chromosome]
+        # Only genes that start within max_gene_length upstream of the position can overlap it
+        lo = np.searchsorted(starts, position - max_gene_length, side='left')
+        hi = np.searchsorted(starts, position, side='right')
+        matched_indices = indices[lo:hi][ends[lo:hi] >= position]
+        return [self.__genes[i] for i in sorted(matched_indices.tolist())]
+
     def annotate_position(
             self,
             chromosome: str,
@@ -467,12 +533,8 @@ class Gencode(Annotator):
             List[VariantCallAnnotation]
         """
         variant_call_annotations = []
-        df_genes_matched = self.df_genes[
-            (self.df_genes['chromosome'] == chromosome) &
-            (self.df_genes['start'] <= position) &
-            (self.df_genes['end'] >= position)
-        ]
-        if len(df_genes_matched) == 0:
+        genes_matched = self.__find_genes(chromosome=chromosome, position=position)
+        if len(genes_matched) == 0:
             variant_call_annotation = VariantCallAnnotation(
                 annotator=Annotators.GENCODE,
                 annotator_version=self.version,
@@ -481,48 +543,41 @@ class Gencode(Annotator):
             )
             variant_call_annotations.append(variant_call_annotation)
             return variant_call_annotations
-        for _, row in df_genes_matched.iterrows():
-            gene_id = row['gene_id']
-            gene_id_stable = row['gene_id_stable']
-            gene_name = row['name']
-            gene_strand = row['strand']
-            gene_type = row['type']
-            gene_version = row['version']
-            df_transcripts_matched = self.df_transcripts[
-                (self.df_transcripts['gene_id'] == row['gene_id'])
-            ]
-            for _, row2 in df_transcripts_matched.iterrows():
-                transcript_id = row2['transcript_id']
-                transcript_id_stable = row2['transcript_id_stable']
-                transcript_name = row2['name']
-                transcript_strand = row2['strand']
-                transcript_type = row2['type']
-                transcript_version = row2['version']
-                transcript_start = row2['start']
-                transcript_end = row2['end']
+        for gene in genes_matched:
+            gene_id = gene['gene_id']
+            gene_id_stable = gene['gene_id_stable']
+            gene_name = gene['name']
+            gene_strand = gene['strand']
+            gene_type = gene['type']
+            gene_version = gene['version']
+            for transcript in self.__transcripts[gene_id]:
+                transcript_id = transcript['transcript_id']
+                transcript_id_stable = transcript['transcript_id_stable']
+                transcript_name = transcript['name']
+                transcript_strand = transcript['strand']
+                transcript_type = transcript['type']
+                transcript_version = transcript['version']
+                transcript_start = transcript['start']
+                transcript_end = transcript['end']
                 if transcript_start > position or transcript_end < position:
                     continue
-                df_utrs_matched = self.df_utrs[
-                    (self.df_utrs['gene_id'] == gene_id) &
-                    (self.df_utrs['transcript_id'] == transcript_id) &
-                    (self.df_utrs['utr_start'] <= position) &
-                    (self.df_utrs['utr_end'] >= position)
+                utrs_matched = [
+                    utr for utr in self.__utrs[(gene_id, transcript_id)]
+                    if utr['utr_start'] <= position <= utr['utr_end']
                 ]
-                if len(df_utrs_matched) == 0:
-                    df_exons_matched = self.df_exons[
-                        (self.df_exons['gene_id'] == row['gene_id']) &
-                        (self.df_exons['transcript_id'] == transcript_id) &
-                        (self.df_exons['start'] <= position) &
-                        (self.df_exons['end'] >= position)
+                if len(utrs_matched) == 0:
+                    exons_matched = [
+                        exon for exon in self.__exons[(gene_id, transcript_id)]
+                        if exon['start'] <= position <= exon['end']
                     ]
                     exon_id = ''
                     exon_id_stable = ''
-                    if len(df_exons_matched) == 0:
+                    if len(exons_matched) == 0:
                         region = GenomicRegionTypes.INTRONIC
                     else:
-                        assert (len(df_exons_matched) == 1)
-                        exon_id = df_exons_matched['exon_id'].values[0]
-                        exon_id_stable = df_exons_matched['exon_id_stable'].values[0]
+                        assert (len(exons_matched) == 1)
+                        exon_id = exons_matched[0]['exon_id']
+                        exon_id_stable = exons_matched[0]['exon_id_stable']
                         region = GenomicRegionTypes.EXONIC
                     variant_call_annotation = VariantCallAnnotation(
                         annotator=Annotators.GENCODE,
@@ -546,8 +601,8 @@ class Gencode(Annotator):
                     )
                     variant_call_annotations.append(variant_call_annotation)
                 else:
-                    assert(len(df_utrs_matched) == 1)
-                    region = df_utrs_matched['utr_type'].values[0]
+                    assert(len(utrs_matched) == 1)
+                    region = utrs_matched[0]['utr_type']
                     variant_call_annotation = VariantCallAnnotation(
                         annotator=Annotators.GENCODE,
                         annotator_version=self.version,
@@ -590,16 +645,29 @@ class Gencode(Annotator):
         Returns:
             Tuple[pos_1_annotations,pos_2_annotations]
         """
-        pos_1_annotations = self.annotate_position(
+        pos_1_annotations = self.__annotate_position_cached(
             chromosome=variant_call.chromosome_1,
             position=variant_call.position_1
         )
-        pos_2_annotations = self.annotate_position(
+        pos_2_annotations = self.__annotate_position_cached(
             chromosome=variant_call.chromosome_2,
             position=variant_call.position_2
         )
         return pos_1_annotations, pos_2_annotations
 
+    def __annotate_position_cached(
+            self,
+            chromosome: str,
+            position: int
+    ) -> List[VariantCallAnnotation]:
+        key = (chromosome, position)
+        if key not in self._annotations_cache:
+            self._annotations_cache[key] = self.annotate_position(
+                chromosome=chromosome,
+                position=position
+            )
+        return self._annotations_cache[key]
+
     def annotate_variant(self, variant: Variant) -> Variant:
         for i in range(0, variant.num_variant_calls):
             position_1_annotations, position_2_annotations = self.annotate_variant_call(
@@ -623,12 +691,6 @@ class Gencode(Annotator):
         Returns:
             VariantsList
         """
-        pool = mp.Pool(processes=num_processes)
-        func = partial(self.annotate_variant)
-        variants = pool.map(func, variants_list.variants)
-        pool.close()
-        variants_list_annotated = VariantsList()
-        for variant in variants:
-            variants_list_annotated.add_variant(variant=variant)
-        return variants_list_annotated
+        return self.annotate_by_chromosome(variants_list=variants_list,
+                                           num_processes=num_processes)
 
@@ -22,6 +22,7 @@ from dataclasses import dataclass, field
 from typing import List, Tuple, Dict
 from .genomic_range import GenomicRange
 from .logging import get_logger
+from .utilities import read_tsv_dataframe, reg2bin, reg2bins
 
 
 logger = get_logger(__name__)
@@ -37,13 +38,26 @@ class GenomicRangesList:
     # value =   (chromosome, index)
     _genomic_ranges_map: Dict[str, Tuple[str, int]] = field(default_factory=dict)
 
+    # UCSC binning index
+    # key   =   chromosome
+    # value =   dictionary where key is bin and value is list of indices
+    _genomic_ranges_bins: Dict[str, Dict[int, List[int]]] = field(default_factory=dict)
+
     def __post_init__(self):
         for key, val in self.genomic_ranges_map.items():
             i = 0
             for genomic_range in val:
                 self._genomic_ranges_map[genomic_range.id] = (key, i)
+                self.__index_genomic_range(genomic_range=genomic_range, idx=i)
                 i += 1
 
+    def __index_genomic_range(self, genomic_range: GenomicRange, idx: int):
+        # GenomicRange coordinates are inclusive
+        bin = reg2bin(start=genomic_range.start, end=genomic_range.end + 1)
+        if genomic_range.chromosome not in self._genomic_ranges_bins:
+            self._genomic_ranges_bins[genomic_range.chromosome] = defaultdict(list)
+        self._genomic_ranges_bins[genomic_range.chromosome][bin].append(idx)
+
     @property
     def size(self):
         size = 0
@@ -62,6 +76,7 @@ class GenomicRangesList:
         curr_len = len(self.genomic_ranges_map[genomic_range.chromosome])
         self.genomic_ranges_map[genomic_range.chromosome].append(genomic_range)
         self._genomic_ranges_map[genomic_range.id] = (genomic_range.chromosome, curr_len)
+        self.__index_genomic_range(genomic_range=genomic_range, idx=curr_len)
 
     def find_overlaps(self, chromosome: str, start: int, end: int) -> List[GenomicRange]:
         """
@@ -75,9 +90,20 @@ class GenomicRangesList:
         Returns:
             List[GenomicRange]
         """
-        # Get GenomicRange objects that match the query position
+        # Step 1. Collect candidate GenomicRange objects from the bins
+        #         that can contain regions overlapping the query position
+        if chromosome not in self._genomic_ranges_bins:
+            return []
+        bins = self._genomic_ranges_bins[chromosome]
+        indices = []
+        for bin in reg2bins(start=start, end=end + 1):
+            if bin in bins:
+                indices.extend(bins[bin])
+
+        # Step 2. Get GenomicRange objects that match the query position
         genomic_ranges = []
-        for genomic_range in self.genomic_ranges_map[chromosome]:
+        for idx in sorted(indices):
+            genomic_range = self.genomic_ranges_map[chromosome][idx]
             if genomic_range.overlaps(chromosome=chromosome, start=start, end=end):
                 genomic_ranges.append(genomic_range)
         return genomic_ranges
@@ -121,10 +147,9 @@ class GenomicRangesList:
             GenomicRangesList
         """
         genomic_ranges_list = GenomicRangesList()
-        for index, row in df.iterrows():
-            chromosome = str(row['chromosome'])
-            start = int(row['start'])
-            end = int(row['end'])
+        for chromosome, start, end in zip(df['chromosome'].astype(str).tolist(),
+                                          df['start'].astype(int).tolist(),
+                                          df['end'].astype(int).tolist()):
             genomic_range = GenomicRange(
                 chromosome=chromosome,
                 start=start,
@@ -148,8 +173,8 @@ class GenomicRangesList:
         Returns:
             GenomicRangesList
         """
-        df = pd.read_csv(tsv_file,
-                         sep='\t',
-                         low_memory=low_memory,
-                         memory_map=memory_map)
+        df = read_tsv_dataframe(tsv_file=tsv_file,
+                                dtype={'chromosome': str},
+                                low_memory=low_memory,
+                                memory_map=memory_map)
         return GenomicRangesList.load_dataframe(df=df)
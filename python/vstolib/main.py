@@ -30,7 +30,7 @@ from .constants import CollapseStrategies, VariantCallingMethods
 from .default import *
 from .genomic_ranges_list import GenomicRangesList
 from .logging import get_logger
-from .utilities import is_repeated_sequence
+from .utilities import get_sorted_codes, is_repeated_sequence
 from .variant import Variant
 from .variants_list import VariantsList
 from .variant_filter import VariantFilter
@@ -82,7 +82,7 @@ def collapse(
 ) -> VariantsList:
     """
     Collapses (summarizes) a VariantsList such that each Variant has 1
-    VariantCall.
+    VariantCall. This is a wrapper around collapse_dataframe.
 
     Args:
         variants_list   :   VariantsList object.
@@ -92,33 +92,72 @@ def collapse(
     Returns:
         VariantsList
     """
-    if strategy == CollapseStrategies.MAX_ALTERNATE_ALLELE_READ_COUNT:
-        variants_list_collapsed = VariantsList()
-        for variant in variants_list.variants:
-            target_idx = -1
-            min_reads = -1
-            matches_sample_id = False
-            for i in range(0, len(variant.variant_calls)):
-                variant_call = variant.variant_calls[i]
-                if variant_call.sample_id == sample_id:
-                    matches_sample_id = True
-                    if variant_call.alternate_allele_read_count > min_reads:
-                        target_idx = i
-                        min_reads = variant_call.alternate_allele_read_count
-            if matches_sample_id:
-                if target_idx == -1:
-                    target_idx = 0
-                variant_ = Variant(id=variant.id)
-                variant_.add_variant_call(variant_call=variant.variant_calls[target_idx])
-                variants_list_collapsed.add_variant(variant=variant_)
-    else:
-        raise Exception('Unknown collapse strategy: %s' % strategy)
+    df_collapsed = collapse_dataframe(
+        df=variants_list.to_dataframe(),
+        sample_id=sample_id,
+        strategy=strategy
+    )
+    variants_list_collapsed = VariantsList.load_dataframe(df=df_collapsed)
     logger.info("%i variants and %i variant calls in the collapsed VariantsList"
                 % (variants_list_collapsed.size,
                    len(variants_list_collapsed.variant_call_ids)))
     return variants_list_collapsed
 
 
+def collapse_dataframe(
+        df: pd.DataFrame,
+        sample_id: str,
+        strategy: str = Literal[CollapseStrategies.MAX_ALTERNATE_ALLELE_READ_COUNT]
+) -> pd.DataFrame:
+    """
+    Collapses (summarizes) a VSTOL DataFrame (one row per VariantCall,
+    e.g. from VariantsList.to_dataframe) such that each variant has 1 row.
+    The returned DataFrame is sorted by variant ID.
+
+    Args:
+        df              :   Pandas DataFrame.
+        sample_id       :   Sample ID to retain.
+        strategy        :   Strategy (options: 'max_alternate_allele_read_count').
+
+    Returns:
+        Pandas DataFrame
+    """
+    if strategy == CollapseStrategies.MAX_ALTERNATE_ALLELE_READ_COUNT:
+        # Order rows the way VariantCall objects are ordered within a Variant
+        # (see VariantCall.__lt__) so that ties are broken the same way
+        # regardless of whether df was read from a file or a VariantsList
+        order = np.lexsort((
+            df['position_2'].values,
+            get_sorted_codes(df['chromosome_2']),
+            df['position_1'].values,
+            get_sorted_codes(df['chromosome_1'])
+        ))
+        df = df.iloc[order, :].reset_index(drop=True)
+        variant_ids = df['variant_id'].astype(str)
+        alternate_allele_read_counts = df['alternate_allele_read_count'].fillna(-1)
+        matches_sample_id = df['sample_id'].astype(str) == sample_id
+
+        # Step 1. For each variant, select the first VariantCall of sample_id
+        #         with the largest alternate allele read count
+        max_indices = alternate_allele_read_counts[matches_sample_id].groupby(
+            variant_ids[matches_sample_id], sort=True
+        ).idxmax()
+
+        # Step 2. Fall back to the first VariantCall of the variant
+        #         if no VariantCall of sample_id has an alternate allele read count
+        first_indices = df.index.to_series().groupby(variant_ids, sort=True).first()
+        indices = np.where(
+            alternate_allele_read_counts.loc[max_indices.values].values > -1,
+            max_indices.values,
+            first_indices.loc[max_indices.index].values
+        )
+        df_collapsed = df.loc[indices, :].reset_index(drop=True)
+    else:
+        raise Exception('Unknown collapse strategy: %s' % strategy)
+    logger.info("%i variants in the collapsed DataFrame" % len(df_collapsed))
+    return df_collapsed
+
+
 def compare(
         a: VariantsList,
         b: VariantsList,
@@ -426,17 +465,16 @@ def overlap(
         genomic_ranges_list=genomic_ranges_list,
         num_threads=num_threads
     )
-    overlapping_variant_call_ids = [i[0] for i in overlapping_variant_call_ids]
+    overlapping_variant_call_ids = set([i[0] for i in overlapping_variant_call_ids])
 
     # Step 2. Prepare variants list to output
+    # (the variant calls of a variant are already sorted so they are kept in order)
     variants_list_overlapping = VariantsList()
     for variant in variants_list.variants:
-        variant_ = Variant(id=variant.id)
-        for variant_call in variant.variant_calls:
-            if variant_call.id in overlapping_variant_call_ids:
-                variant_.add_variant_call(variant_call=variant_call)
-        if variant_.num_variant_calls > 0:
-            variants_list_overlapping.add_variant(variant=variant_)
+        variant_calls = [variant_call for variant_call in variant.variant_calls
+                         if variant_call.id in overlapping_variant_call_ids]
+        if len(variant_calls) > 0:
+            variants_list_overlapping.add_variant(variant=Variant(id=variant.id, variant_calls=variant_calls))
 
     logger.info('%i variants and %i variant calls overlap' %
                 (len(variants_list_overlapping.variant_ids),
@@ -452,6 +490,7 @@ def score(
 ) -> VariantsList:
     """
     Calculates average alignment score for each breakpoint.
+    This is a wrapper around score_dataframe.
 
     Args:
         variants_list   :   VariantsList object.
@@ -462,63 +501,66 @@ def score(
     Returns:
         VariantsList
     """
+    df_scored = score_dataframe(
+        df=variants_list.to_dataframe(),
+        bam_file=bam_file,
+        window=window,
+        num_threads=num_threads
+    )
+    return VariantsList.load_dataframe(df=df_scored)
+
+
+def score_dataframe(
+        df: pd.DataFrame,
+        bam_file: str,
+        window: int = WINDOW,
+        num_threads: int = NUM_THREADS
+) -> pd.DataFrame:
+    """
+    Calculates average alignment score for each breakpoint of a VSTOL
+    DataFrame (one row per VariantCall, e.g. from VariantsList.to_dataframe).
+    Each distinct region is scored once.
+
+    Args:
+        df              :   Pandas DataFrame.
+        bam_file        :   BAM file.
+        window          :   Window (will be applied both upstream and downstream).
+        num_threads     :   Number of threads.
+
+    Returns:
+        Pandas DataFrame
+    """
+    if len(df) == 0:
+        return df
+
     # Step 1. Get the regions
-    regions = []
     bamfile = pysam.AlignmentFile(bam_file, "rb")
-    for variant in variants_list.variants:
-        for variant_call in variant.variant_calls:
-            # Position 1
-            chromosome_length = bamfile.get_reference_length(variant_call.chromosome_1)
-            start = variant_call.position_1 - window
-            end = variant_call.position_1 + window
-            if start < 0:
-                start = 0
-            if end > chromosome_length:
-                end = chromosome_length
-            regions.append((variant_call.chromosome_1,start,end))
-
-            # Position 2
-            chromosome_length = bamfile.get_reference_length(variant_call.chromosome_2)
-            start = variant_call.position_2 - window
-            end = variant_call.position_2 + window
-            if start < 0:
-                start = 0
-            if end > chromosome_length:
-                end = chromosome_length
-            regions.append((variant_call.chromosome_2,start,end))
+    chromosome_lengths = dict(zip(bamfile.references, bamfile.lengths))
+    bamfile.close()
+    breakpoint_regions = []
+    for i in [1, 2]:
+        chromosomes = df['chromosome_%i' % i].astype(str)
+        lengths = chromosomes.map(chromosome_lengths)
+        if lengths.isna().any():
+            raise Exception('Chromosome %s is not in %s'
+                            % (chromosomes[lengths.isna()].iloc[0], bam_file))
+        positions = df['position_%i' % i].values.astype(np.int64)
+        starts = np.maximum(positions - window, 0)
+        ends = np.minimum(positions + window, lengths.values.astype(np.int64))
+        breakpoint_regions.append(list(zip(chromosomes.tolist(), starts.tolist(), ends.tolist())))
+    regions = list(dict.fromkeys(breakpoint_regions[0] + breakpoint_regions[1]))
 
     # Step 2. Calculate the average alignment scores
-    if len(regions) > 0:
-        regions_scores = vstolibrs.calculate_average_alignment_scores(
-            bam_file=bam_file,
-            regions=regions,
-            num_threads=num_threads
-        )
-        for variant in variants_list.variants:
-            for variant_call in variant.variant_calls:
-                # Position 1
-                chromosome_length = bamfile.get_reference_length(variant_call.chromosome_1)
-                start = variant_call.position_1 - window
-                end = variant_call.position_1 + window
-                if start < 0:
-                    start = 0
-                if end > chromosome_length:
-                    end = chromosome_length
-                variant_call.position_1_average_alignment_score = regions_scores[(variant_call.chromosome_1,start,end)]
-
-                # Position 2
-                chromosome_length = bamfile.get_reference_length(variant_call.chromosome_2)
-                start = variant_call.position_2 - window
-                end = variant_call.position_2 + window
-                if start < 0:
-                    start = 0
-                if end > chromosome_length:
-                    end = chromosome_length
-                variant_call.position_2_average_alignment_score = regions_scores[(variant_call.chromosome_2,start,end)]
-
-                variant_call.average_alignment_score_window = window
-
-    return variants_list
+    regions_scores = vstolibrs.calculate_average_alignment_scores(
+        bam_file=bam_file,
+        regions=regions,
+        num_threads=num_threads
+    )
+    df = df.copy()
+    df['average_alignment_score_window'] = window
+    df['position_1_average_alignment_score'] = [regions_scores[region] for region in breakpoint_regions[0]]
+    df['position_2_average_alignment_score'] = [regions_scores[region] for region in breakpoint_regions[1]]
+    return df
 
 
 def subtract(
@@ -551,17 +593,28 @@ def subtract(
     Returns:
         VariantsList (with VariantCalls private to target_variants_list)
     """
-    vl_subtracted = copy.deepcopy(target_variants_list)
-    for variants_list in query_variants_lists:
-        vl_subtracted = vl_subtracted.subtract(
-            variants_list=variants_list,
-            num_threads=num_threads,
-            max_neighbor_distance=max_neighbor_distance,
-            match_all_breakpoints=match_all_breakpoints,
-            match_variant_types=match_variant_types,
-            min_ins_size_overlap=min_ins_size_overlap,
-            min_del_size_overlap=min_del_size_overlap
-        )
+    if len(query_variants_lists) == 0 or target_variants_list.size == 0:
+        return copy.deepcopy(target_variants_list)
+
+    # Subtract all query variants lists in one call so that the target
+    # variants list is serialized and indexed once. Variant IDs are only
+    # unique within a variants list so they are prefixed with the index
+    # of the query variants list.
+    query_variants_list = VariantsList()
+    for i, variants_list in enumerate(query_variants_lists):
+        for variant in variants_list.variants:
+            query_variants_list.add_variant(
+                variant=Variant(id='%i_%s' % (i, variant.id), variant_calls=variant.variant_calls)
+            )
+    vl_subtracted = target_variants_list.subtract(
+        variants_list=query_variants_list,
+        num_threads=num_threads,
+        max_neighbor_distance=max_neighbor_distance,
+        match_all_breakpoints=match_all_breakpoints,
+        match_variant_types=match_variant_types,
+        min_ins_size_overlap=min_ins_size_overlap,
+        min_del_size_overlap=min_del_size_overlap
+    )
     logger.info('%i variants and %i variant calls in the target VariantsList before diff.' %
                 (len(target_variants_list.variants), len(target_variants_list.variant_call_ids)))
     logger.info('%i variants and %i variant calls in the target VariantsList after diff.' %
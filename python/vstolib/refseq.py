@@ -18,10 +18,8 @@ The purpose of this python3 script is to implement the RefSeq dataclass.
 
 import gzip
 import pandas as pd
-import multiprocessing as mp
 from collections import defaultdict
 from dataclasses import dataclass
-from functools import partial
 from typing import Dict, List, Tuple
 from .annotator import Annotator
 from .constants import *
@@ -519,11 +517,5 @@ class RefSeq(Annotator):
         Returns:
             VariantsList
         """
-        pool = mp.Pool(processes=num_processes)
-        func = partial(self.annotate_variant)
-        variants = pool.map(func, variants_list.variants)
-        pool.close()
-        variants_list_annotated = VariantsList()
-        for variant in variants:
-            variants_list_annotated.add_variant(variant=variant)
-        return variants_list_annotated
+        return self.annotate_by_chromosome(variants_list=variants_list,
+                                           num_processes=num_processes)
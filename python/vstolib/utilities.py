@@ -16,14 +16,143 @@ The purpose of this python3 script is to implement general-purpose utility funct
 """
 
 
+import hashlib
+import importlib.util
+import multiprocessing as mp
+import numpy as np
+import os
 import pandas as pd
-from typing import Any, Dict, Literal
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional
+from .constants import OutputFormats
+from .default import CACHE_MAX_SIZE
 from .logging import get_logger
 
 
 logger = get_logger(__name__)
 
 
+# Uncompressed bytes per BGZF block and the BGZF end-of-file marker block (as in htslib)
+BGZF_BLOCK_SIZE = 0xff00
+BGZF_EOF = bytes.fromhex('1f8b08040000000000ff0600424302001b0003000000000000000000')
+
+# Version of the cache file format; bump whenever the pickled objects change layout
+CACHE_FORMAT_VERSION = 1
+
+
+def check_output_format(output_format: str):
+    """
+    Raises an Exception if files of the given output format cannot be
+    written in this environment, so that a command fails before it loads
+    any input rather than after all the work is done.
+
+    Parameters:
+        output_format   :   Output format (see OutputFormats).
+    """
+    if output_format == OutputFormats.PARQUET and importlib.util.find_spec('pyarrow') is None:
+        raise Exception("Output format '%s' requires pyarrow. Please install pyarrow "
+                        "(e.g. pip install 'vstol[parquet]') or use '%s'."
+                        % (OutputFormats.PARQUET, OutputFormats.TSV))
+
+
+def compress_bgzf_block(data: bytes, level: int = 6) -> bytes:
+    """
+    Compress up to BGZF_BLOCK_SIZE bytes into one BGZF block (a gzip member
+    whose 'BC' extra field stores the block size), so that the concatenated
+    blocks are a valid gzip file that htslib tools can index and seek.
+
+    Parameters:
+        data    :   Uncompressed bytes.
+        level   :   zlib compression level.
+
+    Returns:
+        BGZF block
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    if len(compressed) > 0x10000 - 26:
+        # Incompressible data is stored (deflate level 0) to fit in a block
+        compressor = zlib.compressobj(0, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+    header = struct.pack('<4BI2BH2BHH', 0x1f, 0x8b, 8, 4, 0, 0, 0xff, 6, 66, 67, 2, len(compressed) + 25)
+    return header + compressed + struct.pack('<II', zlib.crc32(data), len(data))
+
+
+def ensure_gz_suffix(file_path: str, gzip: bool) -> str:
+    """
+    Returns the output file path with a '.gz' suffix if the file is to be gzipped.
+
+    Parameters:
+        file_path   :   File path.
+        gzip        :   If True, the file will be gzipped.
+
+    Returns:
+        File path
+    """
+    if gzip and not file_path.endswith('.gz'):
+        return file_path + '.gz'
+    return file_path
+
+
+def get_cache_file(
+        file_path: str,
+        extension: str,
+        cache_dir: Optional[str] = None
+) -> Optional[str]:
+    """
+    Returns the path of the cache file for a given input file.
+
+    Caching is opt-in: it is enabled only if a cache directory is given
+    (--cache-dir) or $VSTOL_CACHE_DIR is set. Cache files are unpickled when
+    loaded, so the cache directory must only be writable by trusted users.
+
+    The cache file name is derived from the input file's real path, modification
+    time and size as well as the VSTOL version and CACHE_FORMAT_VERSION, so a
+    cache file is never reused once the input file, VSTOL or the cache file
+    format changes. Stale cache files are evicted by prune_cache_dir; the cache
+    directory can also be deleted at any time.
+
+    Parameters:
+        file_path   :   Input file path.
+        extension   :   Cache file extension (e.g. 'pickle').
+        cache_dir   :   Cache directory (default: $VSTOL_CACHE_DIR).
+
+    Returns:
+        Cache file path, or None if caching is disabled.
+    """
+    from vstolib import __version__
+    if cache_dir is None:
+        cache_dir = os.environ.get('VSTOL_CACHE_DIR', None)
+    if cache_dir is None or cache_dir == '':
+        return None
+    stat = os.stat(file_path)
+    key = '%s:%i:%i:%s:%i' % (os.path.realpath(file_path), stat.st_mtime_ns, stat.st_size,
+                              __version__, CACHE_FORMAT_VERSION)
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, '%s.%s' % (digest, extension))
+
+
+def get_sorted_codes(values: pd.Series) -> np.ndarray:
+    """
+    Encode values as integer codes that sort in the same order as the
+    values (compared as strings). Categorical values are encoded from
+    their categories without materializing one string per row.
+
+    Parameters:
+        values      :   Pandas Series (e.g. a chromosome column).
+
+    Returns:
+        Numpy array of integer codes
+    """
+    values = values.astype('category')
+    categories = values.cat.categories.astype(str).to_numpy()
+    ranks = np.empty(len(categories), dtype=np.int64)
+    ranks[np.argsort(categories, kind='stable')] = np.arange(len(categories))
+    return ranks[values.cat.codes.to_numpy()]
+
+
 def get_typed_value(
         value: Any,
         default_value: Any,
@@ -75,6 +204,12 @@ def is_integer(x) -> bool:
         return False
 
 
+def is_parquet(file_path) -> bool:
+    with open(file_path, 'rb') as f:
+        magic_number = f.read(4)
+    return magic_number == b'PAR1'
+
+
 def is_repeated_sequence(sequence: str) -> bool:
     if sequence == '':
         return False
@@ -119,6 +254,241 @@ def overlaps(
         return False
 
 
+def parallel_imap(
+        func: Callable,
+        iterable: Iterable,
+        num_processes: int
+) -> Iterator:
+    """
+    Apply a function to every item, in a pool of worker processes if
+    more than one process is requested and needed, and yield each result
+    as soon as it (and every result before it) is ready.
+
+    Parameters:
+        func            :   Picklable function.
+        iterable        :   Items.
+        num_processes   :   Maximum number of worker processes.
+
+    Returns:
+        Iterator of results (in the order of the items)
+    """
+    items = list(iterable)
+    # No more worker processes than items are needed and a single
+    # process is run in this process (no fork and no pickling of results)
+    num_processes = min(num_processes, len(items))
+    if num_processes <= 1:
+        for item in items:
+            yield func(item)
+        return
+    with mp.Pool(processes=num_processes) as pool:
+        yield from pool.imap(func, items)
+
+
+def parallel_map(
+        func: Callable,
+        iterable: Iterable,
+        num_processes: int
+) -> List:
+    """
+    Apply a function to every item, in a pool of worker processes if
+    more than one process is requested and needed.
+
+    Parameters:
+        func            :   Picklable function.
+        iterable        :   Items.
+        num_processes   :   Maximum number of worker processes.
+
+    Returns:
+        List of results (in the order of the items)
+    """
+    return list(parallel_imap(func=func, iterable=iterable, num_processes=num_processes))
+
+
+def prefetch_files(file_paths: Iterable[str]):
+    """
+    Ask the kernel to start reading files into the page cache in the
+    background (posix_fadvise WILLNEED), so that reads of all files are
+    in flight at once rather than issued as each file is opened. This is
+    a no-op on platforms without posix_fadvise.
+
+    Parameters:
+        file_paths  :   File paths.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def prune_cache_dir(
+        cache_dir: str,
+        extension: str,
+        max_size: int = CACHE_MAX_SIZE
+):
+    """
+    Removes the least recently used cache files (see get_cache_file) from a
+    cache directory until the cache files take up at most max_size bytes.
+    Only files named like cache files with the given extension are considered.
+
+    Parameters:
+        cache_dir   :   Cache directory.
+        extension   :   Cache file extension (e.g. 'pickle').
+        max_size    :   Maximum total size of the cache files in bytes
+                        (default: CACHE_MAX_SIZE).
+    """
+    cache_files = []
+    for entry in os.scandir(cache_dir):
+        name, _, suffix = entry.name.partition('.')
+        if suffix != extension or len(name) != 32 or not entry.is_file():
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        cache_files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total_size = sum(size for _, size, _ in cache_files)
+    for _, size, path in sorted(cache_files):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+            total_size -= size
+        except OSError:
+            continue
+
+
+def read_tsv_dataframe(
+        tsv_file: str,
+        dtype: Dict[str, Any],
+        low_memory: bool = False,
+        memory_map: bool = True,
+        usecols: List[str] = None
+) -> pd.DataFrame:
+    """
+    Read a (gzipped) TSV file into a DataFrame. pyarrow's multi-threaded
+    parser is used if pyarrow is installed, otherwise pandas' C parser.
+    Parquet files (e.g. written with --output-format parquet) are read
+    with pandas.read_parquet.
+
+    Parameters:
+        tsv_file        :   TSV file.
+        dtype           :   Column types.
+        low_memory      :   Low memory (C parser only).
+        memory_map      :   Map memory (C parser only).
+        usecols         :   If specified, only these columns are read (default: None).
+
+    Returns:
+        Pandas DataFrame
+    """
+    if is_parquet(tsv_file):
+        return pd.read_parquet(tsv_file, columns=usecols)
+    if is_gzipped(tsv_file):
+        compression = 'gzip'
+    else:
+        compression = None
+    if importlib.util.find_spec('pyarrow') is not None:
+        return pd.read_csv(tsv_file,
+                           sep='\t',
+                           compression=compression,
+                           dtype=dtype,
+                           usecols=usecols,
+                           engine='pyarrow')
+    return pd.read_csv(tsv_file,
+                       sep='\t',
+                       compression=compression,
+                       dtype=dtype,
+                       usecols=usecols,
+                       low_memory=low_memory,
+                       memory_map=memory_map)
+
+
+def reg2bin(start: int, end: int) -> int:
+    """
+    Returns the UCSC bin (standard 5-level binning scheme) of a region.
+
+    Parameters:
+        start       :   0-based start position (inclusive).
+        end         :   0-based end position (exclusive).
+
+    Returns:
+        Bin number. Regions beyond 2^29 bp are assigned to the top-level bin 0.
+    """
+    end -= 1
+    if start < 0 or end >= 1 << 29:
+        return 0
+    if start >> 14 == end >> 14:
+        return 4681 + (start >> 14)
+    if start >> 17 == end >> 17:
+        return 585 + (start >> 17)
+    if start >> 20 == end >> 20:
+        return 73 + (start >> 20)
+    if start >> 23 == end >> 23:
+        return 9 + (start >> 23)
+    if start >> 26 == end >> 26:
+        return 1 + (start >> 26)
+    return 0
+
+
+def reg2bins(start: int, end: int) -> List[int]:
+    """
+    Returns all UCSC bins that may contain regions overlapping a region.
+
+    Parameters:
+        start       :   0-based start position (inclusive).
+        end         :   0-based end position (exclusive).
+
+    Returns:
+        List of bin numbers.
+    """
+    bins = [0]
+    start = max(start, 0)
+    end = min(end, 1 << 29) - 1
+    if start > end:
+        return bins
+    for offset, shift in [(1, 26), (9, 23), (73, 20), (585, 17), (4681, 14)]:
+        bins.extend(range(offset + (start >> shift), offset + (end >> shift) + 1))
+    return bins
+
+
+def retrieve_from_dataframe(
+        df: pd.DataFrame,
+        column: str,
+        default_value: Any,
+        type: Literal[int,float,str,bool]
+) -> List[Any]:
+    """
+    Safely retrieves all values of a DataFrame column.
+    Equivalent to calling retrieve_from_dict on every row
+    but converts the whole column at once.
+
+    Parameters:
+        df              :   DataFrame.
+        column          :   Column.
+        default_value   :   Default value.
+        type            :   Type (int, float, str, bool).
+
+    Returns:
+        List of values (one per row).
+    """
+    if column not in df.columns:
+        return [default_value] * len(df)
+    values = df[column].tolist()
+    is_na = df[column].isna().tolist()
+    try:
+        return [default_value if is_na[i] else type(values[i]) for i in range(0, len(values))]
+    except (ValueError, TypeError):
+        return [get_typed_value(value=value, default_value=default_value, type=type) for value in values]
+
+
 def retrieve_from_dict(
         dct: Dict,
         key: str,
@@ -173,6 +543,27 @@ def retrieve_from_list(
                            type=type)
 
 
+def sort_by_variant_id(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stably sort a variants list DataFrame by 'variant_id'.
+
+    The variant IDs are factorized into integer codes in lexical order (one
+    string comparison sort over the unique IDs only) and the rows are
+    reordered with an integer argsort, which gives the same order as
+    DataFrame.sort_values(['variant_id'], kind='stable').
+
+    Parameters:
+        df      :   DataFrame with a 'variant_id' column.
+
+    Returns:
+        Sorted DataFrame (df itself if it is already sorted)
+    """
+    if df['variant_id'].is_monotonic_increasing:
+        return df
+    codes, _ = pd.factorize(df['variant_id'], sort=True)
+    return df.iloc[np.argsort(codes, kind='stable')]
+
+
 def str2bool(v):
     if v.lower() in ('yes', 'true', 't', 'y', '1'):
         return True
@@ -181,3 +572,109 @@ def str2bool(v):
     else:
         raise Exception('Boolean value expected.')
 
+
+def to_tsv_lines(df: pd.DataFrame) -> Optional[List[str]]:
+    """
+    Formats a DataFrame as TSV lines, producing the same text as
+    DataFrame.to_csv(sep='\t', index=False) but without going through
+    pandas' per-cell CSV writer.
+
+    Parameters:
+        df  :   DataFrame.
+
+    Returns:
+        List of lines (header line first), or None if a value would have
+        to be quoted or a column type is not supported, in which case
+        DataFrame.to_csv should be used instead.
+    """
+    if len(df.columns) < 2:
+        return None
+    header = [str(c) for c in df.columns]
+    columns = [header]
+    for i in range(len(df.columns)):
+        series = df.iloc[:, i]
+        is_na = series.isna().values
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = np.asarray([str(c) for c in series.cat.categories] + [''], dtype=object)
+            values = categories[series.cat.codes.values].tolist()   # code -1 (NaN) maps to ''
+        elif series.dtype.kind in 'biuf':
+            values = np.where(is_na, '', series.values.astype(str)).tolist()
+        elif series.dtype.kind == 'O' or isinstance(series.dtype, pd.StringDtype):
+            values = ['' if na else str(value) for value, na in zip(series.values.tolist(), is_na)]
+        else:
+            return None
+        columns.append(values)
+    for values in columns:
+        # Values containing these characters are quoted by DataFrame.to_csv
+        text = ''.join(values)
+        if '\t' in text or '"' in text or '\n' in text or '\r' in text:
+            return None
+    lines = ['\t'.join(header) + os.linesep]
+    lines.extend(['\t'.join(row) + os.linesep for row in zip(*columns[1:])])
+    return lines
+
+
+def write_bgzf_file(
+        chunks: Iterable[bytes],
+        file_path: str,
+        num_threads: int = 1
+):
+    """
+    Write data to a BGZF file (like bgzip), so that it can be indexed and
+    decompressed in parallel. zlib releases the GIL while compressing, so the
+    blocks of each chunk are compressed by num_threads threads while the next
+    chunk is produced.
+
+    Parameters:
+        chunks          :   Uncompressed bytes (any chunk size).
+        file_path       :   Output file path.
+        num_threads     :   Number of compression threads.
+    """
+    with open(file_path, 'wb') as f, \
+            ThreadPoolExecutor(max_workers=max(num_threads, 1)) as executor:
+        futures = []
+        for data in chunks:
+            for future in futures:
+                f.write(future.result())
+            futures = [executor.submit(compress_bgzf_block, data[i:i + BGZF_BLOCK_SIZE])
+                       for i in range(0, len(data), BGZF_BLOCK_SIZE)]
+        for future in futures:
+            f.write(future.result())
+        f.write(BGZF_EOF)
+
+
+def write_tsv_file(
+        df: pd.DataFrame,
+        tsv_file: str,
+        gzip: bool = False,
+        num_threads: int = 1,
+        chunksize: int = 100000
+):
+    """
+    Write a DataFrame to a TSV file.
+
+    Parameters:
+        df              :   DataFrame.
+        tsv_file        :   TSV file.
+        gzip            :   If True, gzip the TSV file (BGZF, see write_bgzf_file).
+        num_threads     :   Number of compression threads.
+        chunksize       :   Number of rows formatted at a time, so that a chunk
+                            is compressed while the next one is formatted.
+    """
+    def iter_chunks():
+        for start in range(0, max(len(df), 1), chunksize):
+            df_chunk = df.iloc[start:start + chunksize]
+            lines = to_tsv_lines(df=df_chunk)
+            if lines is None:
+                yield df_chunk.to_csv(sep='\t', index=False, header=(start == 0))
+            else:
+                yield ''.join(lines if start == 0 else lines[1:])
+
+    if gzip:
+        write_bgzf_file(chunks=(chunk.encode('utf-8') for chunk in iter_chunks()),
+                        file_path=tsv_file,
+                        num_threads=num_threads)
+    else:
+        with open(tsv_file, 'w', encoding='utf-8', newline='') as f:
+            for chunk in iter_chunks():
+                f.write(chunk)
@@ -26,7 +26,7 @@ from .variant_call_annotation import VariantCallAnnotation
 from .variant_call import VariantCall
 
 
-@dataclass
+@dataclass(slots=True)
 class Variant:
     id: str
     variant_calls: List[VariantCall] = field(default_factory=list)
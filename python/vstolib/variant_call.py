@@ -27,7 +27,7 @@ from .variant_call_annotation import VariantCallAnnotation
 
 
 @total_ordering
-@dataclass
+@dataclass(slots=True)
 class VariantCall:
     # Mandatory fields
     id: str
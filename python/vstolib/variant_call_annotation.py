@@ -21,7 +21,7 @@ from dataclasses import dataclass, field
 from .constants import GenomicRegionTypes, Annotators, Strands
 
 
-@dataclass
+@dataclass(slots=True)
 class VariantCallAnnotation:
     # Mandatory fields
     annotator: str
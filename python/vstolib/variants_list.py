@@ -17,18 +17,22 @@ The purpose of this python3 script is to implement the VariantsList dataclass.
 
 
 import json
+import numpy as np
+import os
 import pandas as pd
+import pickle
 import pysam
-import multiprocessing as mp
 from collections import defaultdict, OrderedDict
 from dataclasses import dataclass, field
 from functools import partial
-from typing import Dict, List, Tuple, Type
+from operator import attrgetter
+from sys import intern
+from typing import Dict, List, Optional, Tuple, Type
 from vstolib import vstolibrs
 from .genomic_range import GenomicRange
 from .genomic_ranges_list import GenomicRangesList
 from .logging import get_logger
-from .utilities import get_typed_value, is_gzipped, retrieve_from_dict
+from .utilities import get_cache_file, get_typed_value, is_gzipped, is_parquet, parallel_map, prune_cache_dir, read_tsv_dataframe, retrieve_from_dataframe
 from .variant import Variant
 from .variant_call_annotation import VariantCallAnnotation
 from .variant_call import VariantCall
@@ -39,6 +43,136 @@ from .vcf.common import get_attribute_types
 logger = get_logger(__name__)
 
 
+# VariantCallAnnotation fields stored in 'position_1_annotation_*' and 'position_2_annotation_*' columns
+ANNOTATION_FIELDS = [
+    'annotator',
+    'annotator_version',
+    'gene_id',
+    'gene_id_stable',
+    'gene_name',
+    'gene_strand',
+    'gene_type',
+    'gene_version',
+    'transcript_id',
+    'transcript_id_stable',
+    'transcript_name',
+    'transcript_strand',
+    'transcript_type',
+    'transcript_version',
+    'exon_id',
+    'exon_id_stable',
+    'region',
+    'species'
+]
+
+# Optional VariantCall columns (column, default value, type)
+OPTIONAL_COLUMNS = [
+    ('source_id', '', str),
+    ('phase_block_id', '', str),
+    ('clone_id', '', str),
+    ('nucleic_acid', '', str),
+    ('variant_calling_method', '', str),
+    ('sequencing_platform', '', str),
+    ('filter', '', str),
+    ('quality_score', -1.0, float),
+    ('precise', '', str),
+    ('variant_subtype', '', str),
+    ('variant_size', -1, int),
+    ('total_read_count', -1, int),
+    ('reference_allele_read_count', -1, int),
+    ('alternate_allele_read_count', -1, int),
+    ('alternate_allele_fraction', -1.0, float),
+    ('average_alignment_score_window', -1, int),
+    ('position_1_average_alignment_score', -1.0, float),
+    ('position_2_average_alignment_score', -1.0, float),
+    ('alternate_allele_read_ids', '', str),
+    ('variant_sequences', '', str),
+    ('attributes', '', str),
+    ('tags', '', str),
+    ('position_1_annotation_annotator', '', str),
+    ('position_1_annotation_annotator_version', '', str),
+    ('position_1_annotation_gene_id', '', str),
+    ('position_1_annotation_gene_id_stable', '', str),
+    ('position_1_annotation_gene_name', '', str),
+    ('position_1_annotation_gene_strand', '', str),
+    ('position_1_annotation_gene_type', '', str),
+    ('position_1_annotation_gene_version', '', str),
+    ('position_1_annotation_transcript_id', '', str),
+    ('position_1_annotation_transcript_id_stable', '', str),
+    ('position_1_annotation_transcript_name', '', str),
+    ('position_1_annotation_transcript_strand', '', str),
+    ('position_1_annotation_transcript_type', '', str),
+    ('position_1_annotation_transcript_version', '', str),
+    ('position_1_annotation_exon_id', '', str),
+    ('position_1_annotation_exon_id_stable', '', str),
+    ('position_1_annotation_region', '', str),
+    ('position_1_annotation_species', '', str),
+    ('position_2_annotation_annotator', '', str),
+    ('position_2_annotation_annotator_version', '', str),
+    ('position_2_annotation_gene_id', '', str),
+    ('position_2_annotation_gene_id_stable', '', str),
+    ('position_2_annotation_gene_name', '', str),
+    ('position_2_annotation_gene_strand', '', str),
+    ('position_2_annotation_gene_type', '', str),
+    ('position_2_annotation_gene_version', '', str),
+    ('position_2_annotation_transcript_id', '', str),
+    ('position_2_annotation_transcript_id_stable', '', str),
+    ('position_2_annotation_transcript_name', '', str),
+    ('position_2_annotation_transcript_strand', '', str),
+    ('position_2_annotation_transcript_type', '', str),
+    ('position_2_annotation_transcript_version', '', str),
+    ('position_2_annotation_exon_id', '', str),
+    ('position_2_annotation_exon_id_stable', '', str),
+    ('position_2_annotation_region', '', str),
+    ('position_2_annotation_species', '', str)
+]
+
+# pandas dtypes of string columns when reading a TSV file so that
+# values are parsed identically regardless of how the file is chunked
+TSV_DTYPES = {
+    'variant_id': str,
+    'variant_call_id': str,
+    'sample_id': str,
+    'chromosome_1': str,
+    'chromosome_2': str,
+    'variant_type': str,
+    'reference_allele': str,
+    'alternate_allele': str,
+    **{column: str for column, _, column_type in OPTIONAL_COLUMNS if column_type == str}
+}
+
+# Low-cardinality columns stored as pandas categoricals in to_dataframe()
+CATEGORICAL_COLUMNS = [
+    'sample_id',
+    'chromosome_1',
+    'chromosome_2',
+    'variant_type',
+    'reference_allele',
+    'alternate_allele',
+    'source_id',
+    'nucleic_acid',
+    'variant_calling_method',
+    'sequencing_platform',
+    'filter',
+    'precise',
+    'variant_subtype'
+]
+
+# Integer columns stored as int64 in to_dataframe()
+# (positions can exceed 2^31 - 1 in large genomes)
+INT64_COLUMNS = [
+    'position_1',
+    'position_2'
+]
+
+# Integer columns stored as int32 in to_dataframe()
+INT32_COLUMNS = [
+    'reference_allele_read_count',
+    'alternate_allele_read_count',
+    'total_read_count'
+]
+
+
 @dataclass
 class VariantsList:
     variants: List[Variant] = field(default_factory=list)
@@ -87,6 +221,7 @@ class VariantsList:
         """
         Filter variants by a list of VariantFilter objects and return a
         VariantsList with variants that pass all VariantFilter objects.
+        The returned VariantsList holds the Variant objects of this list.
         """
         # Step 1. Serialize VariantsList object
         variants_list_serialized = json.dumps(self.to_dict())
@@ -96,15 +231,19 @@ class VariantsList:
         for variant_filter in variant_filters:
             variant_filters_serialized.append(json.dumps(variant_filter.to_dict()))
 
-        # Step 3. Filter VariantsList object
-        json_str = vstolibrs.filter_variants_list(
+        # Step 3. Identify the IDs of the variants that pass
+        passed_variant_ids = set(vstolibrs.filter_variants_list(
             variants_list_serialized,
             variant_filters_serialized,
             num_threads
-        )
+        ))
 
-        # Step 4. Deserialize filtered VariantsList object
-        return VariantsList.load_serialized_json(json_str=json_str)
+        # Step 4. Collect the passed Variant objects
+        variants_list = VariantsList()
+        for variant in self.variants:
+            if variant.id in passed_variant_ids:
+                variants_list.add_variant(variant=variant)
+        return variants_list
 
     def find_breakpoint_flanking_sequences(
             self,
@@ -123,10 +262,8 @@ class VariantsList:
         Returns:
             List[Tuple[variant_id,variant_call_id,position,left_sequence,right_sequence]]
         """
-        pool = mp.Pool(processes=num_threads)
         func = partial(VariantsList.find_breakpoint_flanking_sequences_worker, reference_genome_fasta_file, length)
-        flanking_sequences_lists = pool.map(func, self.variants)
-        pool.close()
+        flanking_sequences_lists = parallel_map(func, self.variants, num_processes=num_threads)
         flanking_sequences = []
         for flanking_sequences_list in flanking_sequences_lists:
             flanking_sequences.extend(flanking_sequences_list)
@@ -218,84 +355,67 @@ class VariantsList:
 
         return VariantsList.load_serialized_json(json_str=json_str)
 
-    def to_dataframe(self) -> pd.DataFrame:
-        return pd.DataFrame(self.to_dataframe_row())
+    def to_dataframe(self, sort: bool = False) -> pd.DataFrame:
+        """
+        Returns a DataFrame with one row per VariantCall.
+
+        Parameters:
+            sort    :   If True, order the rows by variant ID (as
+                        utilities.sort_by_variant_id would) by sorting the
+                        Variant objects before the columns are built, so
+                        that the DataFrame does not have to be reordered.
 
-    def to_dataframe_row(self) -> Dict:
+        Returns:
+            Pandas DataFrame
+        """
+        data = self.to_dataframe_row(sort=sort)
+        for column in CATEGORICAL_COLUMNS:
+            data[column] = pd.Categorical(data[column])
+        for column in INT64_COLUMNS:
+            data[column] = np.asarray(data[column], dtype=np.int64)
+        for column in INT32_COLUMNS:
+            data[column] = np.asarray(data[column], dtype=np.int32)
+        return pd.DataFrame(data)
+
+    def to_dataframe_row(self, sort: bool = False) -> Dict:
+        # Columns are built one at a time from the VariantCall objects
+        # (instead of one single-row dictionary per VariantCall)
+        variant_ids = []
+        variant_calls = []
+        variants = sorted(self.variants, key=attrgetter('id')) if sort else self.variants
+        for variant in variants:
+            for variant_call in variant.variant_calls:
+                variant_ids.append(variant.id)
+                variant_calls.append(variant_call)
         data = {
-            'variant_id': [],
-            'variant_call_id': [],
-            'sample_id': [],
-            'chromosome_1': [],
-            'position_1': [],
-            'chromosome_2': [],
-            'position_2': [],
-            'variant_type': [],
-            'reference_allele': [],
-            'alternate_allele': [],
-            'source_id': [],
-            'phase_block_id': [],
-            'clone_id': [],
-            'nucleic_acid': [],
-            'variant_calling_method': [],
-            'sequencing_platform': [],
-            'filter': [],
-            'quality_score': [],
-            'precise': [],
-            'variant_subtype': [],
-            'variant_size': [],
-            'reference_allele_read_count': [],
-            'alternate_allele_read_count': [],
-            'total_read_count': [],
-            'alternate_allele_fraction': [],
-            'alternate_allele_read_ids': [],
-            'variant_sequences': [],
-            'tags': [],
-            'attributes': [],
-            'average_alignment_score_window': [],
-            'position_1_average_alignment_score': [],
-            'position_2_average_alignment_score': [],
-            'position_1_annotation_annotator': [],
-            'position_1_annotation_annotator_version': [],
-            'position_1_annotation_gene_id': [],
-            'position_1_annotation_gene_id_stable': [],
-            'position_1_annotation_gene_name': [],
-            'position_1_annotation_gene_strand': [],
-            'position_1_annotation_gene_type': [],
-            'position_1_annotation_gene_version': [],
-            'position_1_annotation_transcript_id': [],
-            'position_1_annotation_transcript_id_stable': [],
-            'position_1_annotation_transcript_name': [],
-            'position_1_annotation_transcript_strand': [],
-            'position_1_annotation_transcript_type': [],
-            'position_1_annotation_transcript_version': [],
-            'position_1_annotation_exon_id': [],
-            'position_1_annotation_exon_id_stable': [],
-            'position_1_annotation_region': [],
-            'position_1_annotation_species': [],
-            'position_2_annotation_annotator': [],
-            'position_2_annotation_annotator_version': [],
-            'position_2_annotation_gene_id': [],
-            'position_2_annotation_gene_id_stable': [],
-            'position_2_annotation_gene_name': [],
-            'position_2_annotation_gene_strand': [],
-            'position_2_annotation_gene_type': [],
-            'position_2_annotation_gene_version': [],
-            'position_2_annotation_transcript_id': [],
-            'position_2_annotation_transcript_id_stable': [],
-            'position_2_annotation_transcript_name': [],
-            'position_2_annotation_transcript_strand': [],
-            'position_2_annotation_transcript_type': [],
-            'position_2_annotation_transcript_version': [],
-            'position_2_annotation_exon_id': [],
-            'position_2_annotation_exon_id_stable': [],
-            'position_2_annotation_region': [],
-            'position_2_annotation_species': []
+            'variant_id': variant_ids,
+            'variant_call_id': list(map(attrgetter('id'), variant_calls))
         }
-        for variant in self.variants:
-            for key, values in variant.to_dataframe_row().items():
-                for value in values:
-                    data[key].append(value)
+        for column in ['sample_id', 'chromosome_1', 'position_1', 'chromosome_2', 'position_2',
+                       'variant_type', 'reference_allele', 'alternate_allele', 'source_id',
+                       'phase_block_id', 'clone_id', 'nucleic_acid', 'variant_calling_method',
+                       'sequencing_platform', 'filter', 'quality_score', 'precise', 'variant_subtype',
+                       'variant_size', 'reference_allele_read_count', 'alternate_allele_read_count',
+                       'total_read_count', 'alternate_allele_fraction']:
+            data[column] = list(map(attrgetter(column), variant_calls))
+        data['alternate_allele_read_ids'] = [';'.join(variant_call.alternate_allele_read_ids)
+                                             for variant_call in variant_calls]
+        data['variant_sequences'] = [';'.join(variant_call.variant_sequences)
+                                     for variant_call in variant_calls]
+        data['tags'] = [';'.join([str(i) for i in list(variant_call.tags)])
+                        for variant_call in variant_calls]
+        data['attributes'] = [';'.join(['%s=%s' % (key, val) for key, val in variant_call.attributes.items()])
+                              for variant_call in variant_calls]
+        for column in ['average_alignment_score_window',
+                       'position_1_average_alignment_score',
+                       'position_2_average_alignment_score']:
+            data[column] = list(map(attrgetter(column), variant_calls))
+        for position in ['position_1', 'position_2']:
+            annotations = list(map(attrgetter(position + '_annotations'), variant_calls))
+            for annotation_field in ANNOTATION_FIELDS:
+                get_field = attrgetter(annotation_field)
+                data[position + '_annotation_' + annotation_field] = \
+                    [';'.join(map(get_field, annotations_)) for annotations_ in annotations]
         return data
 
     def to_dict(self) -> Dict:
@@ -304,6 +424,37 @@ class VariantsList:
         }
         return data
 
+    def write_cache_file(
+            self,
+            tsv_file: str,
+            cache_dir: str = None
+    ):
+        """
+        Write this VariantsList to the cache file of a TSV file (see
+        read_tsv_file_cached) and evict the least recently used cache files.
+        Does nothing if caching is disabled. Failing to write the cache file
+        is not an error.
+
+        Parameters:
+            tsv_file    :   TSV file this VariantsList was read from.
+            cache_dir   :   Cache directory (default: $VSTOL_CACHE_DIR; caching
+                            is disabled if neither is set).
+        """
+        cache_file = get_cache_file(file_path=tsv_file, extension='pickle', cache_dir=cache_dir)
+        if cache_file is None:
+            return
+        cache_file_tmp = '%s.%i.tmp' % (cache_file, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file_tmp, 'wb') as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_file_tmp, cache_file)
+            prune_cache_dir(cache_dir=os.path.dirname(cache_file), extension='pickle')
+        except OSError as e:
+            logger.warning('Could not write cache file %s: %s' % (cache_file, str(e)))
+            if os.path.exists(cache_file_tmp):
+                os.remove(cache_file_tmp)
+
     @staticmethod
     def compare(
             a: 'VariantsList',
@@ -443,6 +594,38 @@ class VariantsList:
 
         return VariantsList.load_serialized_json(json_str=json_str)
 
+    @staticmethod
+    def load_cache_file(
+            tsv_file: str,
+            cache_dir: str = None
+    ) -> Optional['VariantsList']:
+        """
+        Load the VariantsList cached for a TSV file by an earlier run
+        (see read_tsv_file_cached).
+
+        Parameters:
+            tsv_file    :   TSV file.
+            cache_dir   :   Cache directory (default: $VSTOL_CACHE_DIR; caching
+                            is disabled if neither is set).
+
+        Returns:
+            VariantsList, or None if caching is disabled or the TSV file has
+            no (readable) cache file
+        """
+        cache_file = get_cache_file(file_path=tsv_file, extension='pickle', cache_dir=cache_dir)
+        if cache_file is None or not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, 'rb') as f:
+                variants_list = pickle.load(f)
+            # Mark the cache file as recently used (see prune_cache_dir)
+            os.utime(cache_file)
+            logger.info('Loaded %s from cache file %s' % (tsv_file, cache_file))
+            return variants_list
+        except Exception as e:
+            logger.warning('Could not load cache file %s: %s' % (cache_file, str(e)))
+            return None
+
     @staticmethod
     def load_dataframe(df: pd.DataFrame) -> 'VariantsList':
         """
@@ -480,83 +663,70 @@ class VariantsList:
         if 'alternate_allele' not in columns:
             raise Exception("The column 'alternate_allele' must exist.")
 
+        # Step 1. Retrieve values column by column
+        # Mandatory fields
+        variant_ids = [str(value) for value in df['variant_id'].tolist()]
+        variant_call_ids = [str(value) for value in df['variant_call_id'].tolist()]
+        sample_ids = [str(value) for value in df['sample_id'].tolist()]
+        chromosomes_1 = [str(value) for value in df['chromosome_1'].tolist()]
+        positions_1 = [int(value) for value in df['position_1'].tolist()]
+        chromosomes_2 = [str(value) for value in df['chromosome_2'].tolist()]
+        positions_2 = [int(value) for value in df['position_2'].tolist()]
+        variant_types = [str(value) for value in df['variant_type'].tolist()]
+        reference_alleles = [str(value) for value in df['reference_allele'].tolist()]
+        alternate_alleles = [str(value) for value in df['alternate_allele'].tolist()]
+
+        # Optional fields
+        # key   =   column
+        # value =   list of values
+        values = {}
+        for column, default_value, type in OPTIONAL_COLUMNS:
+            values[column] = retrieve_from_dataframe(
+                df=df,
+                column=column,
+                default_value=default_value,
+                type=type
+            )
+
+        # Step 2. Construct Variant and VariantCall objects
         variants: Dict[str, Variant] = {}
-        for row in df.to_dict('records'):
-            # Mandatory fields
-            variant_id = str(row['variant_id'])
+        for i in range(0, len(df)):
+            variant_id = variant_ids[i]
             variant_call = VariantCall(
-                id=str(row['variant_call_id']),
-                sample_id=str(row['sample_id']),
-                chromosome_1=str(row['chromosome_1']),
-                position_1=int(row['position_1']),
-                chromosome_2=str(row['chromosome_2']),
-                position_2=int(row['position_2']),
-                variant_type=str(row['variant_type']),
-                reference_allele=str(row['reference_allele']),
-                alternate_allele=str(row['alternate_allele'])
+                id=variant_call_ids[i],
+                sample_id=sample_ids[i],
+                chromosome_1=chromosomes_1[i],
+                position_1=positions_1[i],
+                chromosome_2=chromosomes_2[i],
+                position_2=positions_2[i],
+                variant_type=variant_types[i],
+                reference_allele=reference_alleles[i],
+                alternate_allele=alternate_alleles[i]
             )
 
             # Optional fields
-            variant_call.source_id = retrieve_from_dict(dct=row, key='source_id', default_value='', type=str)
-            variant_call.phase_block_id = retrieve_from_dict(dct=row, key='phase_block_id', default_value='', type=str)
-            variant_call.clone_id = retrieve_from_dict(dct=row, key='clone_id', default_value='', type=str)
-            variant_call.nucleic_acid = retrieve_from_dict(dct=row, key='nucleic_acid', default_value='', type=str)
-            variant_call.variant_calling_method = retrieve_from_dict(dct=row, key='variant_calling_method', default_value='', type=str)
-            variant_call.sequencing_platform = retrieve_from_dict(dct=row, key='sequencing_platform', default_value='', type=str)
-            variant_call.filter = retrieve_from_dict(dct=row, key='filter', default_value='', type=str)
-            variant_call.quality_score = retrieve_from_dict(dct=row, key='quality_score', default_value=-1.0, type=float)
-            variant_call.precise = retrieve_from_dict(dct=row, key='precise', default_value='', type=str)
-            variant_call.variant_subtype = retrieve_from_dict(dct=row, key='variant_subtype', default_value='', type=str)
-            variant_call.variant_size = retrieve_from_dict(dct=row, key='variant_size', default_value=-1, type=int)
-            variant_call.total_read_count = retrieve_from_dict(dct=row, key='total_read_count', default_value=-1, type=int)
-            variant_call.reference_allele_read_count = retrieve_from_dict(dct=row, key='reference_allele_read_count', default_value=-1, type=int)
-            variant_call.alternate_allele_read_count = retrieve_from_dict(dct=row, key='alternate_allele_read_count', default_value=-1, type=int)
-            variant_call.alternate_allele_fraction = retrieve_from_dict(dct=row, key='alternate_allele_fraction', default_value=-1.0, type=float)
-            variant_call.average_alignment_score_window = retrieve_from_dict(dct=row, key='average_alignment_score_window', default_value=-1, type=int)
-            variant_call.position_1_average_alignment_score = retrieve_from_dict(dct=row, key='position_1_average_alignment_score', default_value=-1.0, type=float)
-            variant_call.position_2_average_alignment_score = retrieve_from_dict(dct=row, key='position_2_average_alignment_score', default_value=-1.0, type=float)
-            alternate_allele_read_ids = retrieve_from_dict(dct=row, key='alternate_allele_read_ids', default_value='', type=str)
-            variant_sequences = retrieve_from_dict(dct=row, key='variant_sequences', default_value='', type=str)
-            attributes = retrieve_from_dict(dct=row, key='attributes', default_value='', type=str)
-            tags = retrieve_from_dict(dct=row, key='tags', default_value='', type=str)
-
-            position_1_annotation_annotator = retrieve_from_dict(dct=row, key='position_1_annotation_annotator', default_value='', type=str)
-            position_1_annotation_annotator_version = retrieve_from_dict(dct=row, key='position_1_annotation_annotator_version', default_value='', type=str)
-            position_1_annotation_gene_id = retrieve_from_dict(dct=row, key='position_1_annotation_gene_id', default_value='', type=str)
-            position_1_annotation_gene_id_stable = retrieve_from_dict(dct=row, key='position_1_annotation_gene_id_stable', default_value='', type=str)
-            position_1_annotation_gene_name = retrieve_from_dict(dct=row, key='position_1_annotation_gene_name', default_value='', type=str)
-            position_1_annotation_gene_strand = retrieve_from_dict(dct=row, key='position_1_annotation_gene_strand', default_value='', type=str)
-            position_1_annotation_gene_type = retrieve_from_dict(dct=row, key='position_1_annotation_gene_type', default_value='', type=str)
-            position_1_annotation_gene_version = retrieve_from_dict(dct=row, key='position_1_annotation_gene_version', default_value='', type=str)
-            position_1_annotation_transcript_id = retrieve_from_dict(dct=row, key='position_1_annotation_transcript_id', default_value='', type=str)
-            position_1_annotation_transcript_id_stable = retrieve_from_dict(dct=row, key='position_1_annotation_transcript_id_stable', default_value='', type=str)
-            position_1_annotation_transcript_name = retrieve_from_dict(dct=row, key='position_1_annotation_transcript_name', default_value='', type=str)
-            position_1_annotation_transcript_strand = retrieve_from_dict(dct=row, key='position_1_annotation_transcript_strand', default_value='', type=str)
-            position_1_annotation_transcript_type = retrieve_from_dict(dct=row, key='position_1_annotation_transcript_type', default_value='', type=str)
-            position_1_annotation_transcript_version = retrieve_from_dict(dct=row, key='position_1_annotation_transcript_version', default_value='', type=str)
-            position_1_annotation_exon_id = retrieve_from_dict(dct=row, key='position_1_annotation_exon_id', default_value='', type=str)
-            position_1_annotation_exon_id_stable = retrieve_from_dict(dct=row, key='position_1_annotation_exon_id_stable', default_value='', type=str)
-            position_1_annotation_region = retrieve_from_dict(dct=row, key='position_1_annotation_region', default_value='', type=str)
-            position_1_annotation_species = retrieve_from_dict(dct=row, key='position_1_annotation_species', default_value='', type=str)
-
-            position_2_annotation_annotator = retrieve_from_dict(dct=row, key='position_2_annotation_annotator', default_value='', type=str)
-            position_2_annotation_annotator_version = retrieve_from_dict(dct=row, key='position_2_annotation_annotator_version', default_value='', type=str)
-            position_2_annotation_gene_id = retrieve_from_dict(dct=row, key='position_2_annotation_gene_id', default_value='', type=str)
-            position_2_annotation_gene_id_stable = retrieve_from_dict(dct=row, key='position_2_annotation_gene_id_stable', default_value='', type=str)
-            position_2_annotation_gene_name = retrieve_from_dict(dct=row, key='position_2_annotation_gene_name', default_value='', type=str)
-            position_2_annotation_gene_strand = retrieve_from_dict(dct=row, key='position_2_annotation_gene_strand', default_value='', type=str)
-            position_2_annotation_gene_type = retrieve_from_dict(dct=row, key='position_2_annotation_gene_type', default_value='', type=str)
-            position_2_annotation_gene_version = retrieve_from_dict(dct=row, key='position_2_annotation_gene_version', default_value='', type=str)
-            position_2_annotation_transcript_id = retrieve_from_dict(dct=row, key='position_2_annotation_transcript_id', default_value='', type=str)
-            position_2_annotation_transcript_id_stable = retrieve_from_dict(dct=row, key='position_2_annotation_transcript_id_stable', default_value='', type=str)
-            position_2_annotation_transcript_name = retrieve_from_dict(dct=row, key='position_2_annotation_transcript_name', default_value='', type=str)
-            position_2_annotation_transcript_strand = retrieve_from_dict(dct=row, key='position_2_annotation_transcript_strand', default_value='', type=str)
-            position_2_annotation_transcript_type = retrieve_from_dict(dct=row, key='position_2_annotation_transcript_type', default_value='', type=str)
-            position_2_annotation_transcript_version = retrieve_from_dict(dct=row, key='position_2_annotation_transcript_version', default_value='', type=str)
-            position_2_annotation_exon_id = retrieve_from_dict(dct=row, key='position_2_annotation_exon_id', default_value='', type=str)
-            position_2_annotation_exon_id_stable = retrieve_from_dict(dct=row, key='position_2_annotation_exon_id_stable', default_value='', type=str)
-            position_2_annotation_region = retrieve_from_dict(dct=row, key='position_2_annotation_region', default_value='', type=str)
-            position_2_annotation_species = retrieve_from_dict(dct=row, key='position_2_annotation_species', default_value='', type=str)
+            variant_call.source_id = values['source_id'][i]
+            variant_call.phase_block_id = values['phase_block_id'][i]
+            variant_call.clone_id = values['clone_id'][i]
+            variant_call.nucleic_acid = values['nucleic_acid'][i]
+            variant_call.variant_calling_method = values['variant_calling_method'][i]
+            variant_call.sequencing_platform = values['sequencing_platform'][i]
+            variant_call.filter = values['filter'][i]
+            variant_call.quality_score = values['quality_score'][i]
+            variant_call.precise = values['precise'][i]
+            variant_call.variant_subtype = values['variant_subtype'][i]
+            variant_call.variant_size = values['variant_size'][i]
+            variant_call.total_read_count = values['total_read_count'][i]
+            variant_call.reference_allele_read_count = values['reference_allele_read_count'][i]
+            variant_call.alternate_allele_read_count = values['alternate_allele_read_count'][i]
+            variant_call.alternate_allele_fraction = values['alternate_allele_fraction'][i]
+            variant_call.average_alignment_score_window = values['average_alignment_score_window'][i]
+            variant_call.position_1_average_alignment_score = values['position_1_average_alignment_score'][i]
+            variant_call.position_2_average_alignment_score = values['position_2_average_alignment_score'][i]
+            alternate_allele_read_ids = values['alternate_allele_read_ids'][i]
+            variant_sequences = values['variant_sequences'][i]
+            attributes = values['attributes'][i]
+            tags = values['tags'][i]
 
             # Alternate allele read IDs
             if alternate_allele_read_ids != '':
@@ -572,22 +742,25 @@ class VariantsList:
             if attributes != '' and variant_call.variant_calling_method != '':
                 attribute_types = get_attribute_types(variant_calling_method=variant_call.variant_calling_method)
                 for attribute in attributes.split(';'):
-                    attribute_key = attribute.split('=')[0]
-                    attribute_value = attribute.split('=')[1]
-                    if attribute_types[attribute_key] == int:
+                    # Attribute keys repeat across variant calls so one interned copy is kept
+                    attribute_elements = attribute.split('=')
+                    attribute_key = intern(attribute_elements[0])
+                    attribute_value = attribute_elements[1]
+                    attribute_type = attribute_types[attribute_key]
+                    if attribute_type == int:
                         default_value = -1
-                    elif attribute_types[attribute_key] == float:
+                    elif attribute_type == float:
                         default_value = -1.0
-                    elif attribute_types[attribute_key] == str:
+                    elif attribute_type == str:
                         default_value = ''
-                    elif attribute_types[attribute_key] == bool:
+                    elif attribute_type == bool:
                         default_value = False
                     else:
-                        raise Exception('Unknown variable type for %s' % attribute_types[attribute_key])
+                        raise Exception('Unknown variable type for %s' % attribute_type)
                     attribute_value = get_typed_value(
                         value=attribute_value,
                         default_value=default_value,
-                        type=attribute_types[attribute_key]
+                        type=attribute_type
                     )
                     if attribute_value != default_value:
                         variant_call.attributes[attribute_key] = attribute_value
@@ -598,93 +771,25 @@ class VariantsList:
                     variant_call.tags.add(str(tag))
 
             # Annotations
-            if position_1_annotation_annotator != '':
-                position_1_annotation_annotator = position_1_annotation_annotator.split(';')
-                position_1_annotation_annotator_version = position_1_annotation_annotator_version.split(';')
-                position_1_annotation_region = position_1_annotation_region.split(';')
-                position_1_annotation_species = position_1_annotation_species.split(';')
-                # Gene
-                position_1_annotation_gene_id = position_1_annotation_gene_id.split(';')
-                position_1_annotation_gene_id_stable = position_1_annotation_gene_id_stable.split(';')
-                position_1_annotation_gene_name = position_1_annotation_gene_name.split(';')
-                position_1_annotation_gene_strand = position_1_annotation_gene_strand.split(';')
-                position_1_annotation_gene_type = position_1_annotation_gene_type.split(';')
-                position_1_annotation_gene_version = position_1_annotation_gene_version.split(';')
-                # Transcript
-                position_1_annotation_transcript_id = position_1_annotation_transcript_id.split(';')
-                position_1_annotation_transcript_id_stable = position_1_annotation_transcript_id_stable.split(';')
-                position_1_annotation_transcript_name = position_1_annotation_transcript_name.split(';')
-                position_1_annotation_transcript_strand = position_1_annotation_transcript_strand.split(';')
-                position_1_annotation_transcript_type = position_1_annotation_transcript_type.split(';')
-                position_1_annotation_transcript_version = position_1_annotation_transcript_version.split(';')
-                # Exon
-                position_1_annotation_exon_id = position_1_annotation_exon_id.split(';')
-                position_1_annotation_exon_id_stable = position_1_annotation_exon_id_stable.split(';')
-                for i in range(0, len(position_1_annotation_annotator)):
+            if values['position_1_annotation_annotator'][i] != '':
+                annotation_values = {}
+                for annotation_field in ANNOTATION_FIELDS:
+                    annotation_values[annotation_field] = \
+                        values['position_1_annotation_' + annotation_field][i].split(';')
+                for j in range(0, len(annotation_values['annotator'])):
                     variant_call_annotation = VariantCallAnnotation(
-                        annotator=position_1_annotation_annotator[i],
-                        annotator_version=position_1_annotation_annotator_version[i],
-                        region=position_1_annotation_region[i],
-                        species=position_1_annotation_species[i],
-                        gene_id=position_1_annotation_gene_id[i],
-                        gene_id_stable=position_1_annotation_gene_id_stable[i],
-                        gene_name=position_1_annotation_gene_name[i],
-                        gene_strand=position_1_annotation_gene_strand[i],
-                        gene_type=position_1_annotation_gene_type[i],
-                        gene_version=position_1_annotation_gene_version[i],
-                        transcript_id=position_1_annotation_transcript_id[i],
-                        transcript_id_stable=position_1_annotation_transcript_id_stable[i],
-                        transcript_name=position_1_annotation_transcript_name[i],
-                        transcript_strand=position_1_annotation_transcript_strand[i],
-                        transcript_type=position_1_annotation_transcript_type[i],
-                        transcript_version=position_1_annotation_transcript_version[i],
-                        exon_id=position_1_annotation_exon_id[i],
-                        exon_id_stable=position_1_annotation_exon_id_stable[i]
+                        **{key: val[j] for key, val in annotation_values.items()}
                     )
                     variant_call.add_position_1_annotation(variant_call_annotation=variant_call_annotation)
 
-            if position_2_annotation_annotator != '':
-                position_2_annotation_annotator = position_2_annotation_annotator.split(';')
-                position_2_annotation_annotator_version = position_2_annotation_annotator_version.split(';')
-                position_2_annotation_region = position_2_annotation_region.split(';')
-                position_2_annotation_species = position_2_annotation_species.split(';')
-                # Gene
-                position_2_annotation_gene_id = position_2_annotation_gene_id.split(';')
-                position_2_annotation_gene_id_stable = position_2_annotation_gene_id_stable.split(';')
-                position_2_annotation_gene_name = position_2_annotation_gene_name.split(';')
-                position_2_annotation_gene_strand = position_2_annotation_gene_strand.split(';')
-                position_2_annotation_gene_type = position_2_annotation_gene_type.split(';')
-                position_2_annotation_gene_version = position_2_annotation_gene_version.split(';')
-                # Transcript
-                position_2_annotation_transcript_id = position_2_annotation_transcript_id.split(';')
-                position_2_annotation_transcript_id_stable = position_2_annotation_transcript_id_stable.split(';')
-                position_2_annotation_transcript_name = position_2_annotation_transcript_name.split(';')
-                position_2_annotation_transcript_strand = position_2_annotation_transcript_strand.split(';')
-                position_2_annotation_transcript_type = position_2_annotation_transcript_type.split(';')
-                position_2_annotation_transcript_version = position_2_annotation_transcript_version.split(';')
-                # Exon
-                position_2_annotation_exon_id = position_2_annotation_exon_id.split(';')
-                position_2_annotation_exon_id_stable = position_2_annotation_exon_id_stable.split(';')
-                for i in range(0, len(position_2_annotation_annotator)):
+            if values['position_2_annotation_annotator'][i] != '':
+                annotation_values = {}
+                for annotation_field in ANNOTATION_FIELDS:
+                    annotation_values[annotation_field] = \
+                        values['position_2_annotation_' + annotation_field][i].split(';')
+                for j in range(0, len(annotation_values['annotator'])):
                     variant_call_annotation = VariantCallAnnotation(
-                        annotator=position_2_annotation_annotator[i],
-                        annotator_version=position_2_annotation_annotator_version[i],
-                        region=position_2_annotation_region[i],
-                        species=position_2_annotation_species[i],
-                        gene_id=position_2_annotation_gene_id[i],
-                        gene_id_stable=position_2_annotation_gene_id_stable[i],
-                        gene_name=position_2_annotation_gene_name[i],
-                        gene_strand=position_2_annotation_gene_strand[i],
-                        gene_type=position_2_annotation_gene_type[i],
-                        gene_version=position_2_annotation_gene_version[i],
-                        transcript_id=position_2_annotation_transcript_id[i],
-                        transcript_id_stable=position_2_annotation_transcript_id_stable[i],
-                        transcript_name=position_2_annotation_transcript_name[i],
-                        transcript_strand=position_2_annotation_transcript_strand[i],
-                        transcript_type=position_2_annotation_transcript_type[i],
-                        transcript_version=position_2_annotation_transcript_version[i],
-                        exon_id=position_2_annotation_exon_id[i],
-                        exon_id_stable=position_2_annotation_exon_id_stable[i]
+                        **{key: val[j] for key, val in annotation_values.items()}
                     )
                     variant_call.add_position_2_annotation(variant_call_annotation=variant_call_annotation)
 
@@ -821,29 +926,120 @@ class VariantsList:
     def read_tsv_file(
             tsv_file: str,
             low_memory: bool = False,
-            memory_map: bool = True
+            memory_map: bool = True,
+            chunksize: int = None
     ) -> 'VariantsList':
         """
         Read a TSV file and return a VariantsList object.
 
         Parameters:
-            tsv_file    :   TSV file.
+            tsv_file    :   TSV file (or Parquet file).
             low_memory  :   Low memory (default: False).
             memory_map  :   Map memory (default: True).
+            chunksize   :   If specified, read the TSV file in chunks of this many rows
+                            so that only one chunk is held as a DataFrame at a time
+                            (default: None). Parquet files are read at once.
 
         Returns:
             VariantsList
         """
+        if chunksize is None or is_parquet(tsv_file):
+            df = read_tsv_dataframe(tsv_file=tsv_file,
+                                    dtype=TSV_DTYPES,
+                                    low_memory=low_memory,
+                                    memory_map=memory_map)
+            return VariantsList.load_dataframe(df=df)
         if is_gzipped(tsv_file):
-            df = pd.read_csv(tsv_file,
-                             sep='\t',
-                             compression='gzip',
-                             low_memory=low_memory,
-                             memory_map=memory_map)
+            compression = 'gzip'
         else:
-            df = pd.read_csv(tsv_file,
-                             sep='\t',
-                             low_memory=low_memory,
-                             memory_map=memory_map)
-        return VariantsList.load_dataframe(df=df)
+            compression = None
+        variants_list = VariantsList()
+        with pd.read_csv(tsv_file,
+                         sep='\t',
+                         compression=compression,
+                         dtype=TSV_DTYPES,
+                         low_memory=low_memory,
+                         memory_map=memory_map,
+                         chunksize=chunksize) as reader:
+            for df in reader:
+                # VariantCall rows of a Variant may span consecutive chunks
+                for variant in VariantsList.load_dataframe(df=df).variants:
+                    if variant.id in variants_list._variants_dict:
+                        variant_ = variants_list.get_variant(variant_id=variant.id)
+                        for variant_call in variant.variant_calls:
+                            variant_.add_variant_call(variant_call=variant_call)
+                    else:
+                        variants_list.add_variant(variant=variant)
+        return variants_list
+
+    @staticmethod
+    def read_tsv_file_as_dataframe(
+            tsv_file: str,
+            low_memory: bool = False,
+            memory_map: bool = True
+    ) -> pd.DataFrame:
+        """
+        Read a TSV file and return a DataFrame (one row per VariantCall)
+        without constructing a VariantsList object. Missing optional columns
+        and values are filled in with their default values so that the
+        DataFrame has the same columns as VariantsList.to_dataframe.
+
+        Parameters:
+            tsv_file    :   TSV file.
+            low_memory  :   Low memory (default: False).
+            memory_map  :   Map memory (default: True).
+
+        Returns:
+            Pandas DataFrame
+        """
+        # Chromosomes are dictionary-encoded and positions are int64 (as in to_dataframe)
+        df = read_tsv_dataframe(tsv_file=tsv_file,
+                                dtype={**TSV_DTYPES,
+                                       'chromosome_1': 'category',
+                                       'chromosome_2': 'category',
+                                       'position_1': np.int64,
+                                       'position_2': np.int64},
+                                low_memory=low_memory,
+                                memory_map=memory_map)
+        for column, default_value, column_type in OPTIONAL_COLUMNS:
+            if column not in df.columns:
+                df[column] = default_value
+            else:
+                df[column] = df[column].fillna(default_value).astype(column_type)
+        columns = list(VariantsList().to_dataframe_row().keys())
+        return df.loc[:, columns]
 
+    @staticmethod
+    def read_tsv_file_cached(
+            tsv_file: str,
+            low_memory: bool = False,
+            memory_map: bool = True,
+            chunksize: int = None,
+            cache_dir: str = None
+    ) -> 'VariantsList':
+        """
+        Read a TSV file and return a VariantsList object, reusing the parsed
+        VariantsList from an earlier run if caching is enabled (see
+        get_cache_file) and the TSV file has not changed since.
+
+        Parameters:
+            tsv_file    :   TSV file.
+            low_memory  :   Low memory (default: False).
+            memory_map  :   Map memory (default: True).
+            chunksize   :   If specified, read the TSV file in chunks of this many rows
+                            (default: None).
+            cache_dir   :   Cache directory (default: $VSTOL_CACHE_DIR; caching
+                            is disabled if neither is set).
+
+        Returns:
+            VariantsList
+        """
+        variants_list = VariantsList.load_cache_file(tsv_file=tsv_file, cache_dir=cache_dir)
+        if variants_list is not None:
+            return variants_list
+        variants_list = VariantsList.read_tsv_file(tsv_file=tsv_file,
+                                                   low_memory=low_memory,
+                                                   memory_map=memory_map,
+                                                   chunksize=chunksize)
+        variants_list.write_cache_file(tsv_file=tsv_file, cache_dir=cache_dir)
+        return variants_list
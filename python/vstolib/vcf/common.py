@@ -19,8 +19,9 @@ to handling VCF files.
 
 import gzip
 import pandas as pd
-from typing import Dict
+from typing import Mapping
 from ..constants import VariantCallingMethods
+from ..utilities import ensure_gz_suffix, write_bgzf_file
 
 
 def read_vcf_file(
@@ -76,40 +77,31 @@ def read_vcf_file(
                            names=vcf_names)
 
 
-def get_attribute_types(variant_calling_method: str) -> Dict:
+ATTRIBUTE_TYPES = {
+    VariantCallingMethods.CLAIRS: VariantCallingMethods.AttributeTypes.CLAIRS,
+    VariantCallingMethods.CUTESV: VariantCallingMethods.AttributeTypes.CUTESV,
+    VariantCallingMethods.DEEPVARIANT: VariantCallingMethods.AttributeTypes.DEEPVARIANT,
+    VariantCallingMethods.DELLY2_SOMATIC: VariantCallingMethods.AttributeTypes.DELLY2_SOMATIC,
+    VariantCallingMethods.GATK4_MUTECT2: VariantCallingMethods.AttributeTypes.GATK4_MUTECT2,
+    VariantCallingMethods.LUMPY_SOMATIC: VariantCallingMethods.AttributeTypes.LUMPY_SOMATIC,
+    VariantCallingMethods.MANTA_SOMATIC: VariantCallingMethods.AttributeTypes.MANTA_SOMATIC,
+    VariantCallingMethods.PBSV: VariantCallingMethods.AttributeTypes.PBSV,
+    VariantCallingMethods.SAVANA: VariantCallingMethods.AttributeTypes.SAVANA,
+    VariantCallingMethods.SEVERUS: VariantCallingMethods.AttributeTypes.SEVERUS,
+    VariantCallingMethods.SNIFFLES2: VariantCallingMethods.AttributeTypes.SNIFFLES2,
+    VariantCallingMethods.STRELKA2_SOMATIC: VariantCallingMethods.AttributeTypes.STRELKA2_SOMATIC,
+    VariantCallingMethods.SVIM: VariantCallingMethods.AttributeTypes.SVIM,
+    VariantCallingMethods.SVISIONPRO: VariantCallingMethods.AttributeTypes.SVISIONPRO
+}
+
+
+def get_attribute_types(variant_calling_method: str) -> Mapping:
     """
     Get the attribute type dictionary for a variant calling method.
     """
-    if variant_calling_method == VariantCallingMethods.CLAIRS:
-        return VariantCallingMethods.AttributeTypes.CLAIRS
-    elif variant_calling_method == VariantCallingMethods.CUTESV:
-        return VariantCallingMethods.AttributeTypes.CUTESV
-    elif variant_calling_method == VariantCallingMethods.DEEPVARIANT:
-        return VariantCallingMethods.AttributeTypes.DEEPVARIANT
-    elif variant_calling_method == VariantCallingMethods.DELLY2_SOMATIC:
-        return VariantCallingMethods.AttributeTypes.DELLY2_SOMATIC
-    elif variant_calling_method == VariantCallingMethods.GATK4_MUTECT2:
-        return VariantCallingMethods.AttributeTypes.GATK4_MUTECT2
-    elif variant_calling_method == VariantCallingMethods.LUMPY_SOMATIC:
-        return VariantCallingMethods.AttributeTypes.LUMPY_SOMATIC
-    elif variant_calling_method == VariantCallingMethods.MANTA_SOMATIC:
-        return VariantCallingMethods.AttributeTypes.MANTA_SOMATIC
-    elif variant_calling_method == VariantCallingMethods.PBSV:
-        return VariantCallingMethods.AttributeTypes.PBSV
-    elif variant_calling_method == VariantCallingMethods.SAVANA:
-        return VariantCallingMethods.AttributeTypes.SAVANA
-    elif variant_calling_method == VariantCallingMethods.SEVERUS:
-        return VariantCallingMethods.AttributeTypes.SEVERUS
-    elif variant_calling_method == VariantCallingMethods.SNIFFLES2:
-        return VariantCallingMethods.AttributeTypes.SNIFFLES2
-    elif variant_calling_method == VariantCallingMethods.STRELKA2_SOMATIC:
-        return VariantCallingMethods.AttributeTypes.STRELKA2_SOMATIC
-    elif variant_calling_method == VariantCallingMethods.SVIM:
-        return VariantCallingMethods.AttributeTypes.SVIM
-    elif variant_calling_method == VariantCallingMethods.SVISIONPRO:
-        return VariantCallingMethods.AttributeTypes.SVISIONPRO
-    else:
-        raise Exception('Unsupported variant calling method: %s')
+    if variant_calling_method not in ATTRIBUTE_TYPES:
+        raise Exception('Unsupported variant calling method: %s' % variant_calling_method)
+    return ATTRIBUTE_TYPES[variant_calling_method]
 
 
 def write_vcf_file(
@@ -123,7 +115,7 @@ def write_vcf_file(
     Parameters:
         variants_list       :   VariantsList object.
         output_vcf_file     :   Output VCF file.
-        gzip                :   If True, gzip the VCF file.
+        gzip                :   If True, gzip the VCF file (BGZF).
     """
     # Step 1. Check whether the VariantsList is ready to be written as a VCF file
     # Make sure there is only one VariantCall object per Variant and that there
@@ -142,26 +134,21 @@ def write_vcf_file(
                         % (len(sample_ids)))
     sample_id = list(sample_ids)[0]
 
-    # Step 2. Write VCF
-    if gzip:
-        if output_vcf_file.endswith(".gz") == False:
-            output_vcf_file = output_vcf_file + '.gz'
-        f = gzip.open(output_vcf_file, 'wt')
-    else:
-        f = open(output_vcf_file, 'w')
-    f.write('##fileformat=VCFv4.2\n')
-    f.write('##INFO=<ID=PRECISE,Number=0,Type=Flag,Description="Variant with precise breakpoints">\n')
-    f.write('##INFO=<ID=IMPRECISE,Number=0,Type=Flag,Description="Variant with imprecise breakpoints">\n')
-    f.write('##INFO=<ID=SIZE,Number=1,Type=Integer,Description="Variant size">\n')
-    f.write('##INFO=<ID=TYPE,Number=1,Type=String,Description="Variant type">\n')
-    f.write('##INFO=<ID=CHR2,Number=1,Type=String,Description="Mate chromsome for BND SVs">\n')
-    f.write('##INFO=<ID=END,Number=1,Type=Integer,Description="End position of structural variant">\n')
-    f.write('##INFO=<ID=RNAMES,Number=.,Type=String,Description="Names of supporting reads">\n')
-    f.write('##INFO=<ID=METHOD,Number=.,Type=String,Description="Variant calling method">\n')
-    f.write('##FORMAT=<ID=DR,Number=1,Type=Integer,Description="Number of reference reads">\n')
-    f.write('##FORMAT=<ID=DV,Number=1,Type=Integer,Description="Number of variant reads">\n')
-    f.write('##FORMAT=<ID=VAF,Number=1,Type=Float,Description="Variant allele frequency">\n')
-    f.write('#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\t%s\n' % sample_id)
+    # Step 2. Format the VCF lines
+    lines = []
+    lines.append('##fileformat=VCFv4.2\n')
+    lines.append('##INFO=<ID=PRECISE,Number=0,Type=Flag,Description="Variant with precise breakpoints">\n')
+    lines.append('##INFO=<ID=IMPRECISE,Number=0,Type=Flag,Description="Variant with imprecise breakpoints">\n')
+    lines.append('##INFO=<ID=SIZE,Number=1,Type=Integer,Description="Variant size">\n')
+    lines.append('##INFO=<ID=TYPE,Number=1,Type=String,Description="Variant type">\n')
+    lines.append('##INFO=<ID=CHR2,Number=1,Type=String,Description="Mate chromsome for BND SVs">\n')
+    lines.append('##INFO=<ID=END,Number=1,Type=Integer,Description="End position of structural variant">\n')
+    lines.append('##INFO=<ID=RNAMES,Number=.,Type=String,Description="Names of supporting reads">\n')
+    lines.append('##INFO=<ID=METHOD,Number=.,Type=String,Description="Variant calling method">\n')
+    lines.append('##FORMAT=<ID=DR,Number=1,Type=Integer,Description="Number of reference reads">\n')
+    lines.append('##FORMAT=<ID=DV,Number=1,Type=Integer,Description="Number of variant reads">\n')
+    lines.append('##FORMAT=<ID=VAF,Number=1,Type=Float,Description="Variant allele frequency">\n')
+    lines.append('#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\t%s\n' % sample_id)
     for variant in variants_list.variants:
         variant_call = variant.variant_calls[0]
         curr_chrom = variant_call.chromosome_1
@@ -190,15 +177,23 @@ def write_vcf_file(
         dv = '.' if variant_call.alternate_allele_read_count == -1 else variant_call.alternate_allele_read_count
         vaf = '.' if variant_call.alternate_allele_fraction == -1.0 else variant_call.alternate_allele_fraction
         curr_value = '%s:%s:%s' % (str(dr), str(dv), str(vaf))
-        f.write('%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\n'
-                % (curr_chrom,
-                   curr_pos,
-                   curr_id,
-                   curr_ref,
-                   curr_alt,
-                   curr_qual,
-                   curr_filter,
-                   curr_info,
-                   format,
-                   curr_value))
-    f.close()
+        lines.append('%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\n'
+                     % (curr_chrom,
+                        curr_pos,
+                        curr_id,
+                        curr_ref,
+                        curr_alt,
+                        curr_qual,
+                        curr_filter,
+                        curr_info,
+                        format,
+                        curr_value))
+
+    # Step 3. Write the VCF file in one call
+    # (gzipped VCF files are BGZF so that they can be indexed with tabix)
+    output_vcf_file = ensure_gz_suffix(file_path=output_vcf_file, gzip=gzip)
+    if gzip:
+        write_bgzf_file(chunks=[''.join(lines).encode('utf-8')], file_path=output_vcf_file)
+    else:
+        with open(output_vcf_file, 'w') as f:
+            f.write(''.join(lines))
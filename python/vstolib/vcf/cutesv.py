@@ -19,6 +19,7 @@ The purpose of this python3 script is to implement a parser for CuteSV VCF files
 import pandas as pd
 import re
 from collections import OrderedDict
+from sys import intern
 from typing import Dict
 from ..constants import NucleicAcidTypes, VariantCallingMethods, VariantTypes
 from ..logging import get_logger
@@ -51,6 +52,7 @@ def parse_cutesv_callset(
     sample_ids = df_vcf.columns.values.tolist()[9:]
     curr_variant_call_idx = 1
     curr_variant_idx = 1
+    attribute_types = VariantCallingMethods.AttributeTypes.CUTESV
     for row in df_vcf.to_dict('records'):
         for sample_id in sample_ids:
             # Step 1. Initialize values
@@ -80,8 +82,8 @@ def parse_cutesv_callset(
             for curr_info in info:
                 if '=' in curr_info:
                     curr_info_elements = curr_info.split('=')
-                    curr_key = curr_info_elements[0]
-                    curr_type = VariantCallingMethods.AttributeTypes.CUTESV[curr_key]
+                    curr_key = intern(curr_info_elements[0])
+                    curr_type = attribute_types[curr_key]
                     attributes[curr_key] = get_typed_value(value=curr_info_elements[1],
                                                            default_value='',
                                                            type=curr_type)
@@ -91,14 +93,14 @@ def parse_cutesv_callset(
                     elif curr_info == 'IMPRECISE':
                         attributes['PRECISE'] = False
                     else:
-                        attributes[curr_info] = True
+                        attributes[intern(curr_info)] = True
 
             # Step 3. Extract FORMAT
             format = str(row['FORMAT']).split(':')
             curr_sample = str(row[sample_id]).split(':')
             for curr_format in format:
-                curr_key = curr_format
-                curr_type = VariantCallingMethods.AttributeTypes.CUTESV[curr_key]
+                curr_key = intern(curr_format)
+                curr_type = attribute_types[curr_key]
                 attributes[curr_key] = retrieve_from_list(lst=curr_sample,
                                                           index=format.index(curr_format),
                                                           default_value='',
@@ -139,14 +141,14 @@ def parse_cutesv_callset(
                 alternate_allele_fraction = get_typed_value(value=attributes['AF'], default_value=-1.0, type=float)
 
             # Update chromosome_2 and position_2 for 'BND' or 'TRA'
-            if variant_type in [VariantTypes.BREAKPOINT, VariantTypes.TRANSLOCATION]:
+            if variant_type in VariantTypes.BREAKEND_TYPES:
                 pattern = re.compile(r'(chr\S+):(\d+)')
                 matches = pattern.findall(str(row['ALT']))
                 chromosome_2 = str(matches[0][0])
                 position_2 = int(matches[0][1])
 
             # Update variant_size for 'BND' or 'TRA'
-            if (variant_type in [VariantTypes.BREAKPOINT, VariantTypes.TRANSLOCATION]) and \
+            if (variant_type in VariantTypes.BREAKEND_TYPES) and \
                     (chromosome_1 == chromosome_2):
                 variant_size = abs(position_2 - position_1)
 
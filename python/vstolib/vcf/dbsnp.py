@@ -18,6 +18,7 @@ The purpose of this python3 script is to implement a parser for dbSNP VCF files.
 
 import pandas as pd
 from collections import OrderedDict
+from sys import intern
 from typing import Dict
 from ..constants import NucleicAcidTypes, VariantCallingMethods, VariantTypes
 from ..logging import get_logger
@@ -50,6 +51,7 @@ def parse_dbsnp_callset(
     sample_ids = df_vcf.columns.values.tolist()[9:]
     curr_variant_call_idx = 1
     curr_variant_idx = 1
+    attribute_types = VariantCallingMethods.AttributeTypes.CUTESV
     for row in df_vcf.to_dict('records'):
         for sample_id in sample_ids:
             # Step 1. Initialize values
@@ -79,13 +81,13 @@ def parse_dbsnp_callset(
             for curr_info in info:
                 if '=' in curr_info:
                     curr_info_elements = curr_info.split('=')
-                    curr_key = curr_info_elements[0]
-                    curr_type = VariantCallingMethods.AttributeTypes.CUTESV[curr_key]
+                    curr_key = intern(curr_info_elements[0])
+                    curr_type = attribute_types[curr_key]
                     attributes[curr_key] = get_typed_value(value=curr_info_elements[1],
                                                            default_value='',
                                                            type=curr_type)
                 else:
-                    attributes[curr_info] = True
+                    attributes[intern(curr_info)] = True
 
             # Step 3. Update variables
             # Update the following variables:
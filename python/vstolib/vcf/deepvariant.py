@@ -18,6 +18,7 @@ The purpose of this python3 script is to implement a parser for DeepVariant VCF
 
 import pandas as pd
 from collections import OrderedDict
+from sys import intern
 from typing import Dict
 from ..constants import NucleicAcidTypes, VariantCallingMethods, VariantTypes
 from ..logging import get_logger
@@ -50,6 +51,7 @@ def parse_deepvariant_callset(
     sample_ids = df_vcf.columns.values.tolist()[9:]
     curr_variant_call_idx = 1
     curr_variant_idx = 1
+    attribute_types = VariantCallingMethods.AttributeTypes.DEEPVARIANT
     for row in df_vcf.to_dict('records'):
         for sample_id in sample_ids:
             # Step 1. Initialize values
@@ -76,8 +78,8 @@ def parse_deepvariant_callset(
             for curr_info in info:
                 if '=' in curr_info:
                     curr_info_elements = curr_info.split('=')
-                    curr_key = curr_info_elements[0]
-                    curr_type = VariantCallingMethods.AttributeTypes.DEEPVARIANT[curr_key]
+                    curr_key = intern(curr_info_elements[0])
+                    curr_type = attribute_types[curr_key]
                     attributes[curr_key] = get_typed_value(value=curr_info_elements[1],
                                                            default_value='',
                                                            type=curr_type)
@@ -87,14 +89,14 @@ def parse_deepvariant_callset(
                     elif curr_info == 'IMPRECISE':
                         attributes['PRECISE'] = False
                     elif curr_info != '.':
-                        attributes[curr_info] = True
+                        attributes[intern(curr_info)] = True
 
             # Step 3. Extract FORMAT
             format = str(row['FORMAT']).split(':')
             curr_sample = str(row[sample_id]).split(':')
             for curr_format in format:
-                curr_key = curr_format
-                curr_type = VariantCallingMethods.AttributeTypes.DEEPVARIANT[curr_key]
+                curr_key = intern(curr_format)
+                curr_type = attribute_types[curr_key]
                 attributes[curr_key] = retrieve_from_list(lst=curr_sample,
                                                           index=format.index(curr_format),
                                                           default_value='',
@@ -19,6 +19,7 @@ The purpose of this python3 script is to implement a parser for Lumpy VCF files.
 import pandas as pd
 import re
 from collections import OrderedDict
+from sys import intern
 from typing import Dict
 from ..constants import NucleicAcidTypes, VariantCallingMethods, VariantTypes
 from ..logging import get_logger
@@ -52,6 +53,7 @@ def parse_lumpy_somatic_callset(
     curr_variant_call_idx = 1
     curr_variant_idx = 1
     bnd_lookup = set()
+    attribute_types = VariantCallingMethods.AttributeTypes.LUMPY_SOMATIC
     for row in df_vcf.to_dict('records'):
         for sample_id in sample_ids:
             # Step 1. Initialize values
@@ -81,8 +83,8 @@ def parse_lumpy_somatic_callset(
             for curr_info in info:
                 if '=' in curr_info:
                     curr_info_elements = curr_info.split('=')
-                    curr_key = curr_info_elements[0]
-                    curr_type = VariantCallingMethods.AttributeTypes.LUMPY_SOMATIC[curr_key]
+                    curr_key = intern(curr_info_elements[0])
+                    curr_type = attribute_types[curr_key]
                     attributes[curr_key] = get_typed_value(value=curr_info_elements[1],
                                                            default_value='',
                                                            type=curr_type)
@@ -92,14 +94,14 @@ def parse_lumpy_somatic_callset(
                     elif curr_info == 'IMPRECISE':
                         attributes['PRECISE'] = False
                     else:
-                        attributes[curr_info] = True
+                        attributes[intern(curr_info)] = True
 
             # Step 3. Extract FORMAT
             format = str(row['FORMAT']).split(':')
             curr_sample = str(row[sample_id]).split(':')
             for curr_format in format:
-                curr_key = curr_format
-                curr_type = VariantCallingMethods.AttributeTypes.LUMPY_SOMATIC[curr_key]
+                curr_key = intern(curr_format)
+                curr_type = attribute_types[curr_key]
                 attributes[curr_key] = retrieve_from_list(lst=curr_sample,
                                                           index=format.index(curr_format),
                                                           default_value='',
@@ -130,14 +132,14 @@ def parse_lumpy_somatic_callset(
                 variant_size = abs(attributes['SVLEN'])
 
             # Update chromosome_2 and position_2 for 'BND'
-            if variant_type in [VariantTypes.BREAKPOINT, VariantTypes.TRANSLOCATION]:
+            if variant_type in VariantTypes.BREAKEND_TYPES:
                 pattern = re.compile(r'(chr\S+):(\d+)')
                 matches = pattern.findall(str(row['ALT']))
                 chromosome_2 = str(matches[0][0])
                 position_2 = int(matches[0][1])
 
             # Update variant_size 'BND'
-            if (variant_type in [VariantTypes.BREAKPOINT, VariantTypes.TRANSLOCATION]) and \
+            if (variant_type in VariantTypes.BREAKEND_TYPES) and \
                     (chromosome_1 == chromosome_2):
                 variant_size = abs(position_2 - position_1)
 
@@ -154,7 +156,7 @@ def parse_lumpy_somatic_callset(
                 alternate_allele_fraction = float(alternate_allele_read_count) / float(total_read_count)
 
             # Check if a duplicate row exists in the VCF
-            if variant_type == VariantTypes.BREAKPOINT or variant_type == VariantTypes.TRANSLOCATION:
+            if variant_type in VariantTypes.BREAKEND_TYPES:
                 bnd_id = '%s:%i-%s:%i' % (chromosome_2, position_2, chromosome_1, position_1)
                 if bnd_id in bnd_lookup:
                     continue
@@ -18,6 +18,7 @@ The purpose of this python3 script is to implement a parser for PBSV VCF files.
 
 import pandas as pd
 from collections import OrderedDict
+from sys import intern
 from typing import Dict
 from ..constants import NucleicAcidTypes, VariantCallingMethods, VariantTypes
 from ..logging import get_logger
@@ -51,6 +52,7 @@ def parse_pbsv_callset(
     curr_variant_call_idx = 1
     curr_variant_idx = 1
     included_mate_ids = set()
+    attribute_types = VariantCallingMethods.AttributeTypes.PBSV
     for row in df_vcf.to_dict('records'):
         for sample_id in sample_ids:
             # Step 1. Initialize values
@@ -80,8 +82,8 @@ def parse_pbsv_callset(
             for curr_info in info:
                 if '=' in curr_info:
                     curr_info_elements = curr_info.split('=')
-                    curr_key = curr_info_elements[0]
-                    curr_type = VariantCallingMethods.AttributeTypes.PBSV[curr_key]
+                    curr_key = intern(curr_info_elements[0])
+                    curr_type = attribute_types[curr_key]
                     attributes[curr_key] = get_typed_value(value=curr_info_elements[1],
                                                            default_value='',
                                                            type=curr_type)
@@ -91,14 +93,14 @@ def parse_pbsv_callset(
                     elif curr_info == 'IMPRECISE':
                         attributes['PRECISE'] = False
                     else:
-                        attributes[curr_info] = True
+                        attributes[intern(curr_info)] = True
 
             # Step 3. Extract FORMAT
             format = str(row['FORMAT']).split(':')
             curr_sample = str(row[sample_id]).split(':')
             for curr_format in format:
-                curr_key = curr_format
-                curr_type = VariantCallingMethods.AttributeTypes.PBSV[curr_key]
+                curr_key = intern(curr_format)
+                curr_type = attribute_types[curr_key]
                 attributes[curr_key] = retrieve_from_list(lst=curr_sample,
                                                           index=format.index(curr_format),
                                                           default_value='',
@@ -131,17 +133,17 @@ def parse_pbsv_callset(
                 variant_size = abs(attributes['SVLEN'])
 
             # Update chromosome_2 for 'BND'
-            if variant_type == VariantTypes.BREAKPOINT or variant_type == VariantTypes.TRANSLOCATION:
+            if variant_type in VariantTypes.BREAKEND_TYPES:
                 curr_id = attributes['ID'].split("-")[1]
                 chromosome_2 = str(curr_id.split(":")[0])
 
             # Update position_2 for 'BND'
-            if variant_type == VariantTypes.BREAKPOINT or variant_type == VariantTypes.TRANSLOCATION:
+            if variant_type in VariantTypes.BREAKEND_TYPES:
                 curr_id = attributes['ID'].split("-")[1]
                 position_2 = int(curr_id.split(":")[1])
 
             # Update variant_size for 'BND'
-            if (variant_type == VariantTypes.BREAKPOINT or variant_type == VariantTypes.TRANSLOCATION) and \
+            if (variant_type in VariantTypes.BREAKEND_TYPES) and \
                     (chromosome_1 == chromosome_2):
                 variant_size = abs(position_2 - position_1)
 
@@ -162,7 +164,7 @@ def parse_pbsv_callset(
                 alternate_allele_fraction = float(alternate_allele_read_count) / float(total_read_count)
 
             # Check if variant_call ID has been included
-            if variant_type == VariantTypes.BREAKPOINT or variant_type == VariantTypes.TRANSLOCATION:
+            if variant_type in VariantTypes.BREAKEND_TYPES:
                 if attributes['ID'] in included_mate_ids:
                     continue
                 included_mate_ids.add(attributes['ID'])
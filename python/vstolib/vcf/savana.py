@@ -19,6 +19,7 @@ The purpose of this python3 script is to implement a parser for Savana VCF files
 import pandas as pd
 import re
 from collections import OrderedDict
+from sys import intern
 from typing import Dict
 from ..constants import NucleicAcidTypes, VariantCallingMethods, VariantTypes
 from ..logging import get_logger
@@ -56,6 +57,7 @@ def parse_savana_callset(
     curr_variant_call_idx = 1
     curr_variant_idx = 1
     included_mate_ids = set()
+    attribute_types = VariantCallingMethods.AttributeTypes.SAVANA
     for row in df_vcf.to_dict('records'):
         for sample_id in sample_ids:
             # Step 1. Initialize values
@@ -89,8 +91,8 @@ def parse_savana_callset(
             for curr_info in info:
                 if '=' in curr_info:
                     curr_info_elements = curr_info.split('=')
-                    curr_key = curr_info_elements[0]
-                    curr_type = VariantCallingMethods.AttributeTypes.SAVANA[curr_key]
+                    curr_key = intern(curr_info_elements[0])
+                    curr_type = attribute_types[curr_key]
                     attributes[curr_key] = get_typed_value(value=curr_info_elements[1], default_value='', type=curr_type)
                 else:
                     if curr_info == 'PRECISE':
@@ -98,14 +100,14 @@ def parse_savana_callset(
                     elif curr_info == 'IMPRECISE':
                         attributes['PRECISE'] = False
                     else:
-                        attributes[curr_info] = True
+                        attributes[intern(curr_info)] = True
 
             # Step 3. Extract FORMAT
             format = str(row['FORMAT']).split(':')
             curr_sample = str(row[sample_id]).split(':')
             for curr_format in format:
-                curr_key = curr_format
-                curr_type = VariantCallingMethods.AttributeTypes.SAVANA[curr_key]
+                curr_key = intern(curr_format)
+                curr_type = attribute_types[curr_key]
                 attributes[curr_key] = retrieve_from_list(lst=curr_sample,
                                                           index=format.index(curr_format),
                                                           default_value='',
@@ -171,7 +173,7 @@ def parse_savana_callset(
                     normal_alternate_allele_fraction = float(normal_alternate_allele_read_count) / float(normal_total_read_count)
 
             # Update chromosome_2 and position_2 for 'BND'
-            if variant_type == VariantTypes.BREAKPOINT or variant_type == VariantTypes.TRANSLOCATION:
+            if variant_type in VariantTypes.BREAKEND_TYPES:
                 pattern = re.compile(r'(chr\S+):(\d+)')
                 matches = pattern.findall(str(row['ALT']))
                 chromosome_2 = str(matches[0][0])
@@ -180,12 +182,12 @@ def parse_savana_callset(
                 position_2 = position_1
 
             # Update variant_size for 'BND'
-            if (variant_type == VariantTypes.BREAKPOINT or variant_type == VariantTypes.TRANSLOCATION) and \
+            if (variant_type in VariantTypes.BREAKEND_TYPES) and \
                     (chromosome_1 == chromosome_2):
                 variant_size = abs(position_1 - position_2) + 1
 
             # Check if variant_call ID has been included
-            if variant_type == VariantTypes.BREAKPOINT or variant_type == VariantTypes.TRANSLOCATION:
+            if variant_type in VariantTypes.BREAKEND_TYPES:
                 if attributes['ID'] in included_mate_ids:
                     continue
                 included_mate_ids.add(attributes['MATEID'])
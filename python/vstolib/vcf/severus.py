@@ -19,6 +19,7 @@ The purpose of this python3 script is to implement a parser for Severus VCF file
 import pandas as pd
 import re
 from collections import OrderedDict
+from sys import intern
 from typing import Dict
 from ..constants import NucleicAcidTypes, VariantCallingMethods, VariantTypes
 from ..logging import get_logger
@@ -53,6 +54,7 @@ def parse_severus_callset(
     sample_id = df_vcf.columns.values.tolist()[9:][0]
     curr_variant_call_idx = 1
     curr_variant_idx = 1
+    attribute_types = VariantCallingMethods.AttributeTypes.SEVERUS
     for row in df_vcf.to_dict('records'):
         # Step 1. Initialize values
         chromosome_1 = retrieve_from_dict(dct=row, key='CHROM', default_value='', type=str)
@@ -81,8 +83,8 @@ def parse_severus_callset(
         for curr_info in info:
             if '=' in curr_info:
                 curr_info_elements = curr_info.split('=')
-                curr_key = curr_info_elements[0]
-                curr_type = VariantCallingMethods.AttributeTypes.SEVERUS[curr_key]
+                curr_key = intern(curr_info_elements[0])
+                curr_type = attribute_types[curr_key]
                 attributes[curr_key] = get_typed_value(value=curr_info_elements[1], default_value='', type=curr_type)
             else:
                 if curr_info == 'PRECISE':
@@ -90,14 +92,14 @@ def parse_severus_callset(
                 elif curr_info == 'IMPRECISE':
                     attributes['PRECISE'] = False
                 else:
-                    attributes[curr_info] = True
+                    attributes[intern(curr_info)] = True
 
         # Step 3. Extract FORMAT
         format = str(row['FORMAT']).split(':')
         curr_sample = str(row[sample_id]).split(':')
         for curr_format in format:
-            curr_key = curr_format
-            curr_type = VariantCallingMethods.AttributeTypes.SEVERUS[curr_key]
+            curr_key = intern(curr_format)
+            curr_type = attribute_types[curr_key]
             attributes[curr_key] = retrieve_from_list(lst=curr_sample,
                                                       index=format.index(curr_format),
                                                       default_value='',
@@ -140,7 +142,7 @@ def parse_severus_callset(
             alternate_allele_fraction = float(alternate_allele_read_count) / float(total_read_count)
 
         # Update variant_size for 'BND'
-        if (variant_type == VariantTypes.BREAKPOINT or variant_type == VariantTypes.TRANSLOCATION) and \
+        if (variant_type in VariantTypes.BREAKEND_TYPES) and \
                 (chromosome_1 == chromosome_2):
             variant_size = abs(position_1 - position_2) + 1
 
@@ -19,6 +19,7 @@ The purpose of this python3 script is to implement a parser for SVIM VCF files.
 import pandas as pd
 import re
 from collections import OrderedDict
+from sys import intern
 from typing import Dict
 from ..constants import NucleicAcidTypes, VariantCallingMethods, VariantTypes
 from ..logging import get_logger
@@ -31,6 +32,13 @@ from ..variants_list import VariantsList
 logger = get_logger(__name__)
 
 
+# SVIM duplication SVTYPE values and their duplication subtypes
+DUPLICATION_SUBTYPES = {
+    'DUP:TANDEM': VariantTypes.DuplicationSubtypes.TANDEM_DUPLICATION,
+    'DUP:INT': VariantTypes.DuplicationSubtypes.INTERSPERSED_DUPLICATION
+}
+
+
 def parse_svim_callset(
         df_vcf: pd.DataFrame,
         sequencing_platform: str,
@@ -51,6 +59,7 @@ def parse_svim_callset(
     sample_ids = df_vcf.columns.values.tolist()[9:]
     curr_variant_call_idx = 1
     curr_variant_idx = 1
+    attribute_types = VariantCallingMethods.AttributeTypes.SVIM
     for row in df_vcf.to_dict('records'):
         for sample_id in sample_ids:
             # Step 1. Initialize values
@@ -80,8 +89,8 @@ def parse_svim_callset(
             for curr_info in info:
                 if '=' in curr_info:
                     curr_info_elements = curr_info.split('=')
-                    curr_key = curr_info_elements[0]
-                    curr_type = VariantCallingMethods.AttributeTypes.SVIM[curr_key]
+                    curr_key = intern(curr_info_elements[0])
+                    curr_type = attribute_types[curr_key]
                     attributes[curr_key] = get_typed_value(value=curr_info_elements[1],
                                                            default_value='',
                                                            type=curr_type)
@@ -91,14 +100,14 @@ def parse_svim_callset(
                     elif curr_info == 'IMPRECISE':
                         attributes['PRECISE'] = False
                     else:
-                        attributes[curr_info] = True
+                        attributes[intern(curr_info)] = True
 
             # Step 3. Extract FORMAT
             format = str(row['FORMAT']).split(':')
             curr_sample = str(row[sample_id]).split(':')
             for curr_format in format:
-                curr_key = curr_format
-                curr_type = VariantCallingMethods.AttributeTypes.SVIM[curr_key]
+                curr_key = intern(curr_format)
+                curr_type = attribute_types[curr_key]
                 attributes[curr_key] = retrieve_from_list(lst=curr_sample,
                                                           index=format.index(curr_format),
                                                           default_value='',
@@ -122,12 +131,9 @@ def parse_svim_callset(
                     precise = 'no'
             if 'SVTYPE' in attributes.keys():
                 variant_type = attributes['SVTYPE']
-            if variant_type == 'DUP:TANDEM':
-                variant_type = VariantTypes.DUPLICATION
-                variant_subtype = VariantTypes.DuplicationSubtypes.TANDEM_DUPLICATION
-            if variant_type == 'DUP:INT':
+            if variant_type in DUPLICATION_SUBTYPES:
+                variant_subtype = DUPLICATION_SUBTYPES[variant_type]
                 variant_type = VariantTypes.DUPLICATION
-                variant_subtype = VariantTypes.DuplicationSubtypes.INTERSPERSED_DUPLICATION
             if 'END' in attributes.keys():
                 position_2 = attributes['END']
             if 'AD' in attributes.keys():
@@ -149,14 +155,14 @@ def parse_svim_callset(
                 alternate_allele_read_ids = attributes['READS'].split(',')
 
             # Update chromosome_2 and position_2 for 'BND' or 'TRA'
-            if variant_type in [VariantTypes.BREAKPOINT, VariantTypes.TRANSLOCATION]:
+            if variant_type in VariantTypes.BREAKEND_TYPES:
                 pattern = re.compile(r'(chr\S+):(\d+)')
                 matches = pattern.findall(str(row['ALT']))
                 chromosome_2 = str(matches[0][0])
                 position_2 = int(matches[0][1])
 
             # Update variant_size 'BND'
-            if (variant_type in [VariantTypes.BREAKPOINT, VariantTypes.TRANSLOCATION]) and \
+            if (variant_type in VariantTypes.BREAKEND_TYPES) and \
                     (chromosome_1 == chromosome_2):
                 variant_size = abs(position_2 - position_1)
 
@@ -1,5 +1,25 @@
 import subprocess
 from importlib import resources
+from .utilities import read_tsv_dataframe
+
+
+# Columns of a VSTOL TSV file that are plotted by visualize.R
+VISUALIZE_COLUMNS = [
+    'sample_id',
+    'source_id',
+    'chromosome_1',
+    'chromosome_2',
+    'variant_type',
+    'variant_calling_method',
+    'filter',
+    'quality_score',
+    'precise',
+    'variant_size',
+    'reference_allele_read_count',
+    'alternate_allele_read_count',
+    'total_read_count',
+    'alternate_allele_fraction'
+]
 
 
 def visualize(
@@ -10,18 +30,27 @@ def visualize(
     """
     Visualize a TSV file.
 
+    Only the plotted columns are read (as text, so that values reach R
+    unchanged) and piped to the R script, which then does not have to
+    parse the read IDs, sequences and annotations of every variant call.
+
     Args:
         rscript_path        :   Rscript path.
         tsv_file            :   VSTOL TSV file.
         output_pdf_file     :   Output PDF file.
     """
+    df = read_tsv_dataframe(tsv_file=tsv_file, dtype=str, usecols=VISUALIZE_COLUMNS)
     with resources.path('vstolib.resources.scripts', 'visualize.R') as script_path:
         command = [rscript_path,
                    str(script_path),
-                   '--tsv-file', tsv_file,
+                   '--tsv-file', '-',
                    '--output-pdf-file', output_pdf_file]
         try:
-            result = subprocess.run(command, check=True, capture_output=True, text=True)
+            result = subprocess.run(command,
+                                    input=df[VISUALIZE_COLUMNS].to_csv(sep='\t', index=False),
+                                    check=True,
+                                    capture_output=True,
+                                    text=True)
             print("R script output:", result.stdout)
         except subprocess.CalledProcessError as e:
             print(f"Error running R script: {e.stderr}")
@@ -102,35 +102,40 @@ fn compare_variants_lists(
     Ok(serialized)
 }
 
-/// This function filters a serialized VariantsList object and returns a filtered VariantsList.
+/// This function filters a serialized VariantsList object and returns the IDs of the variants that pass.
 ///
 /// # Arguments
 /// * `vl_target`               -   serialized VariantsList object.
-/// * `vl_target`               -   list of serialized VariantFilter objects.
+/// * `filter_list`             -   list of serialized VariantFilter objects.
 /// * `num_threads`             -   number of threads.
 ///
 /// # Returns
-/// * A serialized VariantsList string.
+/// * A vector of the IDs of the Variant objects that pass all VariantFilter objects.
 #[pyfunction]
 fn filter_variants_list(
     py: Python,
     vl_target: String,
     filter_list: &PyList,
     num_threads: usize
-) -> PyResult<String> {
-    // Step 1. Deserialize VariantsList object
-    let mut variants_list: VariantsList = deserialize_variants_list(&vl_target);
-
-    // Step 2. Deserialize VariantFilter objects
+) -> PyResult<Vec<String>> {
+    // Step 1. Deserialize VariantFilter objects
     let variant_filters: Vec<VariantFilter> = deserialize_variant_filters(filter_list);
 
-    // Step 3. Filter VariantsList object
-    variants_list.filter(variant_filters, num_threads);
+    // Steps 2-4 do not touch Python objects so the GIL is released
+    // (other Python threads can run while the VariantsList is filtered)
+    let variant_ids = py.allow_threads(move || {
+        // Step 2. Deserialize VariantsList object
+        let mut variants_list: VariantsList = deserialize_variants_list(&vl_target);
 
-    // Step 4. Serialize filtered VariantsList object
-    let serialized = serde_json::to_string(&variants_list).expect("Serialization of the filtered VariantsList object failed");
+        // Step 3. Filter VariantsList object
+        variants_list.filter(variant_filters, num_threads);
 
-    Ok(serialized)
+        // Step 4. Collect the IDs of the passed Variant objects (the caller
+        // already has the Variant objects so they are not serialized back)
+        variants_list.variants.into_iter().map(|variant| variant.id).collect::<Vec<String>>()
+    });
+
+    Ok(variant_ids)
 }
 
 /// This function identifies intersecting (or nearby) variant calls given
@@ -239,17 +244,20 @@ fn overlap_variant_calls(
     granges_list: String,
     num_threads: usize
 ) -> Py<PyAny> {
-    // Step 1. Deserialize VariantsList object
-    let mut variants_list: VariantsList = deserialize_variants_list(&vl_target);
-
-    // Step 2. Deserialize GenomicRangesList objects
-    let genomic_ranges_list: GenomicRangesList = deserialize_genomic_ranges_list(&granges_list);
-
-    // Step 3. Find overlapping VariantCall IDs
-    let overlapping_variant_call_ids: HashMap<String, Vec<String>> = variants_list.overlap(
-        genomic_ranges_list,
-        num_threads
-    );
+    // Steps 1-3 do not touch Python objects so the GIL is released
+    let overlapping_variant_call_ids: HashMap<String, Vec<String>> = py.allow_threads(move || {
+        // Step 1. Deserialize VariantsList object
+        let mut variants_list: VariantsList = deserialize_variants_list(&vl_target);
+
+        // Step 2. Deserialize GenomicRangesList objects
+        let genomic_ranges_list: GenomicRangesList = deserialize_genomic_ranges_list(&granges_list);
+
+        // Step 3. Find overlapping VariantCall IDs
+        variants_list.overlap(
+            genomic_ranges_list,
+            num_threads
+        )
+    });
 
     return Python::with_gil(|py| {
         overlapping_variant_call_ids.to_object(py)
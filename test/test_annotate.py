@@ -1,7 +1,7 @@
 from vstolib.ensembl import Ensembl
 from vstolib.gencode import Gencode
 from vstolib.main import annotate
-from python.vstolib.constants import GenomicRegionTypes
+from vstolib.constants import GenomicRegionTypes
 from .data import get_data_path
 
 
@@ -0,0 +1,66 @@
+import dataclasses
+import os
+import shutil
+from .data import get_data_path
+from vstolib.utilities import get_cache_file, prune_cache_dir
+from vstolib.variants_list import VariantsList
+
+
+def copy_tsv_file(tmp_path) -> str:
+    tsv_file = str(tmp_path / 'variants.tsv')
+    shutil.copyfile(get_data_path(name='hg002_merged_variants.tsv'), tsv_file)
+    return tsv_file
+
+
+def test_cache_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv('VSTOL_CACHE_DIR', raising=False)
+    tsv_file = copy_tsv_file(tmp_path)
+    assert get_cache_file(file_path=tsv_file, extension='pickle') is None
+    variants_list = VariantsList.read_tsv_file_cached(tsv_file=tsv_file)
+    assert variants_list.size > 0
+    assert VariantsList.load_cache_file(tsv_file=tsv_file) is None
+    assert sorted(os.listdir(tmp_path)) == ['variants.tsv']
+
+
+def test_cache_environment_variable(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    monkeypatch.setenv('VSTOL_CACHE_DIR', cache_dir)
+    tsv_file = copy_tsv_file(tmp_path)
+    assert os.path.dirname(get_cache_file(file_path=tsv_file, extension='pickle')) == cache_dir
+
+
+def test_cache_hit_miss_invalidate(tmp_path, monkeypatch):
+    monkeypatch.delenv('VSTOL_CACHE_DIR', raising=False)
+    cache_dir = str(tmp_path / 'cache')
+    tsv_file = copy_tsv_file(tmp_path)
+
+    # Miss
+    assert VariantsList.load_cache_file(tsv_file=tsv_file, cache_dir=cache_dir) is None
+    variants_list = VariantsList.read_tsv_file_cached(tsv_file=tsv_file, cache_dir=cache_dir)
+    cache_file = get_cache_file(file_path=tsv_file, extension='pickle', cache_dir=cache_dir)
+    assert os.path.exists(cache_file)
+
+    # Hit
+    variants_list_cached = VariantsList.load_cache_file(tsv_file=tsv_file, cache_dir=cache_dir)
+    assert variants_list_cached is not None
+    assert [dataclasses.asdict(variant) for variant in variants_list_cached.variants] == \
+           [dataclasses.asdict(variant) for variant in variants_list.variants]
+
+    # Invalidate on modification time
+    stat = os.stat(tsv_file)
+    os.utime(tsv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    assert get_cache_file(file_path=tsv_file, extension='pickle', cache_dir=cache_dir) != cache_file
+    assert VariantsList.load_cache_file(tsv_file=tsv_file, cache_dir=cache_dir) is None
+
+
+def test_prune_cache_dir(tmp_path):
+    cache_dir = str(tmp_path)
+    for i in range(4):
+        cache_file = os.path.join(cache_dir, '%032x.pickle' % i)
+        with open(cache_file, 'wb') as f:
+            f.write(b'0' * 100)
+        os.utime(cache_file, ns=(i * 1000000000, i * 1000000000))
+    with open(os.path.join(cache_dir, 'other.pickle'), 'wb') as f:
+        f.write(b'0' * 1000)
+    prune_cache_dir(cache_dir=cache_dir, extension='pickle', max_size=250)
+    assert sorted(os.listdir(cache_dir)) == ['%032x.pickle' % 2, '%032x.pickle' % 3, 'other.pickle']
@@ -1,6 +1,6 @@
 from .conftest import *
 from vstolib.constants import CollapseStrategies
-from vstolib.main import collapse
+from vstolib.main import collapse, collapse_dataframe
 from vstolib.variants_list import VariantsList
 
 
@@ -12,4 +12,38 @@ def test_collapse():
         sample_id='HG002',
         strategy=CollapseStrategies.MAX_ALTERNATE_ALLELE_READ_COUNT
     )
-    print(variants_list_collapsed.size)
\ No newline at end of file
+    print(variants_list_collapsed.size)
+
+def test_collapse_dataframe():
+    tsv_file = get_data_path(name='hg002_merged_variants.tsv')
+    variants_list = VariantsList.read_tsv_file(tsv_file=tsv_file)
+    variants_list_collapsed = collapse(
+        variants_list=variants_list,
+        sample_id='HG002',
+        strategy=CollapseStrategies.MAX_ALTERNATE_ALLELE_READ_COUNT
+    )
+    df_collapsed = collapse_dataframe(
+        df=variants_list.to_dataframe(),
+        sample_id='HG002',
+        strategy=CollapseStrategies.MAX_ALTERNATE_ALLELE_READ_COUNT
+    )
+    assert len(df_collapsed) == variants_list_collapsed.size
+    assert set(df_collapsed['variant_call_id'].values.tolist()) == set(variants_list_collapsed.variant_call_ids)
+    assert df_collapsed['variant_id'].astype(str).is_monotonic_increasing
+
+
+def test_collapse_dataframe_from_tsv_file():
+    tsv_file = get_data_path(name='hg002_merged_variants.tsv')
+    variants_list_collapsed = collapse(
+        variants_list=VariantsList.read_tsv_file(tsv_file=tsv_file),
+        sample_id='HG002',
+        strategy=CollapseStrategies.MAX_ALTERNATE_ALLELE_READ_COUNT
+    )
+    df_collapsed = collapse_dataframe(
+        df=VariantsList.read_tsv_file_as_dataframe(tsv_file=tsv_file),
+        sample_id='HG002',
+        strategy=CollapseStrategies.MAX_ALTERNATE_ALLELE_READ_COUNT
+    )
+    assert df_collapsed.columns.values.tolist() == VariantsList().to_dataframe().columns.values.tolist()
+    assert df_collapsed['variant_call_id'].values.tolist() == \
+           variants_list_collapsed.to_dataframe()['variant_call_id'].values.tolist()
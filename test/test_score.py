@@ -1,4 +1,4 @@
-from vstolib.main import score
+from vstolib.main import score, score_dataframe
 from .data import get_data_path
 
 
@@ -10,3 +10,22 @@ def test_score(severus_variants_list):
         window=1000,
         num_threads=1
     )
+
+
+def test_score_dataframe(severus_variants_list):
+    bam_file = get_data_path(name='hg38_tp53_tumor_long_read_dna.bam')
+    variants_list = score(
+        variants_list=severus_variants_list,
+        bam_file=bam_file,
+        window=1000,
+        num_threads=1
+    )
+    df_scored = score_dataframe(
+        df=severus_variants_list.to_dataframe(),
+        bam_file=bam_file,
+        window=1000,
+        num_threads=1
+    )
+    assert (df_scored['average_alignment_score_window'] == 1000).all()
+    assert df_scored['position_1_average_alignment_score'].values.tolist() == \
+           variants_list.to_dataframe()['position_1_average_alignment_score'].values.tolist()
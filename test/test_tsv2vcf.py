@@ -0,0 +1,50 @@
+import gzip
+import struct
+from .conftest import *
+from vstolib.utilities import BGZF_EOF, write_tsv_file
+from vstolib.vcf.common import write_vcf_file
+
+
+def read_bgzf_blocks(file_path: str) -> list:
+    """
+    Return the BGZF blocks of a file, checking the BC extra field (BSIZE)
+    of each block header.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    blocks = []
+    offset = 0
+    while offset < len(data):
+        id1, id2, cm, flg, _, _, _, xlen, si1, si2, slen, bsize = \
+            struct.unpack('<4BI2BH2BHH', data[offset:offset + 18])
+        assert (id1, id2, cm, flg) == (0x1f, 0x8b, 8, 4)
+        assert (xlen, si1, si2, slen) == (6, ord('B'), ord('C'), 2)
+        block = data[offset:offset + bsize + 1]
+        assert len(block) == bsize + 1
+        blocks.append(block)
+        offset += bsize + 1
+    return blocks
+
+
+def test_tsv2vcf_gzip(pbsv_variants_list, tmp_path):
+    vcf_file = str(tmp_path / 'variants.vcf')
+    write_vcf_file(variants_list=pbsv_variants_list, output_vcf_file=vcf_file, gzip=False)
+    write_vcf_file(variants_list=pbsv_variants_list, output_vcf_file=vcf_file, gzip=True)
+    with open(vcf_file, 'rb') as f:
+        text = f.read()
+    with gzip.open(vcf_file + '.gz', 'rb') as f:
+        assert f.read() == text
+    blocks = read_bgzf_blocks(vcf_file + '.gz')
+    assert len(blocks) > 1
+    assert blocks[-1] == BGZF_EOF
+
+
+def test_write_tsv_file_gzip(pbsv_variants_list, tmp_path):
+    df = pbsv_variants_list.to_dataframe()
+    tsv_file = str(tmp_path / 'variants.tsv')
+    write_tsv_file(df=df, tsv_file=tsv_file + '.gz', gzip=True, num_threads=2, chunksize=100)
+    with gzip.open(tsv_file + '.gz', 'rt', newline='') as f:
+        assert f.read() == df.to_csv(sep='\t', index=False)
+    blocks = read_bgzf_blocks(tsv_file + '.gz')
+    assert len(blocks) > 2
+    assert blocks[-1] == BGZF_EOF
@@ -0,0 +1,108 @@
+import gzip
+import importlib.util
+import numpy as np
+import pandas as pd
+import pytest
+from .conftest import *
+from vstolib.utilities import check_output_format, is_parquet, read_tsv_dataframe, reg2bin, reg2bins, \
+    sort_by_variant_id, to_tsv_lines, write_tsv_file
+from vstolib.variants_list import TSV_DTYPES, VariantsList
+
+
+def get_mixed_dataframe() -> pd.DataFrame:
+    return pd.DataFrame({
+        'variant_id': ['v%i' % (i % 7) for i in range(20)],
+        'float': [0.1 * i if i % 5 else np.nan for i in range(20)],
+        'float_small': [1e-7 * i for i in range(20)],
+        'int': np.arange(20, dtype=np.int32),
+        'nullable_int': pd.array([i if i % 3 else None for i in range(20)], dtype='Int64'),
+        'bool': [i % 2 == 0 for i in range(20)],
+        'category': pd.Categorical([['chr1', 'chr2', None][i % 3] for i in range(20)]),
+        'string': ['' if i % 4 == 0 else 'a;b%i' % i for i in range(20)],
+        'object': [None if i % 6 == 0 else 'x' for i in range(20)]
+    })
+
+
+def test_check_output_format(monkeypatch):
+    check_output_format(output_format=OutputFormats.TSV)
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None)
+    check_output_format(output_format=OutputFormats.TSV)
+    with pytest.raises(Exception):
+        check_output_format(output_format=OutputFormats.PARQUET)
+
+
+def test_parquet_round_trip(pbsv_variants_list, tmp_path):
+    pytest.importorskip('pyarrow')
+    df = pbsv_variants_list.to_dataframe()
+    parquet_file = str(tmp_path / 'variants.parquet')
+    df.to_parquet(parquet_file, index=False, compression='zstd')
+    assert is_parquet(parquet_file)
+    df_parquet = read_tsv_dataframe(tsv_file=parquet_file, dtype=TSV_DTYPES)
+    assert df_parquet.equals(df)
+
+
+def test_to_tsv_lines():
+    df = get_mixed_dataframe()
+    assert ''.join(to_tsv_lines(df=df)) == df.to_csv(sep='\t', index=False)
+    # Values that DataFrame.to_csv would quote are left to DataFrame.to_csv
+    df.loc[3, 'string'] = 'a\tb'
+    assert to_tsv_lines(df=df) is None
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_write_tsv_file(compress, tmp_path):
+    df = get_mixed_dataframe()
+    # A value to be quoted in the second chunk only (formatted by DataFrame.to_csv)
+    df.loc[9, 'string'] = 'a\tb'
+    tsv_file = str(tmp_path / 'variants.tsv')
+    write_tsv_file(df=df, tsv_file=tsv_file, gzip=compress, chunksize=6)
+    open_func = gzip.open if compress else open
+    with open_func(tsv_file, 'rt', encoding='utf-8', newline='') as f:
+        assert f.read() == df.to_csv(sep='\t', index=False)
+
+
+def test_sort_by_variant_id():
+    df = get_mixed_dataframe()
+    df_sorted = sort_by_variant_id(df=df)
+    assert df_sorted.equals(df.sort_values(['variant_id'], kind='stable'))
+    assert sort_by_variant_id(df=df_sorted) is df_sorted
+
+
+def test_reg2bin():
+    assert reg2bin(0, 1) == 4681
+    assert reg2bin(0, 1 << 14) == 4681
+    assert reg2bin(1 << 14, (1 << 14) + 1) == 4682
+    assert reg2bin(0, (1 << 14) + 1) == 585
+    assert reg2bin(0, 1 << 17) == 585
+    assert reg2bin(0, (1 << 17) + 1) == 73
+    assert reg2bin(0, (1 << 26) + 1) == 0
+    assert reg2bin(1 << 29, (1 << 29) + 1) == 0
+    assert reg2bins(0, 1) == [0, 1, 9, 73, 585, 4681]
+
+
+def test_reg2bins():
+    # Every region overlapping a query region is in one of the query's bins
+    rng = np.random.default_rng(1)
+    for _ in range(1000):
+        start = int(rng.integers(0, 1 << 28))
+        end = start + int(rng.integers(1, 1 << int(rng.integers(1, 26))))
+        query_start = int(rng.integers(max(start - (1 << 20), 0), end))
+        query_end = query_start + int(rng.integers(1, 1 << 20))
+        if query_end <= start:
+            continue
+        assert reg2bin(start, end) in reg2bins(query_start, query_end)
+
+
+def test_read_tsv_file_chunksize():
+    tsv_file = get_data_path(name='hg002_merged_variants.tsv')
+    chunksize = 7
+    # The test is only meaningful if a variant spans two chunks
+    variant_ids = pd.read_csv(tsv_file, sep='\t', usecols=['variant_id'])['variant_id'].values
+    assert any(variant_ids[i - 1] == variant_ids[i] for i in range(chunksize, len(variant_ids), chunksize))
+    variants_list = VariantsList.read_tsv_file(tsv_file=tsv_file)
+    variants_list_chunked = VariantsList.read_tsv_file(tsv_file=tsv_file, chunksize=chunksize)
+    assert variants_list_chunked.variant_ids == variants_list.variant_ids
+    assert [[variant_call.id for variant_call in variant.variant_calls]
+            for variant in variants_list_chunked.variants] == \
+           [[variant_call.id for variant_call in variant.variant_calls]
+            for variant in variants_list.variants]
@@ -0,0 +1,117 @@
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//      http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+
+/// Implicit augmented interval tree (as in cgranges).
+///
+/// Intervals are half-open `[start, end)` and stored in a vector sorted by start.
+/// The vector itself is laid out as a binary tree: leaves are at even indices and
+/// a node at level `k` is at an index whose lowest `k` bits are all 1s. Each node
+/// stores the maximum end of its subtree so that subtrees ending before a query
+/// start are skipped.
+pub struct ImplicitIntervalTree {
+    starts: Vec<isize>,
+    ends: Vec<isize>,
+    max_ends: Vec<isize>,
+    labels: Vec<usize>,
+    max_level: usize
+}
+
+impl ImplicitIntervalTree {
+    /// Build an implicit interval tree.
+    ///
+    /// # Arguments
+    ///
+    /// * `intervals` is a vector of tuples (start, end, label) of half-open intervals.
+    pub fn new(mut intervals: Vec<(isize, isize, usize)>) -> Self {
+        intervals.sort_by_key(|&(start, _, _)| start);
+        let n: usize = intervals.len();
+        let starts: Vec<isize> = intervals.iter().map(|&(start, _, _)| start).collect();
+        let ends: Vec<isize> = intervals.iter().map(|&(_, end, _)| end).collect();
+        let labels: Vec<usize> = intervals.iter().map(|&(_, _, label)| label).collect();
+        let mut max_ends: Vec<isize> = ends.clone();
+        let mut max_level: usize = 0;
+        if n > 0 {
+            // Leaves (even indices) already store their own ends. Fill in internal
+            // nodes one level at a time while tracking the rightmost node of each level.
+            let mut last_i: usize = (n - 1) & !1;
+            let mut last: isize = max_ends[last_i];
+            let mut k: usize = 1;
+            while (1usize << k) <= n {
+                let x: usize = 1 << (k - 1);
+                let i0: usize = (x << 1) - 1;
+                let step: usize = x << 2;
+                let mut i: usize = i0;
+                while i < n {
+                    let end_left: isize = max_ends[i - x];
+                    let end_right: isize = if i + x < n { max_ends[i + x] } else { last };
+                    max_ends[i] = ends[i].max(end_left).max(end_right);
+                    i += step;
+                }
+                last_i = if (last_i >> k) & 1 == 1 { last_i - x } else { last_i + x };
+                if last_i < n && max_ends[last_i] > last {
+                    last = max_ends[last_i];
+                }
+                k += 1;
+            }
+            max_level = k - 1;
+        }
+        ImplicitIntervalTree {
+            starts: starts,
+            ends: ends,
+            max_ends: max_ends,
+            labels: labels,
+            max_level: max_level
+        }
+    }
+
+    /// Find intervals overlapping a half-open query interval.
+    ///
+    /// # Arguments
+    ///
+    /// * `start` is the query start.
+    /// * `end` is the query end (exclusive).
+    /// * `labels` is a vector to which the labels of overlapping intervals are appended.
+    pub fn overlap(&self, start: isize, end: isize, labels: &mut Vec<usize>) {
+        let n: usize = self.starts.len();
+        if n == 0 {
+            return;
+        }
+        // Stack of (level, node index, whether the left child has been processed)
+        let mut stack: Vec<(usize, usize, bool)> = vec![(self.max_level, (1 << self.max_level) - 1, false)];
+        while let Some((k, x, left_done)) = stack.pop() {
+            if k <= 3 {
+                // Small subtree: scan its intervals in order of start
+                let i0: usize = x >> k << k;
+                let i1: usize = (i0 + (1 << (k + 1)) - 1).min(n);
+                let mut i: usize = i0;
+                while i < i1 && self.starts[i] < end {
+                    if start < self.ends[i] {
+                        labels.push(self.labels[i]);
+                    }
+                    i += 1;
+                }
+            } else if !left_done {
+                let y: usize = x - (1 << (k - 1));
+                stack.push((k, x, true));
+                if y >= n || self.max_ends[y] > start {
+                    stack.push((k - 1, y, false));
+                }
+            } else if x < n && self.starts[x] < end {
+                if start < self.ends[x] {
+                    labels.push(self.labels[x]);
+                }
+                stack.push((k - 1, x + (1 << (k - 1)), false));
+            }
+        }
+    }
+}
@@ -1,2 +1,3 @@
 pub mod clustering;
+pub mod interval_tree;
 pub mod union_find;
\ No newline at end of file
@@ -11,6 +11,7 @@
 // limitations under the License.
 
 
+use bam::RecordReader;
 use rayon::prelude::*;
 use rayon::ThreadPoolBuilder;
 use std::collections::{HashMap};
@@ -37,7 +38,11 @@ pub fn calculate_average_alignment_scores(
         }
     }
 
-    // Step 3. Split the regions into roughly equal-sized chunks
+    // Step 3. Sort the regions by chromosome and start so that each thread
+    //         reads its part of the BAM file front to back, then split the
+    //         regions into roughly equal-sized chunks
+    regions_reformatted.sort_unstable();
+    regions_reformatted.dedup();
     let chunk_size = (regions_reformatted.len() + num_threads - 1) / num_threads;
     let regions_reformatted_chunks: Vec<_> = regions_reformatted.chunks(chunk_size).collect();
 
@@ -51,13 +56,17 @@ pub fn calculate_average_alignment_scores(
             .par_iter()
             .flat_map(|chunk| {
                 let mut local_reader = bam::IndexedReader::from_path(bam_file).unwrap();
+                // One Record is reused for every read of the chunk (instead of
+                // allocating a new Record per read)
+                let mut record = bam::Record::new();
                 chunk
                     .iter()
                     .map(|(chromosome, start, end)| {
                         let mut total: u32 = 0;
                         let mut count: u32 = 0;
-                        for record in local_reader.fetch(&bam::Region::new(*chromosome, *start, *end)).unwrap() {
-                            total += record.unwrap().mapq() as u32;
+                        let mut viewer = local_reader.fetch(&bam::Region::new(*chromosome, *start, *end)).unwrap();
+                        while viewer.read_into(&mut record).unwrap() {
+                            total += record.mapq() as u32;
                             count += 1;
                         }
                         let score = if count > 0 {
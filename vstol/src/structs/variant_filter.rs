@@ -19,13 +19,94 @@ use crate::structs::variant_call::VariantCall;
 use crate::structs::variant::Variant;
 
 
+// VariantCall attributes that can be filtered on (declared once here
+// rather than collected into a Vec for every VariantCall)
+const STRING_ATTRIBUTES: [&str; 16] = [
+    "id",
+    "source_id",
+    "sample_id",
+    "phase_block_id",
+    "clone_id",
+    "nucleic_acid",
+    "variant_calling_method",
+    "sequencing_platform",
+    "precise",
+    "chromosome_1",
+    "chromosome_2",
+    "reference_allele",
+    "alternate_allele",
+    "filter",
+    "variant_type",
+    "variant_subtype"
+];
+const NUMERIC_ATTRIBUTES: [&str; 10] = [
+    "position_1",
+    "position_2",
+    "quality_score",
+    "variant_size",
+    "total_read_count",
+    "reference_allele_read_count",
+    "alternate_allele_read_count",
+    "alternate_allele_fraction",
+    "position_1_average_alignment_score",
+    "position_2_average_alignment_score"
+];
+
+
+/// Operator of a VariantFilter, resolved once from its string form so that
+/// filtering does not compare operator strings for every VariantCall.
+#[derive(Debug, Clone, Copy, PartialEq, Default)]
+pub enum Operator {
+    #[default]
+    Unresolved,
+    LessThan,
+    LessThanEqualTo,
+    GreaterThan,
+    GreaterThanEqualTo,
+    EqualTo,
+    NotEqualTo,
+    In,
+    Unsupported
+}
+
+impl Operator {
+    pub fn from_str(operator: &str) -> Self {
+        match operator {
+            constants::OPERATOR_LESS_THAN => Operator::LessThan,
+            constants::OPERATOR_LESS_THAN_EQUAL_TO => Operator::LessThanEqualTo,
+            constants::OPERATOR_GREATER_THAN => Operator::GreaterThan,
+            constants::OPERATOR_GREATER_THAN_EQUAL_TO => Operator::GreaterThanEqualTo,
+            constants::OPERATOR_EQUAL_TO => Operator::EqualTo,
+            constants::OPERATOR_NOT_EQUAL_TO => Operator::NotEqualTo,
+            constants::OPERATOR_IN => Operator::In,
+            _ => Operator::Unsupported,
+        }
+    }
+
+    /// Compare two numbers. Returns None if the operator does not apply to numbers.
+    pub fn compare_f64(&self, attribute_value: f64, filter_value: f64) -> Option<bool> {
+        match self {
+            Operator::LessThan => Some(attribute_value < filter_value),
+            Operator::LessThanEqualTo => Some(attribute_value <= filter_value),
+            Operator::GreaterThan => Some(attribute_value > filter_value),
+            Operator::GreaterThanEqualTo => Some(attribute_value >= filter_value),
+            Operator::EqualTo => Some(attribute_value == filter_value),
+            Operator::NotEqualTo => Some(attribute_value != filter_value),
+            _ => None,
+        }
+    }
+}
+
+
 #[derive(Debug, Serialize, Deserialize)]
 pub struct VariantFilter {
     pub quantifier: String,
     pub attribute: String,
     pub operator: String,
     pub value: Value,
-    pub sample_ids: Vec<String>
+    pub sample_ids: Vec<String>,
+    #[serde(skip)]
+    pub operator_type: Operator
 }
 
 impl VariantFilter {
@@ -38,12 +119,46 @@ impl VariantFilter {
         Self {
             quantifier: quantifier,
             attribute: attribute,
+            operator_type: Operator::from_str(&operator),
             operator: operator,
             value: value,
             sample_ids: sample_ids
         }
     }
 
+    /// Resolve the operator and parse the filter value of a numeric attribute
+    /// once for all VariantCall objects (instead of once per VariantCall in
+    /// `keep_variant_call`).
+    ///
+    /// Only per-VariantCall quantifiers (`all` and `any`) are prepared. Values
+    /// that cannot be parsed are left as they are so that `keep_variant_call`
+    /// still reports them.
+    pub fn prepare(&mut self) {
+        self.operator_type = Operator::from_str(&self.operator);
+        if self.quantifier != constants::QUANTIFIER_ALL && self.quantifier != constants::QUANTIFIER_ANY {
+            return;
+        }
+        if !NUMERIC_ATTRIBUTES.contains(&self.attribute.as_str()) {
+            return;
+        }
+        if let Value::String(filter_value) = &self.value {
+            if let Ok(filter_value_f64) = filter_value.as_str().parse::<f64>() {
+                if let Some(number) = serde_json::Number::from_f64(filter_value_f64) {
+                    self.value = Value::Number(number);
+                }
+            }
+        }
+    }
+
+    /// Operator resolved by `new` or `prepare` (resolved here otherwise,
+    /// e.g. for a deserialized VariantFilter that was not prepared).
+    fn get_operator(&self) -> Operator {
+        match self.operator_type {
+            Operator::Unresolved => Operator::from_str(&self.operator),
+            operator_type => operator_type,
+        }
+    }
+
     pub fn keep_variant_call(&self, variant_call: &VariantCall) -> bool {
         // Check if VariantCall is eligible for filtering by this VariantFilter.
         // Return true if VariantCall is ineligible for filtering.
@@ -51,39 +166,9 @@ impl VariantFilter {
             return true;
         }
 
-        let string_attributes = vec![
-            "id",
-            "source_id",
-            "sample_id",
-            "phase_block_id",
-            "clone_id",
-            "nucleic_acid",
-            "variant_calling_method",
-            "sequencing_platform",
-            "precise",
-            "chromosome_1",
-            "chromosome_2",
-            "reference_allele",
-            "alternate_allele",
-            "filter",
-            "variant_type",
-            "variant_subtype"
-        ];
-        let numeric_attributes = vec![
-            "position_1",
-            "position_2",
-            "quality_score",
-            "variant_size",
-            "total_read_count",
-            "reference_allele_read_count",
-            "alternate_allele_read_count",
-            "alternate_allele_fraction",
-            "position_1_average_alignment_score",
-            "position_2_average_alignment_score"
-        ];
 //         let boolean_attributes = vec![
 //         ];
-        if string_attributes.contains(&self.attribute.as_str()) {
+        if STRING_ATTRIBUTES.contains(&self.attribute.as_str()) {
             let attribute_value: &str = match self.attribute.as_str() {
                 "id" => &variant_call.id.as_str(),
                 "source_id" => variant_call.source_id.as_str(),
@@ -105,13 +190,14 @@ impl VariantFilter {
             };
             match &self.value {
                 Value::String(filter_value) => {
-                    if self.operator == constants::OPERATOR_EQUAL_TO {
+                    let operator = self.get_operator();
+                    if operator == Operator::EqualTo {
                         if attribute_value == filter_value {
                             true
                         } else {
                             false
                         }
-                    } else if self.operator == constants::OPERATOR_NOT_EQUAL_TO {
+                    } else if operator == Operator::NotEqualTo {
                         if attribute_value != filter_value {
                             true
                         } else {
@@ -123,9 +209,8 @@ impl VariantFilter {
                     }
                 }
                 Value::Array(filter_value) => {
-                    if self.operator == constants::OPERATOR_IN {
-                        let attribute_value_as_value = Value::String(attribute_value.to_string());
-                        if filter_value.contains(&attribute_value_as_value) {
+                    if self.get_operator() == Operator::In {
+                        if filter_value.iter().any(|value| value.as_str() == Some(attribute_value)) {
                             true
                         } else {
                             false
@@ -152,7 +237,7 @@ impl VariantFilter {
                     std::process::exit(exitcode::DATAERR);
                 }
             }
-        } else if numeric_attributes.contains(&self.attribute.as_str()) {
+        } else if NUMERIC_ATTRIBUTES.contains(&self.attribute.as_str()) {
             let attribute_value: f64 = match self.attribute.as_str() {
                 "position_1" => variant_call.position_1 as f64,
                 "position_2" => variant_call.position_2 as f64,
@@ -176,45 +261,12 @@ impl VariantFilter {
                             std::process::exit(exitcode::DATAERR);
                         },
                     };
-                    if self.operator == constants::OPERATOR_EQUAL_TO {
-                        if attribute_value == filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_LESS_THAN {
-                        if attribute_value < filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_LESS_THAN_EQUAL_TO {
-                        if attribute_value <= filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_GREATER_THAN {
-                        if attribute_value > filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_GREATER_THAN_EQUAL_TO {
-                        if attribute_value >= filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_NOT_EQUAL_TO {
-                        if attribute_value != filter_value_f64 {
-                            true
-                        } else {
-                            false
+                    match self.get_operator().compare_f64(attribute_value, filter_value_f64) {
+                        Some(keep) => keep,
+                        None => {
+                            eprintln!("{}", format!("Unsupported operator for number: {}", self.operator));
+                            std::process::exit(exitcode::DATAERR);
                         }
-                    } else {
-                        eprintln!("{}", format!("Unsupported operator for string: {}", self.operator));
-                        std::process::exit(exitcode::DATAERR);
                     }
                 }
                 Value::Array(_) => {
@@ -227,45 +279,12 @@ impl VariantFilter {
                 }
                 Value::Number(filter_value) => {
                     let filter_value_f64 = filter_value.as_f64().unwrap();
-                    if self.operator == constants::OPERATOR_EQUAL_TO {
-                        if attribute_value == filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_LESS_THAN {
-                        if attribute_value < filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_LESS_THAN_EQUAL_TO {
-                        if attribute_value <= filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_GREATER_THAN {
-                        if attribute_value > filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_GREATER_THAN_EQUAL_TO {
-                        if attribute_value >= filter_value_f64 {
-                            true
-                        } else {
-                            false
-                        }
-                    } else if self.operator == constants::OPERATOR_NOT_EQUAL_TO {
-                        if attribute_value != filter_value_f64 {
-                            true
-                        } else {
-                            false
+                    match self.get_operator().compare_f64(attribute_value, filter_value_f64) {
+                        Some(keep) => keep,
+                        None => {
+                            eprintln!("{}", format!("Unsupported operator for number: {}", self.operator));
+                            std::process::exit(exitcode::DATAERR);
                         }
-                    } else {
-                        eprintln!("{}", format!("Unsupported operator for string: {}", self.operator));
-                        std::process::exit(exitcode::DATAERR);
                     }
                 }
                 Value::Null => {
@@ -399,46 +418,13 @@ impl VariantFilter {
                 }
                 Value::Number(filter_value) => {
                     let filter_value_f64 = filter_value.as_f64().unwrap();
-                    if self.operator == constants::OPERATOR_EQUAL_TO {
-                        if attribute_value == filter_value_f64 {
-                            return true;
-                        } else {
-                            return false;
-                        }
-                    } else if self.operator == constants::OPERATOR_LESS_THAN {
-                        if attribute_value < filter_value_f64 {
-                            return true;
-                        } else {
-                            return false;
-                        }
-                    } else if self.operator == constants::OPERATOR_LESS_THAN_EQUAL_TO {
-                        if attribute_value <= filter_value_f64 {
-                            return true;
-                        } else {
-                            return false;
-                        }
-                    } else if self.operator == constants::OPERATOR_GREATER_THAN {
-                        if attribute_value > filter_value_f64 {
-                            return true;
-                        } else {
-                            return false;
-                        }
-                    } else if self.operator == constants::OPERATOR_GREATER_THAN_EQUAL_TO {
-                        if attribute_value >= filter_value_f64 {
-                            return true;
-                        } else {
-                            return false;
-                        }
-                    } else if self.operator == constants::OPERATOR_NOT_EQUAL_TO {
-                        if attribute_value != filter_value_f64 {
-                            return true;
-                        } else {
-                            return false;
+                    return match self.get_operator().compare_f64(attribute_value, filter_value_f64) {
+                        Some(keep) => keep,
+                        None => {
+                            eprintln!("{}", format!("Unsupported operator for number: {}", self.operator));
+                            std::process::exit(exitcode::DATAERR);
                         }
-                    } else {
-                        eprintln!("{}", format!("Unsupported operator for string: {}", self.operator));
-                        std::process::exit(exitcode::DATAERR);
-                    }
+                    };
                 }
                 Value::Null => {
                     eprintln!("Filter value cannot be null for a numeric attribute.");
@@ -467,7 +453,8 @@ impl Clone for VariantFilter {
             attribute: self.attribute.to_string(),
             operator: self.operator.to_string(),
             value: self.value.clone(),
-            sample_ids: sample_ids
+            sample_ids: sample_ids,
+            operator_type: self.operator_type
         }
     }
 }
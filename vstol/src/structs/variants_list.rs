@@ -20,7 +20,7 @@ use std::cmp::{max,min};
 use std::collections::{HashMap, HashSet};
 use crate::constants;
 use crate::algorithms::clustering::find_clusters;
-use crate::structs::genomic_range::GenomicRange;
+use crate::algorithms::interval_tree::ImplicitIntervalTree;
 use crate::structs::genomic_ranges_list::GenomicRangesList;
 use crate::structs::variant::Variant;
 use crate::structs::variant_call::VariantCall;
@@ -32,6 +32,27 @@ pub struct VariantsList {
     pub variants: Vec<Variant>
 }
 
+/// Numeric fields of a VariantCall used by the pairwise clustering check.
+///
+/// String fields (chromosomes, IDs, variant types) are interned to integers
+/// once per chromosome so that the inner loop of
+/// `identify_nearby_variant_calls` only compares integers.
+#[derive(Clone, Copy)]
+struct ClusteringFields {
+    variant_call_id: usize,
+    variants_list_id: usize,
+    variant_id: usize,
+    chromosome_1: usize,
+    chromosome_2: usize,
+    position_1: isize,
+    position_2: isize,
+    variant_size: isize,
+    super_variant_type: usize,
+    is_deletion: bool,
+    is_insertion: bool,
+    is_snv_or_mnv: bool
+}
+
 impl VariantsList {
     pub fn new() -> Self {
         Self {
@@ -116,8 +137,13 @@ impl VariantsList {
     }
 
     /// Filter self.variants.
-    pub fn filter(&mut self, variant_filters: Vec<VariantFilter>, num_threads: usize) {
-        // Step 1. Identify variant IDs to keep
+    pub fn filter(&mut self, mut variant_filters: Vec<VariantFilter>, num_threads: usize) {
+        // Step 1. Prepare VariantFilter objects once for all variants
+        for variant_filter in variant_filters.iter_mut() {
+            variant_filter.prepare();
+        }
+
+        // Step 2. Identify variant IDs to keep
         let thread_pool = rayon::ThreadPoolBuilder::new()
             .num_threads(num_threads)
             .build()
@@ -139,10 +165,10 @@ impl VariantsList {
             }).collect()
         });
 
-        // Step 2. Create a HashSet of variant IDs to keep
+        // Step 3. Create a HashSet of variant IDs to keep
         let variant_ids_to_keep_set: HashSet<String> = variant_ids_to_keep.into_iter().collect();
 
-        // Step 3. Filter variants
+        // Step 4. Filter variants
         self.variants.retain(|variant| variant_ids_to_keep_set.contains(&variant.id));
     }
 
@@ -257,6 +283,150 @@ impl VariantsList {
         }
     }
 
+    /// Interns a string to an integer ID.
+    fn intern<'a>(ids: &mut HashMap<&'a str, usize>, value: &'a str) -> usize {
+        let next_id: usize = ids.len();
+        *ids.entry(value).or_insert(next_id)
+    }
+
+    /// Extracts the `ClusteringFields` of every VariantCall in a chromosome.
+    ///
+    /// # Arguments
+    ///
+    /// * `variant_call_positions` is a vector of tuples `(position, VariantCall)`.
+    ///
+    /// * If `match_variant_types==true`, variant types are mapped to super variant types
+    /// using `variant_types_map`.
+    fn clustering_fields(
+        variant_call_positions: &[(isize, VariantCall)],
+        match_variant_types: bool,
+        variant_types_map: &HashMap<&str, String>
+    ) -> Vec<ClusteringFields> {
+        let mut variant_call_ids: HashMap<&str, usize> = HashMap::new();
+        let mut variants_list_ids: HashMap<&str, usize> = HashMap::new();
+        let mut variant_ids: HashMap<&str, usize> = HashMap::new();
+        let mut chromosomes: HashMap<&str, usize> = HashMap::new();
+        let mut super_variant_types: HashMap<&str, usize> = HashMap::new();
+        let mut fields: Vec<ClusteringFields> = Vec::with_capacity(variant_call_positions.len());
+        for (_position, variant_call) in variant_call_positions.iter() {
+            let variants_list_id: &str = variant_call.attributes.get("temp_variants_list_id").unwrap();
+            let variant_id: &str = variant_call.attributes.get("temp_variant_id").unwrap();
+            let mut super_variant_type: usize = 0;
+            let mut is_deletion: bool = false;
+            let mut is_insertion: bool = false;
+            if match_variant_types == true {
+                let variant_type: &str = variant_types_map.get(variant_call.variant_type.as_str()).unwrap().as_str();
+                super_variant_type = VariantsList::intern(&mut super_variant_types, variant_type);
+                is_deletion = variant_type == variant_types_map[constants::DELETION].as_str();
+                is_insertion = variant_type == variant_types_map[constants::INSERTION].as_str();
+            }
+            fields.push(ClusteringFields {
+                variant_call_id: VariantsList::intern(&mut variant_call_ids, variant_call.id.as_str()),
+                variants_list_id: VariantsList::intern(&mut variants_list_ids, variants_list_id),
+                variant_id: VariantsList::intern(&mut variant_ids, variant_id),
+                chromosome_1: VariantsList::intern(&mut chromosomes, variant_call.chromosome_1.as_str()),
+                chromosome_2: VariantsList::intern(&mut chromosomes, variant_call.chromosome_2.as_str()),
+                position_1: variant_call.position_1,
+                position_2: variant_call.position_2,
+                variant_size: variant_call.variant_size,
+                super_variant_type: super_variant_type,
+                is_deletion: is_deletion,
+                is_insertion: is_insertion,
+                is_snv_or_mnv: variant_call.variant_type == constants::SINGLE_NUCLEOTIDE_VARIANT ||
+                    variant_call.variant_type == constants::MULTI_NUCLEOTIDE_VARIANT
+            });
+        }
+        fields
+    }
+
+    /// Same as `is_clusterable` but operates on `ClusteringFields`.
+    fn is_clusterable_fields(
+        fields_1: &ClusteringFields,
+        fields_2: &ClusteringFields,
+        max_neighbor_distance: isize,
+        match_all_breakpoints: bool,
+        match_variant_types: bool,
+        min_ins_size_overlap: f64,
+        min_del_size_overlap: f64
+    ) -> bool {
+        // The VariantCall objects are from the same list
+        // and were originally in the same Variant
+        if fields_1.variants_list_id == fields_2.variants_list_id {
+            return fields_1.variant_id == fields_2.variant_id &&
+                fields_1.variant_call_id != fields_2.variant_call_id;
+        }
+
+        // The VariantCall objects are from different lists
+        if match_variant_types == true {
+            if fields_1.super_variant_type != fields_2.super_variant_type {
+                return false;
+            }
+            if fields_1.is_deletion || fields_1.is_insertion {
+                let max_size: isize = max(fields_1.variant_size, fields_2.variant_size);
+                let min_size: isize = min(fields_1.variant_size, fields_2.variant_size);
+                let frac_size: f64 = min_size as f64 / max_size as f64;
+                if fields_1.is_deletion && frac_size < min_del_size_overlap {
+                    return false;
+                }
+                if fields_1.is_insertion && frac_size < min_ins_size_overlap {
+                    return false;
+                }
+            }
+        }
+
+        // Maximum neighbor distance must be 0 for SNVs and MNVs
+        let max_neighbor_distance_: isize = if fields_1.is_snv_or_mnv || fields_2.is_snv_or_mnv {
+            0
+        } else {
+            max_neighbor_distance
+        };
+        let distance_11: isize = (fields_1.position_1 - fields_2.position_1).abs();
+        let distance_22: isize = (fields_1.position_2 - fields_2.position_2).abs();
+        let distance_12: isize = (fields_1.position_1 - fields_2.position_2).abs();
+        let distance_21: isize = (fields_1.position_2 - fields_2.position_1).abs();
+        if match_all_breakpoints == true {
+            ((fields_1.chromosome_1 == fields_2.chromosome_1) &&
+                (fields_1.chromosome_2 == fields_2.chromosome_2) &&
+                (distance_11 <= max_neighbor_distance_) &&
+                (distance_22 <= max_neighbor_distance_)) ||
+            ((fields_1.chromosome_1 == fields_2.chromosome_2) &&
+                (fields_1.chromosome_2 == fields_2.chromosome_1) &&
+                (distance_12 <= max_neighbor_distance_) &&
+                (distance_21 <= max_neighbor_distance_))
+        } else {
+            ((fields_1.chromosome_1 == fields_2.chromosome_1) && (distance_11 <= max_neighbor_distance_)) ||
+            ((fields_1.chromosome_2 == fields_2.chromosome_2) && (distance_22 <= max_neighbor_distance_)) ||
+            ((fields_1.chromosome_1 == fields_2.chromosome_2) && (distance_12 <= max_neighbor_distance_)) ||
+            ((fields_1.chromosome_2 == fields_2.chromosome_1) && (distance_21 <= max_neighbor_distance_))
+        }
+    }
+
+    /// Advance the end of a sliding window over sorted positions.
+    ///
+    /// # Arguments
+    ///
+    /// * `positions` is a Vec of positions sorted in ascending order.
+    /// * `i` is the index of the position that starts the window.
+    /// * `end` is the end of the window for the previous index.
+    /// * `max_neighbor_distance` is the maximum distance to a position in the window.
+    ///
+    /// # Returns
+    ///
+    /// * The exclusive end of the window (i, end) of positions within
+    ///   `max_neighbor_distance` of `positions[i]`.
+    fn advance_window_end(
+        positions: &Vec<isize>,
+        i: usize,
+        end: usize,
+        max_neighbor_distance: isize
+    ) -> usize {
+        let mut end: usize = end.max(i + 1);
+        while end < positions.len() && positions[end] - positions[i] <= max_neighbor_distance {
+            end += 1;
+        }
+        end
+    }
+
     /// Identify nearby VariantCall objects.
     ///
     /// # Arguments
@@ -279,35 +449,41 @@ impl VariantsList {
         let results: HashSet<(String,String)> = thread_pool.install(|| {
             variant_calls_map.par_iter().flat_map(|(_chromosome, variant_call_positions)| {
                 let mut pairs: HashSet<(String,String)> = HashSet::new(); // (VariantCall.id, VariantCall.id)
-                for i in 0..variant_call_positions.len() {
-                    for j in (i + 1)..variant_call_positions.len() {
-                        let position_1: isize = variant_call_positions[i].0;
-                        let position_2: isize = variant_call_positions[j].0;
-                        let distance: isize = (position_1 - position_2).abs();
-
-                        // Break the loop because subsequent VariantCall objects are outside
-                        // the maximum neighbor distance
-                        if distance > max_neighbor_distance {
-                            break;
-                        }
-
-                        let cluster: bool = VariantsList::is_clusterable(
-                            &variant_call_positions[i].1,
-                            &variant_call_positions[j].1,
+                let fields: Vec<ClusteringFields> = VariantsList::clustering_fields(
+                    variant_call_positions,
+                    match_variant_types,
+                    variant_types_map
+                );
+                // Positions are copied into a contiguous vector so that the window search
+                // does not stride over the (position, VariantCall) tuples
+                let positions: Vec<isize> = variant_call_positions.iter().map(|&(position, _)| position).collect();
+                let mut end: usize = 0;
+                for i in 0..positions.len() {
+                    // Positions are sorted (see sort_variant_calls) so every VariantCall within
+                    // the maximum neighbor distance of position i lies in the half-open window
+                    // (i, end). The end of the window never moves backwards as i increases,
+                    // so it is advanced from where the previous window ended.
+                    end = VariantsList::advance_window_end(&positions, i, end, max_neighbor_distance);
+                    for j in (i + 1)..end {
+                        let cluster: bool = VariantsList::is_clusterable_fields(
+                            &fields[i],
+                            &fields[j],
                             max_neighbor_distance,
                             match_all_breakpoints,
                             match_variant_types,
                             min_ins_size_overlap,
-                            min_del_size_overlap,
-                            variant_types_map
+                            min_del_size_overlap
                         );
 
                         if cluster {
+                            // Store each pair once with its IDs in lexicographic order
+                            // so that (a, b) and (b, a) map to the same key
                             let variant_call_1_id: &str = variant_call_positions[i].1.id.as_str();
                             let variant_call_2_id: &str = variant_call_positions[j].1.id.as_str();
-                            if (pairs.contains(&(variant_call_1_id.to_string(), variant_call_2_id.to_string())) == false) &&
-                                (pairs.contains(&(variant_call_2_id.to_string(), variant_call_1_id.to_string())) == false) {
+                            if variant_call_1_id <= variant_call_2_id {
                                 pairs.insert((variant_call_1_id.to_string(), variant_call_2_id.to_string()));
+                            } else {
+                                pairs.insert((variant_call_2_id.to_string(), variant_call_1_id.to_string()));
                             }
                         }
                     }
@@ -319,6 +495,82 @@ impl VariantsList {
         results
     }
 
+    /// Identify VariantCall objects of the first VariantsList (variants list ID `0`)
+    /// that are clusterable with at least one other VariantCall.
+    ///
+    /// This returns the same VariantCall IDs of the first VariantsList as
+    /// `identify_nearby_variant_calls` followed by clustering would, but pairs of
+    /// VariantCall objects that are both from the other VariantsList objects are
+    /// never checked.
+    ///
+    /// # Arguments
+    ///
+    /// * `variant_calls_map` is a HashMap where `key` is `chromosome` and `value` is
+    /// `a vector of tuples (position, VariantCall)` sorted by position.
+    fn identify_clusterable_variant_call_ids(
+        num_threads: usize,
+        variant_calls_map: &HashMap<String, Vec<(isize, VariantCall)>>,
+        max_neighbor_distance: isize,
+        match_all_breakpoints: bool,
+        match_variant_types: bool,
+        min_ins_size_overlap: f64,
+        min_del_size_overlap: f64,
+        variant_types_map: &HashMap<&str, String>
+    ) -> HashSet<String> {
+        let thread_pool = rayon::ThreadPoolBuilder::new()
+            .num_threads(num_threads)
+            .build()
+            .unwrap();
+        let results: HashSet<String> = thread_pool.install(|| {
+            variant_calls_map.par_iter().flat_map(|(_chromosome, variant_call_positions)| {
+                let mut variant_call_ids: HashSet<String> = HashSet::new();
+                let fields: Vec<ClusteringFields> = VariantsList::clustering_fields(
+                    variant_call_positions,
+                    match_variant_types,
+                    variant_types_map
+                );
+                let is_first: Vec<bool> = variant_call_positions
+                    .iter()
+                    .map(|(_position, variant_call)| variant_call.attributes.get("temp_variants_list_id").unwrap() == "0")
+                    .collect();
+                let positions: Vec<isize> = variant_call_positions.iter().map(|&(position, _)| position).collect();
+                let mut end: usize = 0;
+                for i in 0..positions.len() {
+                    end = VariantsList::advance_window_end(&positions, i, end, max_neighbor_distance);
+                    for j in (i + 1)..end {
+                        if !is_first[i] && !is_first[j] {
+                            continue;
+                        }
+                        if (!is_first[i] || variant_call_ids.contains(&variant_call_positions[i].1.id)) &&
+                            (!is_first[j] || variant_call_ids.contains(&variant_call_positions[j].1.id)) {
+                            continue;
+                        }
+                        let cluster: bool = VariantsList::is_clusterable_fields(
+                            &fields[i],
+                            &fields[j],
+                            max_neighbor_distance,
+                            match_all_breakpoints,
+                            match_variant_types,
+                            min_ins_size_overlap,
+                            min_del_size_overlap
+                        );
+                        if cluster {
+                            if is_first[i] {
+                                variant_call_ids.insert(variant_call_positions[i].1.id.clone());
+                            }
+                            if is_first[j] {
+                                variant_call_ids.insert(variant_call_positions[j].1.id.clone());
+                            }
+                        }
+                    }
+                }
+                variant_call_ids
+            })
+            .collect()
+        });
+        results
+    }
+
     /// Intersect a vector of VariantsList objects.
     ///
     /// # Arguments
@@ -507,19 +759,19 @@ impl VariantsList {
         num_threads: usize
     ) -> HashMap<String, Vec<String>> {
         // Step 1. Split Variant objects by chromosome
-        let mut variants_map: HashMap<String, Vec<Variant>> = HashMap::new();
+        let mut variants_map: HashMap<&str, Vec<&Variant>> = HashMap::new();
         for variant in self.variants.iter() {
-            let key1 = variant.variant_calls[0].chromosome_1.clone();
+            let key1: &str = variant.variant_calls[0].chromosome_1.as_str();
             variants_map
                 .entry(key1)
                 .or_insert(Vec::new())
-                .push(variant.clone());
+                .push(variant);
             if variant.variant_calls[0].chromosome_1 != variant.variant_calls[0].chromosome_2 {
-                let key2 = variant.variant_calls[0].chromosome_2.clone();
+                let key2: &str = variant.variant_calls[0].chromosome_2.as_str();
                 variants_map
                     .entry(key2)
                     .or_insert(Vec::new())
-                    .push(variant.clone());
+                    .push(variant);
             }
         }
 
@@ -531,23 +783,33 @@ impl VariantsList {
         let results: Vec<HashMap<String, Vec<String>>> = thread_pool.install(|| {
             variants_map.par_iter().map(|(key, variants)| {
                 let mut result: HashMap<String, Vec<String>> = HashMap::new();
-                if genomic_regions_list.genomic_ranges_map.contains_key(key) {
-                    let genomic_ranges: Vec<GenomicRange> = genomic_regions_list.genomic_ranges_map.get(key).unwrap().clone();
+                if let Some(genomic_ranges) = genomic_regions_list.genomic_ranges_map.get(*key) {
+                    // GenomicRange objects are closed intervals [start, end]
+                    let interval_tree: ImplicitIntervalTree = ImplicitIntervalTree::new(
+                        genomic_ranges
+                            .iter()
+                            .enumerate()
+                            .map(|(i, genomic_range)| (genomic_range.start, genomic_range.end + 1, i))
+                            .collect()
+                    );
+                    let mut overlapping_indices: Vec<usize> = Vec::new();
                     for variant in variants {
                         for variant_call in &variant.variant_calls {
-                            for genomic_range in &genomic_ranges {
-                                let start_1 = variant_call.position_1;
-                                let end_1 = variant_call.position_1;
-                                let start_2 = variant_call.position_2;
-                                let end_2 = variant_call.position_2;
-                                let overlaps_1 = genomic_range.overlaps(variant_call.chromosome_1.to_string(), start_1, end_1);
-                                let overlaps_2 = genomic_range.overlaps(variant_call.chromosome_2.to_string(), start_2, end_2);
-                                if overlaps_1 || overlaps_2 {
-                                    result
-                                        .entry(variant_call.id.clone())
-                                        .or_insert(Vec::new())
-                                        .push(genomic_range.id().clone());
-                                }
+                            overlapping_indices.clear();
+                            if variant_call.chromosome_1.as_str() == *key {
+                                interval_tree.overlap(variant_call.position_1, variant_call.position_1 + 1, &mut overlapping_indices);
+                            }
+                            if variant_call.chromosome_2.as_str() == *key {
+                                interval_tree.overlap(variant_call.position_2, variant_call.position_2 + 1, &mut overlapping_indices);
+                            }
+                            // Report each GenomicRange once and in the order of genomic_ranges
+                            overlapping_indices.sort_unstable();
+                            overlapping_indices.dedup();
+                            for &i in overlapping_indices.iter() {
+                                result
+                                    .entry(variant_call.id.clone())
+                                    .or_insert(Vec::new())
+                                    .push(genomic_ranges[i].id().clone());
                             }
                         }
                     }
@@ -600,7 +862,7 @@ impl VariantsList {
                     variant_calls_map
                         .entry(variant_call_.chromosome_2.clone())
                         .or_insert_with(Vec::new)
-                        .push((variant_call_.position_2, variant_call_.clone()));
+                        .push((variant_call_.position_2, variant_call_));
                 }
             }
             variants_list_id += 1;
@@ -643,7 +905,20 @@ impl VariantsList {
             .unwrap();
         thread_pool.install(|| {
             variant_calls_map.par_iter_mut().for_each(|(_key, variant_calls)| {
-                variant_calls.sort_by_key(|&(position, _)| position);
+                if variant_calls.windows(2).all(|pair| pair[0].0 <= pair[1].0) {
+                    return;
+                }
+                // Sort (position, index) keys and move each (position, VariantCall) tuple once
+                // instead of moving the large tuples around during the sort. Ties keep their
+                // original order, as with a stable sort.
+                let mut keys: Vec<(isize, usize)> = variant_calls
+                    .iter()
+                    .enumerate()
+                    .map(|(i, &(position, _))| (position, i))
+                    .collect();
+                keys.sort_unstable();
+                let mut items: Vec<Option<(isize, VariantCall)>> = variant_calls.drain(..).map(Some).collect();
+                variant_calls.extend(keys.iter().map(|&(_, i)| items[i].take().unwrap()));
             });
         });
     }
@@ -663,10 +938,16 @@ impl VariantsList {
         min_del_size_overlap: f64,
         variant_types_map: &HashMap<&str, String>
     ) -> VariantsList {
-        let (vl_shared, vl_a_only, vl_b_only) = VariantsList::compare(
-            &self,
-            variants_list,
+        // Step 1. Split variant calls by breakpoint chromosome
+        let mut variant_calls_map: HashMap<String,Vec<(isize,VariantCall)>> = VariantsList::split_variant_calls(&[self, variants_list]);
+
+        // Step 2. Sort variant_records_map by position
+        VariantsList::sort_variant_calls(&mut variant_calls_map, num_threads);
+
+        // Step 3. Identify variant calls of self that would be in a shared variant
+        let shared_variant_call_ids: HashSet<String> = VariantsList::identify_clusterable_variant_call_ids(
             num_threads,
+            &variant_calls_map,
             max_neighbor_distance,
             match_all_breakpoints,
             match_variant_types,
@@ -674,7 +955,15 @@ impl VariantsList {
             min_del_size_overlap,
             variant_types_map
         );
-        vl_a_only
+
+        // Step 4. Keep variants with no shared variant calls
+        let mut vl_subtracted = VariantsList::new();
+        for variant in self.variants.iter() {
+            if variant.variant_calls.iter().all(|vc| !shared_variant_call_ids.contains(vc.id.as_str())) {
+                vl_subtracted.add_variant(variant.clone());
+            }
+        }
+        vl_subtracted
     }
 
     pub fn variant_call_ids(&self) -> Vec<String> {
@@ -5,4 +5,5 @@ mod unit_tests_variants_list_sort;
 mod unit_tests_variants_list_compare;
 mod unit_tests_variants_list_intersect;
 mod unit_tests_variants_list_subtract;
-mod unit_tests_variants_list_overlap;
\ No newline at end of file
+mod unit_tests_variants_list_overlap;
+mod unit_tests_interval_tree;
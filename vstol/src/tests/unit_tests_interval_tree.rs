@@ -0,0 +1,47 @@
+use crate::algorithms::interval_tree::ImplicitIntervalTree;
+
+
+/// Verifies that `ImplicitIntervalTree::overlap` finds every interval overlapping a query.
+///
+/// # Scenario
+/// 100 nested, disjoint and long intervals are queried at every position between 0 and 1100
+/// and compared against a linear scan of the intervals.
+///
+/// # Expected
+/// The labels of overlapping intervals are identical to those found by the linear scan.
+#[test]
+fn interval_tree_overlap_1() {
+    let mut intervals: Vec<(isize, isize, usize)> = Vec::new();
+    for i in 0..100 {
+        let start: isize = ((i * 37) % 1000) as isize;
+        let length: isize = if i % 10 == 0 { 500 } else { ((i * 7) % 20) as isize + 1 };
+        intervals.push((start, start + length, i));
+    }
+    let interval_tree: ImplicitIntervalTree = ImplicitIntervalTree::new(intervals.clone());
+    for position in 0..1100 {
+        let mut labels: Vec<usize> = Vec::new();
+        interval_tree.overlap(position, position + 1, &mut labels);
+        labels.sort();
+        let expected: Vec<usize> = intervals
+            .iter()
+            .filter(|&&(start, end, _)| start <= position && position < end)
+            .map(|&(_, _, label)| label)
+            .collect();
+        assert_eq!(labels, expected);
+    }
+}
+
+/// Verifies that `ImplicitIntervalTree::overlap` handles an empty tree.
+///
+/// # Scenario
+/// An empty interval tree is queried.
+///
+/// # Expected
+/// No labels are returned.
+#[test]
+fn interval_tree_overlap_2() {
+    let interval_tree: ImplicitIntervalTree = ImplicitIntervalTree::new(Vec::new());
+    let mut labels: Vec<usize> = Vec::new();
+    interval_tree.overlap(0, 100, &mut labels);
+    assert_eq!(labels.len(), 0);
+}
@@ -215,4 +215,78 @@ fn filter_variants_list_3() {
     variants_list.filter(variant_filters, 1);
 
     assert_eq!(variants_list.variants.len(), 2);
-}
\ No newline at end of file
+}
+
+/// Verifies that `VariantsList::filter` function filters variants by `alternate_allele_read_count`.
+///
+/// # Scenario
+/// Filter variants where alternate_allele_read_count < 3 for all variant calls
+/// with the filter value given as a string (as it is on the command line).
+///
+/// # Expected
+/// The variants list should have 1 variant.
+#[test]
+fn filter_variants_list_4() {
+    let mut variants_list: VariantsList = VariantsList::new();
+    let mut variant_1: Variant = Variant::new("variant_1".to_string());
+    let mut variant_2: Variant = Variant::new("variant_2".to_string());
+    let variant_call_1: VariantCall = VariantCall::new(
+        "variant_call_1".to_string(),
+        "sample".to_string(),
+        "chr1".to_string(),
+        100,
+        "chr1".to_string(),
+        100,
+        INSERTION.to_string(),
+        "T".to_string(),
+        "TAAA".to_string(),
+        "source".to_string(),
+        "".to_string(),
+        "".to_string(),
+        "DNA".to_string(),
+        "method".to_string(),
+        "platform".to_string(),
+        "PASS".to_string(),
+        60.0,
+        "yes".to_string(),
+        "".to_string(),
+        3,
+        3,
+        3,
+        6,
+        0.5,
+        1000,
+        60.0,
+        60.0
+    );
+    let mut variant_call_2: VariantCall = variant_call_1.clone();
+    variant_call_2.id = "variant_call_2".to_string();
+    variant_call_2.position_1 = 1000;
+    variant_call_2.position_2 = 1000;
+    variant_call_2.alternate_allele_read_count = 1;
+    let mut variant_call_3: VariantCall = variant_call_1.clone();
+    variant_call_3.id = "variant_call_3".to_string();
+    variant_call_3.position_1 = 1000;
+    variant_call_3.position_2 = 1000;
+    variant_call_3.alternate_allele_read_count = 3;
+    variant_call_3.variant_calling_method = "method2".to_string();
+    variant_1.add_variant_call(variant_call_1);
+    variant_2.add_variant_call(variant_call_2);
+    variant_2.add_variant_call(variant_call_3);
+    variants_list.add_variant(variant_1);
+    variants_list.add_variant(variant_2);
+
+    let mut variant_filters: Vec<VariantFilter> = Vec::new();
+    let variant_filter: VariantFilter = VariantFilter::new(
+        QUANTIFIER_ALL.to_string(),
+        "alternate_allele_read_count".to_string(),
+        OPERATOR_GREATER_THAN_EQUAL_TO.to_string(),
+        Value::String("3".to_string()),
+        vec!["sample".to_string()]
+    );
+    variant_filters.push(variant_filter);
+
+    variants_list.filter(variant_filters, 1);
+
+    assert_eq!(variants_list.variants.len(), 1);
+}